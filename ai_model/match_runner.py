@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from statistics import NormalDist
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.data.card_database import build_simple_deck, load_card_registry
+from core.data.card_registry import CardRegistry, init_worker
+from core.game_engine.determinization import DEFAULT_SEARCH_WORLDS
+from core.game_engine.evaluation import Evaluator, HeuristicEvaluator
+from core.game_engine.game_loop import run_game
+from core.game_engine.game_state import GameState
+from core.game_engine.search_budget import DEFAULT_DECISION_TIME_LIMIT
+
+# Zuglimit pro Partie im Vergleich; danach zählt die Partie als Unentschieden
+MATCH_MAX_TURNS = 20
+# Höchstzahl an Partiepaaren, falls der Test bis dahin nicht entschieden ist
+DEFAULT_MAX_PAIRS = 2000
+# Paare pro Worker, die vergeben, aber noch nicht verbucht sind (in Arbeit oder auf ein früheres Paar wartend)
+PAIRS_IN_FLIGHT_PER_WORKER = 2
+
+# Punkte des Kandidaten in einem Paar (0, 0.5, ..., 2) -> Index in der Pentanomial-Verteilung
+PAIR_OUTCOMES = 5
+# Pseudozählung je Ausgang: verhindert eine unterschätzte Varianz nach wenigen Paaren
+# (sonst entscheidet der Test schon nach ein, zwei gleichen Ergebnissen)
+PRIOR_PAIRS_PER_OUTCOME = 0.5
+
+
+class AgentConfig:
+    """Konfiguration einer KI für den Vergleich: Bewertungsfunktion und Suchbudget."""
+    def __init__(self, name: str, evaluator: Optional[Evaluator] = None,
+                 decision_time_limit: Optional[float] = DEFAULT_DECISION_TIME_LIMIT,
+                 num_worlds: int = DEFAULT_SEARCH_WORLDS):
+        self.name = name
+        self.evaluator = evaluator or HeuristicEvaluator()
+        self.decision_time_limit = decision_time_limit
+        self.num_worlds = num_worlds
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AgentConfig':
+        """
+        Erzeugt eine Konfiguration aus einem Dict der Form {"name": ..., "decision_time_limit": ...,
+        "num_worlds": ..., "evaluator": {"heuristic": {Gewichte}} | {"linear": Pfad} | {"mlp": Pfad}}.
+        """
+        evaluator = None
+        spec = data.get('evaluator', {})
+        if 'heuristic' in spec:
+            evaluator = HeuristicEvaluator(**spec['heuristic'])
+        elif 'linear' in spec or 'mlp' in spec:
+            from ai_model.networks import LinearEvaluator, MLPEvaluator
+            evaluator = LinearEvaluator.load(spec['linear']) if 'linear' in spec else MLPEvaluator.load(spec['mlp'])
+        return cls(data.get('name', 'agent'), evaluator,
+                   data.get('decision_time_limit', DEFAULT_DECISION_TIME_LIMIT),
+                   data.get('num_worlds', DEFAULT_SEARCH_WORLDS))
+
+    def configure(self, player, seed: int):
+        """Überträgt die Konfiguration auf einen Spieler; der Sampler wird reproduzierbar geseedet."""
+        player.evaluator = self.evaluator
+        player.decision_time_limit = self.decision_time_limit
+        player.num_worlds = self.num_worlds
+        player.determinizer.rng = np.random.default_rng((seed, player.player_id))
+
+    def __repr__(self) -> str:
+        return (f"AgentConfig({self.name}, {type(self.evaluator).__name__}, "
+                f"Zeit {self.decision_time_limit}s, {self.num_worlds} Welten)")
+
+
+def expected_score(elo: float) -> float:
+    """Erwartete Punktzahl pro Partie bei einem Elo-Vorsprung (logistisches Modell)."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    """Umkehrung von `expected_score`."""
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    """
+    Sequentieller Quotiententest (GSPRT) über Partiepaare: H0 = der Kandidat ist um `elo0` besser,
+    H1 = um `elo1`. Gezählt werden die Punkte des Kandidaten pro Paar (Pentanomial-Verteilung,
+    0 bis 2 Punkte in halben Schritten); das Log-Likelihood-Verhältnis wird wie bei Fishtest
+    über die Normalapproximation mit der gemessenen Varianz pro Paar berechnet. Gepaarte
+    Partien mit getauschten Sitzen haben eine deutlich kleinere Varianz als einzelne Partien.
+    """
+    def __init__(self, elo0: float = 0.0, elo1: float = 20.0, alpha: float = 0.05, beta: float = 0.05):
+        if elo1 <= elo0:
+            raise ValueError(f"elo1 ({elo1}) muss größer als elo0 ({elo0}) sein.")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower_bound = math.log(beta / (1.0 - alpha))
+        self.upper_bound = math.log((1.0 - beta) / alpha)
+        self.pentanomial = np.zeros(PAIR_OUTCOMES, dtype=np.int64)
+
+    def add(self, pair_points: float):
+        """Verbucht ein Paar mit den Punkten des Kandidaten (0, 0.5, 1, 1.5 oder 2)."""
+        self.pentanomial[int(round(pair_points * 2))] += 1
+
+    @property
+    def pairs(self) -> int:
+        return int(self.pentanomial.sum())
+
+    def _moments(self) -> Tuple[float, float]:
+        """Mittelwert und Varianz der Punktzahl pro Paar (auf [0, 1] normiert)."""
+        counts = self.pentanomial + PRIOR_PAIRS_PER_OUTCOME
+        scores = np.arange(PAIR_OUTCOMES) / (PAIR_OUTCOMES - 1)
+        probs = counts / counts.sum()
+        mean = float(probs @ scores)
+        return mean, float(probs @ (scores - mean) ** 2)
+
+    def llr(self) -> float:
+        """Log-Likelihood-Verhältnis von H1 gegen H0 nach den bisherigen Paaren."""
+        if self.pairs == 0:
+            return 0.0
+        mean, variance = self._moments()
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return self.pairs * (s1 - s0) * (2.0 * mean - s0 - s1) / (2.0 * variance)
+
+    def status(self) -> Optional[str]:
+        """'H1' (Kandidat besser), 'H0' (nicht besser) oder None (noch offen)."""
+        llr = self.llr()
+        if llr >= self.upper_bound:
+            return 'H1'
+        if llr <= self.lower_bound:
+            return 'H0'
+        return None
+
+    def elo(self) -> Tuple[float, float]:
+        """Elo-Schätzung des Kandidaten und Breite des 95%-Konfidenzintervalls (±)."""
+        mean, variance = self._moments()
+        margin = 1.96 * math.sqrt(variance / max(self.pairs, 1))
+        return score_to_elo(mean), (score_to_elo(min(mean + margin, 1.0)) - score_to_elo(max(mean - margin, 0.0))) / 2.0
+
+    def fixed_sample_pairs(self) -> int:
+        """
+        Paare, die ein Test fester Größe mit denselben Fehlerraten bei der gemessenen
+        Varianz bräuchte (Vergleichsmaßstab für die Ersparnis durch den SPRT).
+        """
+        _, variance = self._moments()
+        z = NormalDist().inv_cdf(1.0 - self.alpha) + NormalDist().inv_cdf(1.0 - self.beta)
+        return int(math.ceil((z * math.sqrt(variance) / (expected_score(self.elo1) - expected_score(self.elo0))) ** 2))
+
+    def __repr__(self) -> str:
+        return (f"SPRT([{self.elo0}, {self.elo1}], Paare={self.pairs}, Pentanomial={self.pentanomial.tolist()}, "
+                f"LLR={self.llr():.2f} [{self.lower_bound:.2f}, {self.upper_bound:.2f}])")
+
+
+class MatchReport:
+    """Ergebnis eines Vergleichs zweier KI-Konfigurationen aus Sicht des Kandidaten."""
+    def __init__(self, baseline: AgentConfig, candidate: AgentConfig, sprt: SPRT, wins: int, draws: int,
+                 losses: int, elapsed: float, cpu_seconds: float):
+        self.baseline = baseline
+        self.candidate = candidate
+        self.sprt = sprt
+        self.status = sprt.status()
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+        self.elapsed = elapsed
+        # Summe der Rechenzeit in den Workern
+        self.cpu_seconds = cpu_seconds
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def format(self) -> str:
+        """Gibt den Bericht als Text zurück."""
+        elo, margin = self.sprt.elo()
+        verdict = {'H1': f"{self.candidate.name} ist besser", 'H0': f"{self.candidate.name} ist nicht besser",
+                   None: "nicht entschieden (Paarlimit erreicht)"}[self.status]
+        lines = [
+            f"{self.candidate} gegen {self.baseline}",
+            f"Ergebnis: {verdict}",
+            f"Partien: {self.games} (+{self.wins} ={self.draws} -{self.losses}), Elo {elo:+.1f} ± {margin:.1f}",
+            f"{self.sprt}",
+        ]
+        if self.status is not None:
+            fixed = 2 * self.sprt.fixed_sample_pairs()
+            lines.append(f"Test fester Größe bräuchte {fixed} Partien, SPRT: {self.games} ({self.games / max(fixed, 1):.0%})")
+        lines.append(f"Dauer: {self.elapsed:.1f}s, Rechenzeit {self.cpu_seconds:.1f}s")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return self.format()
+
+
+# Zustand der Worker-Prozesse (einmal pro Prozess über den Initializer gesetzt)
+_worker_context: Dict = {}
+
+
+def _init_match_worker(card_db: Mapping[str, Dict], decks: Sequence[List[Dict]], agents: Sequence[AgentConfig],
+                       max_turns: int):
+    if isinstance(card_db, CardRegistry):
+        init_worker(card_db.name)
+    _worker_context.update(card_db=card_db, decks=decks, agents=agents, max_turns=max_turns)
+
+
+def _play_pair(seed: int) -> Tuple[float, int, float]:
+    """
+    Spielt ein Paar: beide Partien mit demselben Seed (gleiche Mischungen, gleicher Startspieler),
+    einmal mit dem Kandidaten auf Sitz 0, einmal auf Sitz 1. Gibt die Punkte des Kandidaten,
+    die Anzahl der Unentschieden und die Rechenzeit zurück.
+    """
+    baseline, candidate = _worker_context['agents']
+    start = time.process_time()
+    points, draws = 0.0, 0
+    for candidate_seat in (0, 1):
+        seats = [candidate, baseline] if candidate_seat == 0 else [baseline, candidate]
+        random.seed(seed)
+        game = GameState(_worker_context['card_db'])
+        for player, agent in zip(game.players, seats):
+            agent.configure(player, seed)
+        # Die Engine schreibt Spielverlauf per print; im Vergleich nur störend
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game.start_game(_worker_context['decks'])
+            result = run_game(game, _worker_context['max_turns'])
+        if result.winner is None:
+            points += 0.5
+            draws += 1
+        elif result.winner == candidate_seat:
+            points += 1.0
+    return points, draws, time.process_time() - start
+
+
+def run_match(card_db: Mapping[str, Dict], decks: Sequence[List[Dict]], baseline: AgentConfig, candidate: AgentConfig,
+              sprt: Optional[SPRT] = None, max_pairs: int = DEFAULT_MAX_PAIRS, workers: Optional[int] = None,
+              seed: int = 0, max_turns: int = MATCH_MAX_TURNS) -> MatchReport:
+    """
+    Lässt `candidate` gegen `baseline` in Partiepaaren (gleicher Seed, getauschte Sitze) über einen
+    Prozess-Pool spielen, bis der SPRT entschieden ist oder `max_pairs` erreicht sind.
+    `decks` sind die Decklisten der Sitze 0 und 1. Mit einem `CardRegistry` als `card_db` hängen
+    sich die Worker an den Shared-Memory-Block an, statt die Datenbank zu kopieren.
+    `workers=0` spielt ohne Pool im aktuellen Prozess. Die Paare werden in beiden Fällen in
+    Seed-Reihenfolge verbucht.
+    """
+    sprt = sprt or SPRT()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    init_args = (card_db, decks, (baseline, candidate), max_turns)
+    wins = draws = losses = 0
+    cpu_seconds = 0.0
+    start = time.perf_counter()
+
+    def record(pair_result: Tuple[float, int, float]):
+        nonlocal wins, draws, losses, cpu_seconds
+        points, pair_draws, seconds = pair_result
+        sprt.add(points)
+        pair_wins = int(points - 0.5 * pair_draws)
+        wins += pair_wins
+        draws += pair_draws
+        losses += 2 - pair_wins - pair_draws
+        cpu_seconds += seconds
+        if sprt.pairs % 50 == 0:
+            logging.info(f"Vergleich: {sprt}")
+
+    if workers <= 0:
+        _init_match_worker(*init_args)
+        for index in range(max_pairs):
+            record(_play_pair(seed + index))
+            if sprt.status() is not None:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_match_worker, initargs=init_args) as executor:
+            next_pair = next_record = 0
+            pending: Dict = {}
+            finished: Dict[int, Tuple[float, int, float]] = {}
+            while sprt.status() is None and next_record < max_pairs:
+                while next_pair < max_pairs and next_pair - next_record < workers * PAIRS_IN_FLIGHT_PER_WORKER:
+                    pending[executor.submit(_play_pair, seed + next_pair)] = next_pair
+                    next_pair += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[pending.pop(future)] = future.result()
+                # Verbucht wird in Seed-Reihenfolge: Paare, die schneller fertig werden (z.B. schnelle
+                # Siege), dürfen die Stoppregel nicht zuerst erreichen, sonst ist der Test verzerrt
+                while next_record in finished and sprt.status() is None:
+                    record(finished.pop(next_record))
+                    next_record += 1
+            # Entschieden: noch nicht begonnene Paare verwerfen
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    report = MatchReport(baseline, candidate, sprt, wins, draws, losses, time.perf_counter() - start, cpu_seconds)
+    logging.info(f"Vergleich beendet:\n{report.format()}")
+    return report
+
+
+def _load_agent(path: str) -> AgentConfig:
+    with open(path, 'r', encoding='utf-8') as f:
+        return AgentConfig.from_dict(json.load(f))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Vergleicht zwei KI-Konfigurationen (JSON-Dateien, siehe `AgentConfig.from_dict`) auf einem Deck."""
+    parser = argparse.ArgumentParser(description="KI-gegen-KI-Vergleich mit gepaarten Partien und SPRT.")
+    parser.add_argument('baseline', help="Konfiguration der Referenz-KI (JSON)")
+    parser.add_argument('candidate', help="Konfiguration der zu testenden KI (JSON)")
+    parser.add_argument('--deck', nargs='+', default=["Forest"] * 25 + ["Grizzly Bears"] * 35,
+                        help="Kartennamen des Decks (für beide Sitze)")
+    parser.add_argument('--elo0', type=float, default=0.0)
+    parser.add_argument('--elo1', type=float, default=20.0)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--max-pairs', type=int, default=DEFAULT_MAX_PAIRS)
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=MATCH_MAX_TURNS)
+    args = parser.parse_args(argv)
+
+    registry = load_card_registry()
+    try:
+        deck = build_simple_deck(registry, args.deck)
+        report = run_match(registry, [deck, deck], _load_agent(args.baseline), _load_agent(args.candidate),
+                           SPRT(args.elo0, args.elo1, args.alpha, args.beta), args.max_pairs, args.workers,
+                           args.seed, args.max_turns)
+        print(report.format())
+    finally:
+        registry.close()
+
+
+if __name__ == "__main__":
+    main()
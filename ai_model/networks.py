@@ -0,0 +1,56 @@
+import json
+from typing import List, Optional
+
+import numpy as np
+
+from core.game_engine.evaluation import Evaluator, FEATURE_NAMES, NUM_FEATURES
+
+
+class LinearEvaluator(Evaluator):
+    """Gelernter linearer Evaluator über die Merkmalsvektoren der Engine."""
+    def __init__(self, weights: np.ndarray, bias: float = 0.0):
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (NUM_FEATURES,):
+            raise ValueError(f"Erwarte {NUM_FEATURES} Gewichte ({FEATURE_NAMES}), erhalten: {weights.shape}")
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def load(cls, path: str) -> 'LinearEvaluator':
+        """Lädt Gewichte aus einer JSON-Datei der Form {"weights": {name: w}, "bias": b}."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        weights = [data['weights'].get(name, 0.0) for name in FEATURE_NAMES]
+        return cls(np.array(weights), data.get('bias', 0.0))
+
+    def evaluate_features(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.weights + self.bias
+
+
+class MLPEvaluator(Evaluator):
+    """Kleines Feedforward-Netz (ReLU) als Evaluator; bewertet ganze Stapel in einem Durchlauf."""
+    def __init__(self, layers: List[np.ndarray], biases: List[np.ndarray],
+                 feature_mean: Optional[np.ndarray] = None, feature_std: Optional[np.ndarray] = None):
+        if len(layers) != len(biases) or layers[0].shape[0] != NUM_FEATURES or layers[-1].shape[1] != 1:
+            raise ValueError("Ungültige Netzarchitektur für die Merkmalsvektoren der Engine.")
+        self.layers = layers
+        self.biases = biases
+        self.feature_mean = feature_mean if feature_mean is not None else np.zeros(NUM_FEATURES)
+        self.feature_std = feature_std if feature_std is not None else np.ones(NUM_FEATURES)
+
+    @classmethod
+    def load(cls, path: str) -> 'MLPEvaluator':
+        """Lädt ein mit `np.savez` gespeichertes Netz (W0, b0, W1, b1, ..., optional mean/std)."""
+        data = np.load(path)
+        count = sum(1 for key in data.files if key.startswith('W'))
+        return cls([data[f'W{i}'] for i in range(count)], [data[f'b{i}'] for i in range(count)],
+                   data['mean'] if 'mean' in data.files else None,
+                   data['std'] if 'std' in data.files else None)
+
+    def evaluate_features(self, features: np.ndarray) -> np.ndarray:
+        x = (features - self.feature_mean) / self.feature_std
+        for i, (weights, bias) in enumerate(zip(self.layers, self.biases)):
+            x = x @ weights + bias
+            if i < len(self.layers) - 1:
+                x = np.maximum(x, 0.0)
+        return x[:, 0]
@@ -0,0 +1,290 @@
+import logging
+import zlib
+from typing import List, Dict, Optional, Mapping, Set
+
+from core.game_engine.card import Card
+from core.game_engine.effect_system import ModifyPowerToughness, EffectDuration
+from core.game_engine.evaluation import creature_value
+from core.game_engine.game_state import GameState
+from core.game_engine.phase_manager import TurnPhase, TurnStep
+
+# Arena-Phasen/-Schritte -> Engine
+ARENA_PHASES = {
+    'Phase_Beginning': TurnPhase.BEGINNING,
+    'Phase_Main1': TurnPhase.PRECOMBAT_MAIN,
+    'Phase_Combat': TurnPhase.COMBAT,
+    'Phase_Main2': TurnPhase.POSTCOMBAT_MAIN,
+    'Phase_Ending': TurnPhase.ENDING,
+}
+ARENA_STEPS = {
+    'Step_Untap': TurnStep.UNTAP,
+    'Step_Upkeep': TurnStep.UPKEEP,
+    'Step_Draw': TurnStep.DRAW,
+    'Step_BeginCombat': TurnStep.BEGIN_COMBAT,
+    'Step_DeclareAttack': TurnStep.DECLARE_ATTACKERS,
+    'Step_DeclareBlock': TurnStep.DECLARE_BLOCKERS,
+    'Step_FirstStrikeDamage': TurnStep.FIRST_STRIKE_DAMAGE,
+    'Step_CombatDamage': TurnStep.COMBAT_DAMAGE,
+    'Step_EndCombat': TurnStep.END_OF_COMBAT,
+    'Step_End': TurnStep.END_STEP,
+    'Step_Cleanup': TurnStep.CLEANUP,
+}
+# Arena-Zonen -> Attributname der Zone am Engine-Spieler
+ARENA_ZONES = {
+    'ZoneType_Library': 'library',
+    'ZoneType_Hand': 'hand',
+    'ZoneType_Battlefield': 'battlefield',
+    'ZoneType_Graveyard': 'graveyard',
+    'ZoneType_Exile': 'exile',
+}
+# In Arena gemeinsame Zonen (ohne ownerSeatId): Karten werden ihrem Controller zugeordnet
+SHARED_ZONES = {'ZoneType_Battlefield', 'ZoneType_Exile'}
+# Platzhalter für Objekte, deren Identität verdeckt ist (gegnerische Hand, Bibliotheken)
+HIDDEN_CARD_DATA = {'name': 'Verdeckte Karte', 'type_line': '', 'mana_cost': '', 'keywords': []}
+
+
+def build_grp_index(card_db: Mapping[str, Dict]) -> Dict[int, Dict]:
+    """
+    Index Arena-grpId -> Kartendaten über das Feld `arena_id` der Kartendatenbank.
+    Wird einmal pro Datenbank berechnet und kann an mehrere Spiegel übergeben werden.
+    """
+    return {data['arena_id']: data for data in card_db.values() if data.get('arena_id')}
+
+
+def state_checksum(game: GameState) -> int:
+    """
+    Prüfsumme über die für die KI relevanten Teile eines gespiegelten Zustands:
+    Zuginfo, Lebenspunkte, Zoneninhalte (instanceIds) und der Zustand der Permanents.
+    """
+    parts = [game.turn_number, game.active_player_index,
+             game.phase_manager.current_phase.name, game.phase_manager.current_step.name]
+    for player in game.players:
+        parts.append(player.life)
+        for zone in (player.library, player.hand, player.graveyard, player.exile):
+            parts.append(sorted(card.instance_id for card in zone))
+        parts.append(sorted((card.instance_id, card.name, card.is_tapped, card.damage_marked, card.is_attacking,
+                             creature_value(card)) for card in player.battlefield))
+    return zlib.crc32(repr(parts).encode('utf-8'))
+
+
+class GameMirror:
+    """
+    Spiegelt den Arena-Spielzustand inkrementell in einen Engine-`GameState`.
+    Diffs (Zonenwechsel, Objekt-Updates, Leben, Zug-/Schrittinfo) werden direkt auf den
+    bestehenden Zustand angewendet, ohne ihn neu aufzubauen. Bei jedem vollständigen
+    Zustand wird die Prüfsumme des inkrementellen Zustands gegen den neu aufgebauten
+    verglichen; bei Abweichung (Desync) wird der vollständige Zustand übernommen.
+    Der eigene Sitz wird Spieler `local_seat - 1`.
+    """
+    def __init__(self, card_db: Mapping[str, Dict], grp_index: Optional[Dict[int, Dict]] = None):
+        self.card_db = card_db
+        self.grp_index = grp_index if grp_index is not None else build_grp_index(card_db)
+        self.local_seat: Optional[int] = None
+        self.game_state_id: Optional[int] = None
+        self.desyncs = 0
+        self._reset()
+
+    def _reset(self):
+        self.game = GameState(self.card_db)
+        self.turn_info: Dict = {}
+        # instanceId -> gespiegelte Karte
+        self.cards: Dict[int, Card] = {}
+        # Blocker-instanceId -> Angreifer-instanceId
+        self.block_targets: Dict[int, int] = {}
+        self._has_state = False
+
+    @property
+    def local_player_id(self) -> int:
+        return (self.local_seat or 1) - 1
+
+    def apply(self, message: Dict):
+        """Arbeitet eine GameStateMessage (GameStateType_Full oder _Diff) ein."""
+        state = message.get('gameStateMessage', {})
+        if self.local_seat is None and message.get('systemSeatIds'):
+            self.local_seat = message['systemSeatIds'][0]
+        self.game_state_id = state.get('gameStateId', self.game_state_id)
+
+        if state.get('type') == 'GameStateType_Full':
+            self._apply_full(state)
+        else:
+            self._apply_diff(state)
+        self._has_state = True
+
+    def snapshot(self) -> GameState:
+        """
+        Unabhängige Kopie des gespiegelten Zustands für die KI (siehe `GameState.clone`,
+        deutlich schneller als `deepcopy`).
+        """
+        return self.game.clone()
+
+    def checksum(self) -> int:
+        return state_checksum(self.game)
+
+    def _apply_full(self, state: Dict):
+        reference = GameMirror(self.card_db, self.grp_index)
+        reference.local_seat = self.local_seat
+        reference._apply_diff(state)
+        if self._has_state and self.checksum() != reference.checksum():
+            self.desyncs += 1
+            logging.warning(f"Spiegel-Desync bei gameStateId {self.game_state_id} erkannt, übernehme den vollständigen Zustand.")
+        self.game, self.turn_info, self.cards, self.block_targets = (
+            reference.game, reference.turn_info, reference.cards, reference.block_targets)
+
+    def _apply_diff(self, state: Dict):
+        for info in state.get('players', []):
+            player = self._player(info.get('systemSeatNumber'))
+            if player is not None and 'lifeTotal' in info:
+                player.life = info['lifeTotal']
+
+        if state.get('turnInfo'):
+            self.turn_info = dict(state['turnInfo'])
+            self._apply_turn_info()
+
+        combat_changed = False
+        for obj in state.get('gameObjects', []):
+            combat_changed |= self._update_object(obj)
+        for zone in state.get('zones', []):
+            self._update_zone(zone)
+        for instance_id in state.get('diffDeletedInstanceIds', []):
+            self.cards.pop(instance_id, None)
+            combat_changed |= self.block_targets.pop(instance_id, None) is not None
+        if combat_changed:
+            self._link_combat()
+
+    def _player(self, seat: Optional[int]):
+        if seat is None or not 1 <= seat <= len(self.game.players):
+            return None
+        return self.game.get_player(seat - 1)
+
+    def _apply_turn_info(self):
+        game, turn = self.game, self.turn_info
+        game.turn_number = turn.get('turnNumber', game.turn_number)
+        if turn.get('activePlayer'):
+            game.active_player_index = turn['activePlayer'] - 1
+        if turn.get('priorityPlayer'):
+            game.player_with_priority = turn['priorityPlayer'] - 1
+        phase_manager = game.phase_manager
+        phase_manager.current_phase = ARENA_PHASES.get(turn.get('phase'), phase_manager.current_phase)
+        step = ARENA_STEPS.get(turn.get('step'))
+        if step is None and phase_manager.current_phase in (TurnPhase.PRECOMBAT_MAIN, TurnPhase.POSTCOMBAT_MAIN):
+            # Hauptphasen haben keine Schritte, die Phase steht selbst im Zugablauf
+            step = phase_manager.current_phase
+        if step is not None:
+            phase_manager.current_step = step
+            phase_manager.step_index = phase_manager.step_order.index(step)
+
+    def _card_for(self, instance_id: int, seat: Optional[int]) -> Card:
+        """Gibt die Karte zu einer instanceId zurück und legt verdeckte Objekte bei Bedarf an."""
+        card = self.cards.get(instance_id)
+        if card is None:
+            card = Card(HIDDEN_CARD_DATA, self._player(seat) or self.game.players[0])
+            card.instance_id = instance_id
+            self.cards[instance_id] = card
+        return card
+
+    def _update_object(self, obj: Dict) -> bool:
+        """Übernimmt ein (in Arena immer vollständig gesendetes) Objekt. Gibt zurück, ob sich Blocks geändert haben."""
+        instance_id = obj['instanceId']
+        card = self._card_for(instance_id, obj.get('controllerSeatId', obj.get('ownerSeatId')))
+        features = self.game.board_features
+        controller = self._player(obj.get('controllerSeatId'))
+        if controller is not None and controller is not card.owner:
+            self._change_controller(card, controller)
+        on_battlefield = card in card.owner.battlefield
+
+        data = self.grp_index.get(obj.get('grpId'))
+        if data is not None and data is not card.static_data:
+            # Verdecktes Objekt wurde aufgedeckt (oder hat sich verwandelt)
+            if on_battlefield:
+                features.on_leave_battlefield(card)
+            card.static_data = data
+            card.card_id = data.get('card_id')
+            if on_battlefield:
+                features.on_enter_battlefield(card)
+        elif data is None and obj.get('grpId'):
+            logging.debug(f"Unbekannte grpId {obj['grpId']} (Objekt {instance_id}).")
+
+        card.is_tapped = obj.get('isTapped', False)
+        card.summoning_sick = obj.get('hasSummoningSickness', False)
+        card.damage_marked = obj.get('damage', 0)
+        card.is_attacking = obj.get('attackState') == 'AttackState_Attacking'
+        self._sync_power_toughness(card, obj)
+
+        attacker_ids = obj.get('blockInfo', {}).get('attackerIds', [])
+        old_target = self.block_targets.get(instance_id)
+        if attacker_ids:
+            self.block_targets[instance_id] = attacker_ids[0]
+        else:
+            self.block_targets.pop(instance_id, None)
+        return self.block_targets.get(instance_id) != old_target
+
+    def _change_controller(self, card: Card, controller):
+        """Ordnet eine Karte einem anderen Spieler zu (die Engine unterscheidet nicht zwischen Besitzer und Controller)."""
+        if card in card.owner.battlefield:
+            card.owner.remove_from_battlefield(card, [])
+            card.owner = controller
+            controller.put_onto_battlefield(card)
+        else:
+            card.owner = controller
+
+    def _sync_power_toughness(self, card: Card, obj: Dict):
+        """Bildet die von Arena gemeldete Power/Toughness über einen Effekt auf die Engine-Karte ab."""
+        if 'power' not in obj and 'toughness' not in obj:
+            return
+        base_power = int(card.static_data.get('power') or 0)
+        base_toughness = int(card.static_data.get('toughness') or 0)
+        delta = (obj.get('power', {}).get('value', base_power) - base_power,
+                 obj.get('toughness', {}).get('value', base_toughness) - base_toughness)
+        current = (sum(getattr(e, 'power_modifier', 0) for e in card.active_effects),
+                   sum(getattr(e, 'toughness_modifier', 0) for e in card.active_effects))
+        if delta != current:
+            card.active_effects = [ModifyPowerToughness(*delta, EffectDuration.PERMANENT)] if any(delta) else []
+            self.game.board_features.on_characteristics_changed(card)
+
+    def _update_zone(self, zone: Dict):
+        """Ersetzt den Inhalt einer Zone; Karten, die das Schlachtfeld betreten/verlassen, werden verbucht."""
+        zone_type = zone.get('type')
+        attr = ARENA_ZONES.get(zone_type)
+        if attr is None:
+            return
+        instance_ids = zone.get('objectInstanceIds', [])
+        if zone_type in SHARED_ZONES and zone.get('ownerSeatId') is None:
+            owners = [player.player_id for player in self.game.players]
+        else:
+            owner = self._player(zone.get('ownerSeatId'))
+            if owner is None:
+                return
+            owners = [owner.player_id]
+
+        cards = [self._card_for(instance_id, zone.get('ownerSeatId')) for instance_id in instance_ids]
+        for player_id in owners:
+            player = self.game.get_player(player_id)
+            new_cards = cards if len(owners) == 1 else [c for c in cards if c.owner is player]
+            if len(owners) == 1:
+                for card in new_cards:
+                    card.owner = player
+            if attr == 'battlefield':
+                self._replace_battlefield(player.battlefield, new_cards)
+            setattr(player, attr, list(new_cards))
+
+    def _replace_battlefield(self, old_cards: List[Card], new_cards: List[Card]):
+        features = self.game.board_features
+        old_set: Set[Card] = set(old_cards)
+        new_set: Set[Card] = set(new_cards)
+        for card in old_set - new_set:
+            features.on_leave_battlefield(card)
+        for card in new_cards:
+            if card not in old_set:
+                features.on_enter_battlefield(card)
+
+    def _link_combat(self):
+        """Stellt die Blockzuweisungen der Engine-Karten aus den gespiegelten Blockzielen wieder her."""
+        for player in self.game.players:
+            for card in player.battlefield:
+                card.blockers = []
+                card.blocking = None
+        for blocker_id, attacker_id in self.block_targets.items():
+            blocker, attacker = self.cards.get(blocker_id), self.cards.get(attacker_id)
+            if blocker is not None and attacker is not None:
+                blocker.blocking = attacker
+                attacker.blockers.append(blocker)
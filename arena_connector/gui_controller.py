@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterable, AsyncIterator, Tuple
+
+import numpy as np
+
+from core.game_engine.game_state import GameState
+from .game_mirror import GameMirror
+from .log_parser import (ArenaEvent, GAME_STATE_MESSAGE, ACTIONS_AVAILABLE_REQ, DECLARE_ATTACKERS_REQ,
+                         DECLARE_BLOCKERS_REQ, MULLIGAN_REQ, iter_log_events)
+
+
+class InputAction:
+    """Eine Eingabe an den Arena-Client als Antwort auf eine Entscheidungsanfrage."""
+    def __init__(self, kind: str, instance_ids: Optional[List[int]] = None, blocks: Optional[Dict[int, int]] = None):
+        # 'pass', 'play', 'cast', 'attack', 'block' oder 'keep'
+        self.kind = kind
+        self.instance_ids = instance_ids or []
+        # Blocker-instanceId -> Angreifer-instanceId
+        self.blocks = blocks or {}
+        # Werden von der Pipeline gesetzt
+        self.game_state_id: Optional[int] = None
+        self.request_type: Optional[str] = None
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, InputAction) and self.kind == other.kind
+                and self.instance_ids == other.instance_ids and self.blocks == other.blocks)
+
+    def __repr__(self) -> str:
+        details = self.blocks if self.blocks else self.instance_ids
+        return f"InputAction({self.kind}, {details}, gameStateId={self.game_state_id})"
+
+
+class OutputBackend:
+    """Schnittstelle zur Ausgabe von Eingaben an den Client (Maus/Tastatur, Netzwerk, ...)."""
+    async def emit(self, action: InputAction):
+        raise NotImplementedError
+
+
+class RecordingBackend(OutputBackend):
+    """Zeichnet alle Eingaben mit Zeitstempel auf, statt sie auszuführen (Tests, Offline-Replay)."""
+    def __init__(self):
+        self.actions: List[InputAction] = []
+        self.emitted_at: List[float] = []
+
+    async def emit(self, action: InputAction):
+        self.actions.append(action)
+        self.emitted_at.append(time.perf_counter())
+        logging.info(f"Eingabe aufgezeichnet: {action}")
+
+
+class LatencyStats:
+    """Sammelt Latenzen (Sekunden) pro Messpunkt, z.B. 'mirror', 'snapshot', 'decision', 'end_to_end'."""
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Anzahl, Median, p95 und Maximum pro Messpunkt (in Millisekunden)."""
+        result = {}
+        for stage, values in self.samples.items():
+            ms = np.array(values) * 1000.0
+            result[stage] = {'count': len(ms), 'p50': float(np.percentile(ms, 50)),
+                             'p95': float(np.percentile(ms, 95)), 'max': float(ms.max())}
+        return result
+
+    def format(self) -> str:
+        lines = ["Messpunkt      Anzahl   p50 ms   p95 ms   max ms"]
+        for stage, s in self.summary().items():
+            lines.append(f"{stage:<14} {s['count']:>6} {s['p50']:>8.2f} {s['p95']:>8.2f} {s['max']:>8.2f}")
+        return "\n".join(lines)
+
+
+def _offered_instance_ids(request: Dict) -> Dict[str, set]:
+    """Die vom Client angebotenen Aktionen einer ActionsAvailableReq, nach Art gruppiert."""
+    offered = {'play': set(), 'cast': set()}
+    for action in request.get('actionsAvailableReq', {}).get('actions', []):
+        if action.get('actionType') == 'ActionType_Play':
+            offered['play'].add(action.get('instanceId'))
+        elif action.get('actionType') == 'ActionType_Cast':
+            offered['cast'].add(action.get('instanceId'))
+    return offered
+
+
+def decide(game: GameState, player_id: int, request_type: str, request: Dict,
+           decision_time_limit: Optional[float] = None, cancel: Optional[threading.Event] = None) -> InputAction:
+    """
+    Trifft eine KI-Entscheidung auf einem Schnappschuss des Spiegels. Läuft im Executor
+    (Thread oder Prozess) und verändert nur den übergebenen Schnappschuss.
+    Ist `cancel` gesetzt, brechen die Suchen ab und liefern ihr bisher bestes Ergebnis.
+    """
+    player = game.get_player(player_id)
+    if decision_time_limit is not None:
+        player.decision_time_limit = decision_time_limit
+    player.cancel_event = cancel
+
+    if request_type == ACTIONS_AVAILABLE_REQ:
+        action = player.choose_action()
+        offered = _offered_instance_ids(request)
+        for prefix, kind in (("play_land_", 'play'), ("cast_", 'cast')):
+            if action.startswith(prefix):
+                name = action[len(prefix):]
+                card = next((c for c in player.hand if c.name == name and c.instance_id in offered[kind]), None)
+                if card is not None:
+                    return InputAction(kind, [card.instance_id])
+                logging.warning(f"KI-Aktion '{action}' wird vom Client nicht angeboten, passe stattdessen.")
+        return InputAction('pass')
+
+    if request_type == DECLARE_ATTACKERS_REQ:
+        player.declare_attackers()
+        return InputAction('attack', [c.instance_id for c in player.battlefield if c.is_attacking])
+
+    if request_type == DECLARE_BLOCKERS_REQ:
+        player.declare_blockers()
+        return InputAction('block', blocks={c.instance_id: c.blocking.instance_id
+                                            for c in player.battlefield if c.blocking is not None})
+
+    if request_type == MULLIGAN_REQ:
+        return InputAction('keep')
+    return InputAction('pass')
+
+
+class LivePlayPipeline:
+    """
+    Asynchrone Live-Pipeline: Arena-Events -> Spiegel -> KI-Entscheidung (im Executor) -> Ausgabe.
+    Die Event-Loop aktualisiert nur den Spiegel und erzeugt Schnappschüsse; die Suche läuft
+    im Thread- oder Prozesspool, sodass eingehende Events nie auf die KI warten.
+    Trifft eine neue Entscheidungsanfrage ein, bevor die vorherige beantwortet ist, wird
+    die veraltete Suche abgebrochen (im Thread-Executor über ein Abbruchsignal; ein
+    Prozess-Executor rechnet sie zu Ende) und ihr Ergebnis verworfen.
+    """
+    def __init__(self, mirror: GameMirror, backend: OutputBackend, executor: Optional[Executor] = None,
+                 decision_time_limit: Optional[float] = None):
+        self.mirror = mirror
+        self.backend = backend
+        self.executor = executor or ThreadPoolExecutor(max_workers=1)
+        self.decision_time_limit = decision_time_limit
+        self.latency = LatencyStats()
+        # Laufende Entscheidung: Anfrage, Task und Abbruchsignal der Suche
+        self._pending: Optional[Tuple[ArenaEvent, asyncio.Future, Optional[threading.Event]]] = None
+        self.dropped_decisions = 0
+
+    async def handle_event(self, event: ArenaEvent) -> Optional[asyncio.Task]:
+        """Verarbeitet ein Event; bei Entscheidungsanfragen wird die laufende Entscheidung zurückgegeben."""
+        if event.message_type == GAME_STATE_MESSAGE:
+            start = time.perf_counter()
+            self.mirror.apply(event.payload)
+            self.latency.record('mirror', time.perf_counter() - start)
+            return None
+        if not event.is_decision_request:
+            return None
+        if self.mirror.local_seat is None and event.seat_ids:
+            self.mirror.local_seat = event.seat_ids[0]
+        if event.seat_ids and self.mirror.local_seat not in event.seat_ids:
+            return None
+
+        if self._pending is not None and self._pending[2] is not None:
+            # Die laufende Suche ist überholt: abbrechen, damit die neue nicht auf sie wartet
+            self._pending[2].set()
+        start = time.perf_counter()
+        snapshot = self.mirror.snapshot()
+        self.latency.record('snapshot', time.perf_counter() - start)
+        # Ein threading.Event erreicht nur Suchen im selben Prozess
+        cancel = threading.Event() if isinstance(self.executor, ThreadPoolExecutor) else None
+        task = asyncio.ensure_future(self._decide_and_emit(event, snapshot, cancel))
+        self._pending = (event, task, cancel)
+        return task
+
+    async def _decide_and_emit(self, event: ArenaEvent, snapshot: GameState, cancel: Optional[threading.Event]):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        action = await loop.run_in_executor(self.executor, decide, snapshot, self.mirror.local_player_id,
+                                            event.message_type, event.payload, self.decision_time_limit, cancel)
+        self.latency.record('decision', time.perf_counter() - start)
+
+        if self._pending is None or self._pending[0] is not event:
+            self.dropped_decisions += 1
+            logging.info(f"Veraltete Entscheidung für {event} verworfen.")
+            return
+        action.game_state_id = event.game_state_id
+        action.request_type = event.message_type
+        await self.backend.emit(action)
+        self.latency.record('end_to_end', time.perf_counter() - event.received_at)
+        self._pending = None
+
+    async def run(self, events: AsyncIterator[ArenaEvent], wait_for_decisions: bool = False):
+        """
+        Verarbeitet Events bis zum Ende des Streams. Mit `wait_for_decisions` wird jede
+        Entscheidung abgewartet, bevor das nächste Event gelesen wird (deterministisches Replay).
+        """
+        async for event in events:
+            task = await self.handle_event(event)
+            if task is not None and wait_for_decisions:
+                await task
+        if self._pending is not None:
+            await self._pending[1]
+
+
+async def _replayed(lines: Iterable[str]) -> AsyncIterator[ArenaEvent]:
+    for event in iter_log_events(lines):
+        # Latenzen beim Replay ab dem Zeitpunkt messen, zu dem das Event eingespeist wird
+        event.received_at = time.perf_counter()
+        yield event
+        await asyncio.sleep(0)
+
+
+async def replay_log(lines: Iterable[str], mirror: GameMirror, backend: Optional[OutputBackend] = None,
+                     executor: Optional[Executor] = None, decision_time_limit: Optional[float] = None) -> LivePlayPipeline:
+    """
+    Spielt ein aufgezeichnetes Arena-Log offline durch die komplette Pipeline ab
+    (standardmäßig mit `RecordingBackend`). Gibt die Pipeline samt Latenzstatistik zurück.
+    """
+    pipeline = LivePlayPipeline(mirror, backend or RecordingBackend(), executor, decision_time_limit)
+    await pipeline.run(_replayed(lines), wait_for_decisions=True)
+    logging.info(f"Replay abgeschlossen:\n{pipeline.latency.format()}")
+    return pipeline
+
+
+def benchmark_mirror(lines: Iterable[str], mirror: GameMirror) -> LatencyStats:
+    """Misst die Anwendungszeit pro GameStateMessage (Diff/voll) eines aufgezeichneten Logs."""
+    stats = LatencyStats()
+    for event in iter_log_events(lines):
+        if event.message_type != GAME_STATE_MESSAGE:
+            continue
+        is_full = event.payload.get('gameStateMessage', {}).get('type') == 'GameStateType_Full'
+        start = time.perf_counter()
+        mirror.apply(event.payload)
+        stats.record('apply_full' if is_full else 'apply_diff', time.perf_counter() - start)
+    logging.info(f"Spiegel-Benchmark ({mirror.desyncs} Desyncs):\n{stats.format()}")
+    return stats
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+import time
+from typing import List, Dict, Iterable, Iterator, AsyncIterator, Optional
+
+# GRE-Nachrichtentypen, die die Live-Pipeline auswertet
+GAME_STATE_MESSAGE = 'GREMessageType_GameStateMessage'
+ACTIONS_AVAILABLE_REQ = 'GREMessageType_ActionsAvailableReq'
+DECLARE_ATTACKERS_REQ = 'GREMessageType_DeclareAttackersReq'
+DECLARE_BLOCKERS_REQ = 'GREMessageType_DeclareBlockersReq'
+MULLIGAN_REQ = 'GREMessageType_MulliganReq'
+# Nachrichten, auf die der Client mit einer Eingabe antworten muss
+DECISION_REQUESTS = {ACTIONS_AVAILABLE_REQ, DECLARE_ATTACKERS_REQ, DECLARE_BLOCKERS_REQ, MULLIGAN_REQ}
+
+
+class ArenaEvent:
+    """Eine einzelne GRE-Nachricht aus dem Arena-Log (Player.log)."""
+    def __init__(self, message_type: str, payload: Dict, seat_ids: List[int], line_number: int,
+                 received_at: Optional[float] = None):
+        self.message_type = message_type
+        self.payload = payload
+        # Sitzplätze, an die die Nachricht ging (enthält den eigenen Sitz)
+        self.seat_ids = seat_ids
+        self.line_number = line_number
+        # Zeitpunkt (time.perf_counter), zu dem die Zeile gelesen wurde; Basis der Latenzmessung
+        self.received_at = received_at if received_at is not None else time.perf_counter()
+
+    @property
+    def game_state_id(self) -> Optional[int]:
+        return self.payload.get('gameStateId')
+
+    @property
+    def is_decision_request(self) -> bool:
+        return self.message_type in DECISION_REQUESTS
+
+    def __repr__(self) -> str:
+        return f"ArenaEvent({self.message_type}, gameStateId={self.game_state_id}, Zeile {self.line_number})"
+
+
+def parse_log_line(line: str, line_number: int = 0) -> List[ArenaEvent]:
+    """
+    Extrahiert alle GRE-Nachrichten aus einer Logzeile. Zeilen ohne JSON oder ohne
+    `greToClientEvent` (z.B. reine Header-Zeilen des UnityCrossThreadLogger) ergeben keine Events.
+    """
+    start = line.find('{')
+    if start < 0 or 'greToClientEvent' not in line:
+        return []
+    try:
+        data = json.loads(line[start:])
+    except json.JSONDecodeError:
+        logging.debug(f"Logzeile {line_number} enthält kein vollständiges JSON.")
+        return []
+
+    received_at = time.perf_counter()
+    messages = data.get('greToClientEvent', {}).get('greToClientMessages', [])
+    return [ArenaEvent(message.get('type', ''), message, message.get('systemSeatIds', []), line_number, received_at)
+            for message in messages]
+
+
+def iter_log_events(lines: Iterable[str]) -> Iterator[ArenaEvent]:
+    """Parst aufgezeichnete Logzeilen der Reihe nach (Offline-Replay)."""
+    for line_number, line in enumerate(lines, start=1):
+        yield from parse_log_line(line, line_number)
+
+
+async def follow_log(path: str, poll_interval: float = 0.05, from_start: bool = False) -> AsyncIterator[ArenaEvent]:
+    """Verfolgt das laufende Arena-Log (wie `tail -f`), ohne die Event-Loop zu blockieren."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        if not from_start:
+            f.seek(0, 2)
+        line_number = 0
+        pending = ''
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            pending += chunk
+            if not pending.endswith('\n'):
+                # Zeile wird noch geschrieben
+                continue
+            line_number += 1
+            for event in parse_log_line(pending, line_number):
+                yield event
+            pending = ''
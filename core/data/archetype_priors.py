@@ -0,0 +1,101 @@
+import json
+import logging
+import math
+from typing import List, Dict, Mapping, Iterable, Optional
+
+import numpy as np
+
+
+class ArchetypePrior:
+    """
+    Kartenverteilung eines Deck-Archetyps: erwartete Anzahl jeder Karte im Deck, z.B.
+    gemittelt über Decklisten aus 17lands-Daten. Karten werden über ihren Namen geführt,
+    `cards` enthält die zugehörigen Kartendaten.
+    """
+    def __init__(self, name: str, card_counts: Mapping[str, float], cards: Mapping[str, Dict],
+                 weight: float = 1.0, deck_size: Optional[int] = None):
+        self.name = name
+        self.names: List[str] = sorted(n for n, count in card_counts.items() if count > 0 and n in cards)
+        self.counts = np.array([float(card_counts[n]) for n in self.names])
+        self.cards = {n: cards[n] for n in self.names}
+        self.weight = weight
+        self.deck_size = deck_size if deck_size is not None else int(round(self.counts.sum()))
+        self._integer_counts: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_cards(cls, name: str, cards: Iterable[Dict], weight: float = 1.0) -> 'ArchetypePrior':
+        """Prior aus einer bekannten Deckliste (Kartendaten, eine pro Exemplar)."""
+        counts: Dict[str, float] = {}
+        data: Dict[str, Dict] = {}
+        for card in cards:
+            counts[card['name']] = counts.get(card['name'], 0) + 1
+            data[card['name']] = card
+        return cls(name, counts, data, weight)
+
+    @classmethod
+    def from_decklists(cls, name: str, decklists: List[List[Dict]], weight: float = 1.0) -> 'ArchetypePrior':
+        """Mittelt mehrere Decklisten desselben Archetyps zu erwarteten Kartenanzahlen."""
+        counts: Dict[str, float] = {}
+        data: Dict[str, Dict] = {}
+        for deck in decklists:
+            for card in deck:
+                counts[card['name']] = counts.get(card['name'], 0) + 1.0 / len(decklists)
+                data[card['name']] = card
+        deck_size = int(round(np.mean([len(deck) for deck in decklists]))) if decklists else 0
+        return cls(name, counts, data, weight, deck_size)
+
+    def integer_counts(self) -> np.ndarray:
+        """Ganzzahlige Kartenanzahlen mit Summe `deck_size` (Verfahren des größten Rests)."""
+        if self._integer_counts is None:
+            total = self.counts.sum()
+            scaled = self.counts * (self.deck_size / total) if total > 0 else self.counts
+            counts = np.floor(scaled).astype(np.int64)
+            missing = self.deck_size - int(counts.sum())
+            if missing > 0:
+                counts[np.argsort(counts - scaled)[:missing]] += 1
+            self._integer_counts = counts
+        return self._integer_counts
+
+    def log_likelihood(self, observed: Mapping[str, int]) -> float:
+        """
+        Log-Wahrscheinlichkeit, die beobachteten Karten aus einem Deck dieses Archetyps zu sehen
+        (multivariat hypergeometrisch). -inf, wenn eine beobachtete Karte nicht hineinpasst.
+        """
+        counts = dict(zip(self.names, self.integer_counts().tolist()))
+        seen = sum(observed.values())
+        if seen > self.deck_size:
+            return -math.inf
+        result = -_log_binomial(self.deck_size, seen)
+        for name, k in observed.items():
+            n = counts.get(name, 0)
+            if k > n:
+                return -math.inf
+            result += _log_binomial(n, k)
+        return result
+
+    def __repr__(self) -> str:
+        return f"ArchetypePrior({self.name}, {len(self.names)} Karten, Deckgröße {self.deck_size}, Gewicht {self.weight})"
+
+
+def _log_binomial(n: int, k: int) -> float:
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def load_archetypes(path: str, card_db: Mapping[str, Dict]) -> List[ArchetypePrior]:
+    """
+    Lädt Archetyp-Priors aus einer JSON-Datei der Form
+    [{"name": ..., "weight": ..., "deck_size": ..., "cards": {Kartenname: erwartete Anzahl}}].
+    Unbekannte Kartennamen werden übersprungen.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    by_name = {data['name']: data for data in card_db.values()}
+    archetypes = []
+    for entry in entries:
+        unknown = [n for n in entry['cards'] if n not in by_name]
+        if unknown:
+            logging.warning(f"Archetyp '{entry['name']}': {len(unknown)} unbekannte Karten übersprungen ({unknown[:3]}...).")
+        archetypes.append(ArchetypePrior(entry['name'], entry['cards'], by_name,
+                                         entry.get('weight', 1.0), entry.get('deck_size')))
+    logging.info(f"{len(archetypes)} Archetyp-Priors aus {path} geladen.")
+    return archetypes
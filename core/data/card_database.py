@@ -0,0 +1,32 @@
+from typing import Dict, List, Mapping, Sequence
+
+from core.data.card_registry import CardRegistry, set_active_registry
+from core.data.card_store import CardStore
+
+# Vom Scryfall-Importer erzeugte Kartendatenbank (siehe `scryfall_importer.OUTPUT_DB_PATH`)
+CARD_DB_PATH = "core/data/card_db.json"
+
+
+def load_card_database(path: str = CARD_DB_PATH) -> Dict[str, Dict]:
+    """Lädt die Kartendatenbank (Manifest und Shards, siehe `CardStore`)."""
+    return CardStore(path).records()
+
+
+def load_card_registry(path: str = CARD_DB_PATH) -> CardRegistry:
+    """
+    Lädt die Kartendatenbank einmal und veröffentlicht sie als Shared-Memory-Register
+    für Worker-Prozesse (siehe `core.data.card_registry.init_worker`).
+    """
+    return set_active_registry(CardRegistry.publish(load_card_database(path)))
+
+
+def build_simple_deck(card_db: Mapping[str, Dict], card_names: Sequence[str], num_each: int = 1) -> List[Dict]:
+    """Erstellt eine einfache Deckliste aus einer Liste von Kartennamen."""
+    deck = []
+    for name in card_names:
+        # Finde die Oracle-ID für den Kartennamen
+        oracle_id = next((oid for oid, data in card_db.items() if data['name'] == name), None)
+        if oracle_id:
+            for _ in range(num_each):
+                deck.append(card_db[oracle_id])
+    return deck
@@ -0,0 +1,148 @@
+import json
+import logging
+import sys
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+# Breite einer Oracle-ID (UUID als ASCII)
+ORACLE_ID_WIDTH = 36
+# Kopf des Speicherblocks: [Anzahl Karten, Größe der Datensätze in Bytes]
+_HEADER_FIELDS = 2
+
+_active_registry: Optional['CardRegistry'] = None
+
+
+class CardRegistry(Mapping):
+    """
+    Schreibgeschützte Kartendatenbank in einem Shared-Memory-Block. Der Hauptprozess
+    veröffentlicht die Datenbank einmal (`publish`), Worker-Prozesse hängen sich per
+    Namen an (`attach`), ohne die JSON-Datei erneut zu laden und zu parsen.
+    Karten werden im Spielzustand über ihre kleine Integer-ID (`card_id`) referenziert;
+    die Datensätze werden erst beim ersten Zugriff dekodiert und pro Prozess gecacht.
+    Verhält sich wie das bisherige `card_db`-Dict (Oracle-ID -> Kartendaten).
+
+    Speicherlayout: Kopf (int64[2]), Oracle-IDs (S36[n]), Offsets (int64[n+1]),
+    danach die kompakt JSON-kodierten Datensätze.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf
+        count = int(np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf)[0])
+        offset = _HEADER_FIELDS * 8
+        self._oracle_ids = np.ndarray((count,), dtype=f'S{ORACLE_ID_WIDTH}', buffer=buf, offset=offset)
+        offset += count * ORACLE_ID_WIDTH
+        self._offsets = np.ndarray((count + 1,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += (count + 1) * 8
+        self._blob_start = offset
+        self._cache: Dict[int, Dict] = {}
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def name(self) -> str:
+        """Name des Shared-Memory-Blocks, über den sich Worker anhängen."""
+        return self._shm.name
+
+    @classmethod
+    def publish(cls, card_db: Dict[str, Dict], name: Optional[str] = None) -> 'CardRegistry':
+        """Schreibt die Kartendatenbank einmalig in einen neuen Shared-Memory-Block."""
+        oracle_ids = sorted(card_db)
+        records = [json.dumps(card_db[oid], ensure_ascii=False, separators=(',', ':')).encode('utf-8') for oid in oracle_ids]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in records], out=offsets[1:])
+        size = _HEADER_FIELDS * 8 + len(records) * ORACLE_ID_WIDTH + offsets.nbytes + int(offsets[-1])
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        buf = shm.buf
+        np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf)[:] = [len(records), offsets[-1]]
+        offset = _HEADER_FIELDS * 8
+        np.ndarray((len(records),), dtype=f'S{ORACLE_ID_WIDTH}', buffer=buf, offset=offset)[:] = [oid.encode('ascii') for oid in oracle_ids]
+        offset += len(records) * ORACLE_ID_WIDTH
+        np.ndarray(offsets.shape, dtype=np.int64, buffer=buf, offset=offset)[:] = offsets
+        offset += offsets.nbytes
+        buf[offset:offset + int(offsets[-1])] = b''.join(records)
+
+        logging.info(f"Kartenregister '{shm.name}' veröffentlicht: {len(records)} Karten, {size / 1e6:.1f} MB.")
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'CardRegistry':
+        """Hängt sich an ein bereits veröffentlichtes Register an."""
+        if sys.version_info >= (3, 13):
+            # Nur der veröffentlichende Prozess darf den Block freigeben
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Worker aus einem Pool teilen sich den Resource-Tracker des Hauptprozesses,
+            # die erneute Registrierung desselben Blocks ist dort wirkungslos
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def card(self, card_id: int) -> Dict:
+        """Gibt die (gecachten, nicht zu verändernden) Kartendaten zu einer Karten-ID zurück."""
+        data = self._cache.get(card_id)
+        if data is None:
+            start = self._blob_start + int(self._offsets[card_id])
+            end = self._blob_start + int(self._offsets[card_id + 1])
+            data = json.loads(bytes(self._shm.buf[start:end]).decode('utf-8'))
+            data['oracle_id'] = self._oracle_ids[card_id].decode('ascii')
+            data['card_id'] = card_id
+            self._cache[card_id] = data
+        return data
+
+    def card_id(self, oracle_id: str) -> int:
+        """Gibt die Karten-ID zu einer Oracle-ID zurück."""
+        if self._index is None:
+            self._index = {oid.decode('ascii'): i for i, oid in enumerate(self._oracle_ids.tolist())}
+        return self._index[oracle_id]
+
+    def __getitem__(self, oracle_id: str) -> Dict:
+        return self.card(self.card_id(oracle_id))
+
+    def __iter__(self) -> Iterator[str]:
+        return (oid.decode('ascii') for oid in self._oracle_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self._oracle_ids)
+
+    def __deepcopy__(self, memo):
+        # Schreibgeschützt: Simulationskopien teilen sich das Register
+        return self
+
+    def __reduce__(self):
+        # Beim Pickeln wird nur der Name übertragen, der Empfänger hängt sich selbst an
+        return (_registry_by_name, (self.name,))
+
+    def close(self):
+        """Löst die Views und den Block in diesem Prozess; der Besitzer gibt ihn zusätzlich frei."""
+        self._oracle_ids = self._offsets = None
+        self._cache = {}
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _registry_by_name(name: str) -> CardRegistry:
+    """Gibt das aktive Register zurück, falls es passt, und hängt sich sonst neu an."""
+    if _active_registry is not None and _active_registry.name == name:
+        return _active_registry
+    return set_active_registry(CardRegistry.attach(name))
+
+
+def set_active_registry(registry: Optional[CardRegistry]) -> Optional[CardRegistry]:
+    """Setzt das Register, über das Karten ihre Daten anhand ihrer `card_id` nachschlagen."""
+    global _active_registry
+    _active_registry = registry
+    return registry
+
+
+def get_active_registry() -> Optional[CardRegistry]:
+    return _active_registry
+
+
+def init_worker(registry_name: str):
+    """Initializer für Worker-Prozesse (z.B. `ProcessPoolExecutor(initializer=init_worker, initargs=(name,))`)."""
+    _registry_by_name(registry_name)
+    logging.info(f"Worker an Kartenregister '{registry_name}' angehängt.")
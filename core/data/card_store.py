@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Kennung des Manifests; eine Datei ohne sie ist eine Datenbank im alten Format (ein einziges Dict)
+MANIFEST_FORMAT = 'sharded-v1'
+# Länge des Oracle-ID-Präfixes, nach dem die Datensätze auf Shards verteilt werden (256 Shards)
+SHARD_PREFIX_LENGTH = 2
+# Länge des Inhaltshashes im Dateinamen eines Shards
+SHARD_DIGEST_LENGTH = 16
+
+
+def write_json_atomic(data, path: str, sort_keys: bool = False):
+    """Schreibt in eine temporäre Datei im selben Verzeichnis und tauscht sie atomar ein."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        # json.dumps nutzt den C-Encoder, json.dump auf eine Datei nicht
+        f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shard_key(oracle_id: str) -> str:
+    return oracle_id[:SHARD_PREFIX_LENGTH]
+
+
+def referenced_files(manifest_path: str) -> Set[str]:
+    """Dateinamen der Shards, auf die ein Manifest (aktueller Stand oder Version) verweist."""
+    try:
+        manifest = _read_json(manifest_path)
+    except (OSError, ValueError):
+        return set()
+    if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+        return set()
+    return {os.path.basename(path) for entry in manifest['shards'].values() for path in entry.values()}
+
+
+class CardStore:
+    """
+    Kartendatenbank als Manifest (unter dem Datenbankpfad) plus unveränderliche Shards im
+    Verzeichnis `<name>.shards` daneben. Die Datensätze sind nach dem Präfix ihrer Oracle-ID
+    auf Shards verteilt; je Shard gibt es eine Datei mit den Datensätzen und eine mit deren
+    Inhaltshashes. Shard-Dateien sind nach ihrem Inhalt benannt und werden nie überschrieben.
+
+    Eine Aktualisierung schreibt nur die Shards der geänderten Karten neu und tauscht danach
+    das Manifest in einem Schritt atomar ein (os.replace): Leser sehen immer einen
+    vollständigen Stand, ein Abbruch hinterlässt höchstens unreferenzierte Shards. Eine
+    Version ist eine Kopie des Manifests (siehe `collect_garbage`); sie wird wiederhergestellt,
+    indem man sie an den Datenbankpfad kopiert. Eine Datenbank im alten Format (eine
+    einzige JSON-Datei mit allen Datensätzen) wird gelesen und beim nächsten Schreiben
+    vollständig in Shards überführt.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.base_dir = os.path.dirname(db_path) or '.'
+        self.shard_dir = os.path.splitext(db_path)[0] + '.shards'
+
+    def exists(self) -> bool:
+        return os.path.exists(self.db_path)
+
+    def _load(self) -> Tuple[Dict, Optional[Dict[str, Dict]]]:
+        """Gibt (Manifest, Datensätze einer Datenbank im alten Format oder None) zurück."""
+        empty = {'format': MANIFEST_FORMAT, 'shards': {}}
+        if not self.exists():
+            return empty, None
+        data = _read_json(self.db_path)
+        if isinstance(data, dict) and data.get('format') == MANIFEST_FORMAT:
+            return data, None
+        return empty, data
+
+    def is_legacy(self) -> bool:
+        """True für eine Datenbank im alten Format (ohne Inhaltshashes)."""
+        return self._load()[1] is not None
+
+    def _read_shards(self, manifest: Dict, kind: str) -> Dict:
+        merged = {}
+        for entry in manifest['shards'].values():
+            merged.update(_read_json(os.path.join(self.base_dir, entry[kind])))
+        return merged
+
+    def records(self) -> Dict[str, Dict]:
+        """Alle Datensätze (Oracle-ID -> Kartendaten)."""
+        manifest, legacy = self._load()
+        return legacy if legacy is not None else self._read_shards(manifest, 'records')
+
+    def hashes(self) -> Dict[str, str]:
+        """Inhaltshashes aller Datensätze (leer für eine Datenbank im alten Format)."""
+        manifest, _ = self._load()
+        return self._read_shards(manifest, 'hashes')
+
+    def _write_shard(self, key: str, kind: str, data: Dict) -> str:
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:SHARD_DIGEST_LENGTH]
+        name = f"{key}.{kind}.{digest}.json"
+        path = os.path.join(self.shard_dir, name)
+        if not os.path.exists(path):
+            write_json_atomic(data, path, sort_keys=True)
+        return os.path.relpath(path, self.base_dir)
+
+    def apply(self, changed: Dict[str, Dict], removed: Iterable[str], hashes: Dict[str, str]):
+        """
+        Übernimmt neue/geänderte Datensätze (`hashes` enthält deren Inhaltshashes) und entfernt
+        `removed`. Gelesen und geschrieben werden nur die betroffenen Shards, danach wird das
+        Manifest eingetauscht.
+        """
+        manifest, legacy = self._load()
+        removed = list(removed)
+        os.makedirs(self.shard_dir, exist_ok=True)
+        if legacy is not None:
+            # Umstellung: alle Datensätze werden geschrieben, ihre Hashes liefert der Aufrufer
+            changed = {**{oid: record for oid, record in legacy.items() if oid not in removed}, **changed}
+        by_shard: Dict[str, Tuple[Dict[str, Dict], List[str]]] = {}
+        for oracle_id, record in changed.items():
+            by_shard.setdefault(shard_key(oracle_id), ({}, []))[0][oracle_id] = record
+        for oracle_id in removed:
+            by_shard.setdefault(shard_key(oracle_id), ({}, []))[1].append(oracle_id)
+
+        shards = dict(manifest['shards'])
+        for key, (shard_changed, shard_removed) in by_shard.items():
+            entry = shards.get(key)
+            records = _read_json(os.path.join(self.base_dir, entry['records'])) if entry else {}
+            shard_hashes = _read_json(os.path.join(self.base_dir, entry['hashes'])) if entry else {}
+            records.update(shard_changed)
+            shard_hashes.update({oracle_id: hashes[oracle_id] for oracle_id in shard_changed})
+            for oracle_id in shard_removed:
+                records.pop(oracle_id, None)
+                shard_hashes.pop(oracle_id, None)
+            if records:
+                shards[key] = {'records': self._write_shard(key, 'records', records),
+                               'hashes': self._write_shard(key, 'hashes', shard_hashes)}
+            else:
+                shards.pop(key, None)
+        write_json_atomic({'format': MANIFEST_FORMAT, 'shards': dict(sorted(shards.items()))}, self.db_path)
+
+    def collect_garbage(self, manifest_paths: Iterable[str]) -> int:
+        """
+        Entfernt Shards, auf die weder der aktuelle Stand noch eines der gegebenen Manifeste
+        (aufbewahrte Versionen) verweist, z.B. nach dem Löschen alter Versionen oder einem
+        Abbruch vor dem Eintauschen des Manifests. Gibt die Zahl entfernter Dateien zurück.
+        """
+        if not os.path.isdir(self.shard_dir):
+            return 0
+        referenced = referenced_files(self.db_path)
+        for path in manifest_paths:
+            referenced |= referenced_files(path)
+        removed = 0
+        for name in os.listdir(self.shard_dir):
+            if name not in referenced:
+                os.remove(os.path.join(self.shard_dir, name))
+                removed += 1
+        return removed
@@ -0,0 +1,136 @@
+import logging
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from core.game_engine.batched_engine import COLORS, STARTING_HAND_SIZE, parse_mana_cost
+from core.game_engine.player import BASIC_LAND_COLORS
+
+# Alle nichtleeren Farbmengen als Zeilen einer Bitmaske [31, 5]; mit ihnen wird die
+# Farbbedingung nach dem Heiratssatz (Hall) geprüft, siehe `analyze_deck`
+COLOR_SUBSETS = np.array([[(mask >> i) & 1 for i in range(len(COLORS))] for mask in range(1, 2 ** len(COLORS))],
+                         dtype=np.int64)
+
+
+class GoldfishReport:
+    """Ergebnisse einer Goldfish-Analyse; alle Wahrscheinlichkeiten sind pro Zug (Index 0 = Zug 1)."""
+    def __init__(self, num_shuffles: int, max_turn: int, on_the_play: bool):
+        self.num_shuffles = num_shuffles
+        self.max_turn = max_turn
+        self.on_the_play = on_the_play
+        # P(bis Zug t wurden t Länder gespielt)
+        self.land_drop_prob = np.zeros(max_turn)
+        # Durchschnittliche Anzahl gespielter Länder in Zug t
+        self.mean_lands_in_play = np.zeros(max_turn)
+        # P(in Zug t kann ein Zauber mit Manawert t gewirkt werden)
+        self.on_curve_prob = np.zeros(max_turn)
+        # P(genug Länder für einen Zauber auf der Hand, aber keiner ist wegen Farben wirkbar)
+        self.color_screw_rate = np.zeros(max_turn)
+        # P(mindestens ein Zauber auf der Hand ist wirkbar)
+        self.castable_prob = np.zeros(max_turn)
+
+    def format(self) -> str:
+        """Gibt den Bericht als Texttabelle zurück."""
+        lines = [f"Goldfish-Analyse: {self.num_shuffles} Mischungen, {'auf dem Play' if self.on_the_play else 'auf dem Draw'}",
+                 "Zug  Landdrop  Länder  On-Curve  Wirkbar  Farbprobleme"]
+        for t in range(self.max_turn):
+            lines.append(f"{t + 1:>4}  {self.land_drop_prob[t]:>8.1%}  {self.mean_lands_in_play[t]:>6.2f}"
+                         f"  {self.on_curve_prob[t]:>8.1%}  {self.castable_prob[t]:>7.1%}  {self.color_screw_rate[t]:>12.1%}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return self.format()
+
+
+def _deck_arrays(deck: List[Dict]) -> Dict[str, np.ndarray]:
+    """Packt Landstatus, Farbquellen, Manawert und Farbpips der Deckliste in Arrays."""
+    is_land = np.array(['Land' in (card.get('type_line') or '') for card in deck], dtype=bool)
+    land_colors = np.zeros((len(deck), len(COLORS)), dtype=np.int8)
+    pips = np.zeros((len(deck), len(COLORS)), dtype=np.int8)
+    for i, card in enumerate(deck):
+        if is_land[i]:
+            # Standardländer über den Namen, andere Länder über ihre Farbidentität
+            produced = [BASIC_LAND_COLORS[card['name']]] if card['name'] in BASIC_LAND_COLORS else card.get('color_identity', [])
+            for color in produced:
+                if color in COLORS:
+                    land_colors[i, COLORS.index(color)] = 1
+        else:
+            _, pips[i] = parse_mana_cost(card.get('mana_cost', '') or '')
+    return {
+        'is_land': is_land,
+        'land_colors': land_colors,
+        'pips': pips,
+        'cmc': np.array([int(card.get('cmc', 0) or 0) for card in deck], dtype=np.int16),
+    }
+
+
+def analyze_deck(deck: List[Dict], num_shuffles: int = 200_000, max_turn: int = 8, on_the_play: bool = True,
+                 rng: Optional[np.random.Generator] = None, chunk_size: int = 25_000) -> GoldfishReport:
+    """
+    Goldfish-Analyse einer Deckliste (Kartendaten wie von `build_simple_deck`): Es werden
+    `num_shuffles` Mischungen auf einmal als Permutationsmatrix erzeugt und für jeden Zug
+    Landdrops, Farbquellen und wirkbare Zauber vektorisiert ausgewertet.
+    Vereinfachungen: keine Mulligans, jedes Land erzeugt ein Mana einer seiner Farben,
+    es wird jeden Zug gespielt, sobald ein Land auf der Hand ist.
+    """
+    rng = rng or np.random.default_rng()
+    cards = _deck_arrays(deck)
+    deck_size = len(deck)
+    report = GoldfishReport(num_shuffles, max_turn, on_the_play)
+    draws_before_turn_one = 0 if on_the_play else 1
+    prefix = min(deck_size, STARTING_HAND_SIZE + max_turn - 1 + draws_before_turn_one)
+
+    # Zauber mit gleichem Manawert und gleichen Farbpips werden zu einem Typ zusammengefasst
+    spell_keys = [(int(cards['cmc'][i]), tuple(cards['pips'][i])) for i in range(deck_size) if not cards['is_land'][i]]
+    spell_types = sorted(set(spell_keys))
+    type_index = np.full(deck_size, -1, dtype=np.int64)
+    for i in np.flatnonzero(~cards['is_land']):
+        type_index[i] = spell_types.index((int(cards['cmc'][i]), tuple(cards['pips'][i])))
+    type_cmc = np.array([cmc for cmc, _ in spell_types], dtype=np.int64)
+    type_pips = np.array([pips for _, pips in spell_types], dtype=np.int64).reshape(len(spell_types), len(COLORS))
+    type_onehot = np.zeros((deck_size, len(spell_types)), dtype=np.int16)
+    type_onehot[type_index >= 0, type_index[type_index >= 0]] = 1
+
+    # Jedes Land bezahlt nur ein Pip. Die Farbkosten sind genau dann bezahlbar, wenn es für jede
+    # Farbmenge mindestens so viele Länder mit einer dieser Farben gibt, wie Pips dieser Farben
+    # verlangt werden (Hall); so zählt ein Dual-Land nicht für beide Farben zugleich
+    land_sources = (cards['land_colors'].astype(np.int64) @ COLOR_SUBSETS.T > 0).astype(np.int16)    # [N, 31]
+    type_demand = type_pips @ COLOR_SUBSETS.T                                                        # [G, 31]
+
+    for start in range(0, num_shuffles, chunk_size):
+        n = min(chunk_size, num_shuffles - start)
+        # Nur der Anfang der gemischten Bibliothek wird bis `max_turn` gesehen
+        order = np.argsort(rng.random((n, deck_size)), axis=1)[:, :prefix]
+        land_at = cards['is_land'][order]                                             # [n, P]
+        lands_seen_at = np.cumsum(land_at, axis=1)
+        spells_seen = np.cumsum(type_onehot[order], axis=1)                           # [n, P, G]
+        # Länder in Ziehreihenfolge nach vorne sortieren; sources_by_count[:, k, s] ist die Zahl
+        # der ersten k Länder (der bis dahin gespielten), die mindestens eine Farbe der Menge s erzeugen
+        lands_first = np.argsort(~land_at, axis=1, kind='stable')
+        is_land_ranked = np.take_along_axis(land_at, lands_first, axis=1)
+        land_sources_ranked = land_sources[np.take_along_axis(order, lands_first, axis=1)] * is_land_ranked[:, :, None]
+        sources_by_count = np.zeros((n, prefix + 1, len(COLOR_SUBSETS)), dtype=np.int16)
+        np.cumsum(land_sources_ranked, axis=1, out=sources_by_count[:, 1:])
+        rows = np.arange(n)
+
+        lands_played = np.zeros(n, dtype=np.int64)
+        for t in range(max_turn):
+            cards_seen = min(STARTING_HAND_SIZE + t + draws_before_turn_one, prefix)
+            lands_played = np.minimum(lands_played + 1, lands_seen_at[:, cards_seen - 1])
+
+            sources = sources_by_count[rows, lands_played]                               # [n, 31]
+            in_hand = spells_seen[:, cards_seen - 1, :] > 0                           # [n, G]
+            affordable = in_hand & (type_cmc[None, :] <= lands_played[:, None])
+            colors_ok = (sources[:, None, :] >= type_demand[None, :, :]).all(axis=2)
+            castable = affordable & colors_ok & (type_pips.sum(axis=1)[None, :] <= lands_played[:, None])
+
+            report.land_drop_prob[t] += (lands_played == t + 1).sum()
+            report.mean_lands_in_play[t] += lands_played.sum()
+            report.on_curve_prob[t] += (castable & (type_cmc == t + 1)[None, :]).any(axis=1).sum()
+            report.castable_prob[t] += castable.any(axis=1).sum()
+            report.color_screw_rate[t] += (affordable.any(axis=1) & ~castable.any(axis=1)).sum()
+
+    for name in ('land_drop_prob', 'mean_lands_in_play', 'on_curve_prob', 'castable_prob', 'color_screw_rate'):
+        setattr(report, name, getattr(report, name) / num_shuffles)
+    logging.info(f"Goldfish-Analyse für {deck_size} Karten abgeschlossen ({num_shuffles} Mischungen).")
+    return report
@@ -1,7 +1,16 @@
 import requests
+import argparse
+import gzip
+import hashlib
 import json
+import os
+import shutil
 import time
 import logging
+import re
+from typing import List, Dict, Optional, Tuple
+
+from core.data.card_store import CardStore
 
 # Konfiguration des Loggings
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,6 +19,14 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 SCRYFALL_API_BASE = "https://api.scryfall.com"
 BULK_DATA_ENDPOINT = "/bulk-data"
 OUTPUT_DB_PATH = "core/data/card_db.json"
+# Heruntergeladene Bulk-Datei; kann mit --bulk-file erneut importiert werden
+BULK_CACHE_PATH = "core/data/oracle_cards.json"
+# Versionierte Stände der Datenbank und Anzahl der aufbewahrten Versionen
+SNAPSHOT_DIR = "core/data/snapshots"
+KEEP_SNAPSHOTS = 5
+# Dateiname eines Stands: card_db.<JJJJMMTT-HHMMSS>[-<n>].json
+SNAPSHOT_NAME = re.compile(r'^card_db\.(\d{8}-\d{6})(?:-(\d+))?\.json$')
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 def get_bulk_data_url() -> str:
     """
@@ -20,12 +37,12 @@ def get_bulk_data_url() -> str:
         response = requests.get(SCRYFALL_API_BASE + BULK_DATA_ENDPOINT)
         response.raise_for_status()
         bulk_data_objects = response.json()['data']
-        
+
         for obj in bulk_data_objects:
             if obj['type'] == 'oracle_cards':
                 logging.info(f"Bulk-Daten URL gefunden: {obj['download_uri']}")
                 return obj['download_uri']
-        
+
         raise ValueError("Kein 'oracle_cards' Bulk-Datenobjekt gefunden.")
 
     except requests.exceptions.RequestException as e:
@@ -35,66 +52,177 @@ def get_bulk_data_url() -> str:
         logging.error(f"Fehler bei der Verarbeitung der Scryfall-Antwort: {e}")
         raise
 
-def download_and_process_bulk_data(url: str) -> None:
+def download_bulk_data(url: str, path: str = BULK_CACHE_PATH) -> str:
     """
-    Lädt die Bulk-Daten herunter, verarbeitet sie und speichert sie als JSON-Datenbank.
+    Lädt die Bulk-Daten herunter und speichert sie unverändert unter `path`,
+    damit sie später ohne erneuten Download importiert werden können.
     """
     logging.info("Starte den Download der Kartendaten. Dies kann einige Minuten dauern...")
     try:
         response = requests.get(url, stream=True)
         response.raise_for_status()
-
-        logging.info("Download abgeschlossen. Verarbeite die Daten...")
-        
-        all_cards = response.json()
-        card_database = {}
-
-        for card_data in all_cards:
-            # Wir verwenden die 'oracle_id' als eindeutigen Schlüssel, um Duplikate
-            # durch verschiedene Drucke zu vermeiden.
-            oracle_id = card_data.get('oracle_id')
-            if not oracle_id:
-                continue
-            
-            # Extraktion der relevanten Felder
-            card_database[oracle_id] = {
-                'name': card_data.get('name'),
-                'mana_cost': card_data.get('mana_cost', ''),
-                'cmc': card_data.get('cmc', 0.0),
-                'type_line': card_data.get('type_line'),
-                'oracle_text': card_data.get('oracle_text', ''),
-                'power': card_data.get('power', None),
-                'toughness': card_data.get('toughness', None),
-                'colors': card_data.get('colors', []),
-                'color_identity': card_data.get('color_identity', []),
-                'keywords': card_data.get('keywords', []),
-                'legalities': card_data.get('legalities', {}),
-            }
-        
-        logging.info(f"{len(card_database)} einzigartige Karten wurden verarbeitet.")
-
-        with open(OUTPUT_DB_PATH, 'w', encoding='utf-8') as f:
-            json.dump(card_database, f, indent=4, ensure_ascii=False)
-            
-        logging.info(f"Kartendatenbank erfolgreich unter {OUTPUT_DB_PATH} gespeichert.")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+        logging.info(f"Download abgeschlossen, Bulk-Daten unter {path} gespeichert.")
+        return path
 
     except requests.exceptions.RequestException as e:
         logging.error(f"Fehler beim Download der Bulk-Daten: {e}")
         raise
+    except IOError as e:
+        logging.error(f"Fehler beim Schreiben der Bulk-Datei: {e}")
+        raise
+
+def load_bulk_cards(path: str) -> List[Dict]:
+    """Lädt eine (optional gzip-komprimierte) Scryfall-Bulk-Datei."""
+    try:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
     except json.JSONDecodeError as e:
         logging.error(f"Fehler beim Parsen der JSON-Daten: {e}")
         raise
+
+# Felder einer Scryfall-Karte, die in die Datenbank übernommen werden, mit Standardwert
+RECORD_FIELDS = (
+    ('name', None),
+    ('mana_cost', ''),
+    ('cmc', 0.0),
+    ('type_line', None),
+    ('oracle_text', ''),
+    ('power', None),
+    ('toughness', None),
+    ('colors', []),
+    ('color_identity', []),
+    ('keywords', []),
+    ('legalities', {}),
+    # Arena-grpId, über die der Arena-Connector Log-Objekte zuordnet
+    ('arena_id', None),
+)
+
+def card_record(card_data: Dict) -> Dict:
+    """Extraktion der relevanten Felder einer Scryfall-Karte für die Datenbank."""
+    return {field: card_data.get(field, default) for field, default in RECORD_FIELDS}
+
+def content_hash(card_data: Dict) -> str:
+    """
+    Inhaltshash der Datenbankfelder einer Scryfall-Karte oder eines Datensatzes (beide ergeben
+    denselben Hash). Wird direkt aus den Rohdaten berechnet, ohne den Datensatz aufzubauen.
+    """
+    values = [card_data.get(field, default) for field, default in RECORD_FIELDS]
+    return hashlib.sha1(json.dumps(values, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def load_hashes(db_path: str) -> Dict[str, str]:
+    """
+    Lädt die Inhaltshashes der bestehenden Datenbank aus ihren Hash-Shards (siehe `CardStore`).
+    Für eine Datenbank im alten Format werden sie aus den Datensätzen berechnet.
+    """
+    store = CardStore(db_path)
+    if store.is_legacy():
+        return {oracle_id: content_hash(record) for oracle_id, record in store.records().items()}
+    return store.hashes()
+
+def compute_delta(all_cards: List[Dict], old_hashes: Dict[str, str]) -> Tuple[Dict[str, Dict], List[str], Dict[str, str]]:
+    """
+    Vergleicht die Bulk-Daten per Inhaltshash mit der bestehenden Datenbank; Datensätze
+    werden nur für neue und geänderte Karten aufgebaut.
+    Gibt (neue/geänderte Datensätze, entfernte Oracle-IDs, neue Hashes) zurück.
+    """
+    changed: Dict[str, Dict] = {}
+    new_hashes: Dict[str, str] = {}
+    for card_data in all_cards:
+        # Wir verwenden die 'oracle_id' als eindeutigen Schlüssel, um Duplikate
+        # durch verschiedene Drucke zu vermeiden.
+        oracle_id = card_data.get('oracle_id')
+        if not oracle_id:
+            continue
+        digest = content_hash(card_data)
+        new_hashes[oracle_id] = digest
+        if old_hashes.get(oracle_id) != digest:
+            changed[oracle_id] = card_record(card_data)
+    removed = [oracle_id for oracle_id in old_hashes if oracle_id not in new_hashes]
+    return changed, removed, new_hashes
+
+def _snapshot_order(name: str) -> Tuple[str, int]:
+    """Sortierschlüssel eines Stands: Zeitstempel, dann numerisches Suffix (ohne Suffix zuerst)."""
+    version, suffix = SNAPSHOT_NAME.match(name).groups()
+    return version, int(suffix or 0)
+
+def _store_snapshot(db_path: str, snapshot_dir: str, keep: int) -> str:
+    """
+    Legt das Manifest des aktuellen Stands als Version ab (Hardlink, sonst Kopie), entfernt alte
+    Versionen und danach die Shards, auf die keine verbliebene Version mehr verweist.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    version = time.strftime('%Y%m%d-%H%M%S')
+    snapshot_path = os.path.join(snapshot_dir, f"card_db.{version}.json")
+    suffix = 1
+    while os.path.exists(snapshot_path):
+        snapshot_path = os.path.join(snapshot_dir, f"card_db.{version}-{suffix}.json")
+        suffix += 1
+    try:
+        os.link(db_path, snapshot_path)
+    except OSError:
+        shutil.copy2(db_path, snapshot_path)
+
+    snapshots = sorted((name for name in os.listdir(snapshot_dir) if SNAPSHOT_NAME.match(name)), key=_snapshot_order)
+    for name in snapshots[:-keep] if keep > 0 else []:
+        os.remove(os.path.join(snapshot_dir, name))
+        snapshots.remove(name)
+    CardStore(db_path).collect_garbage(os.path.join(snapshot_dir, name) for name in snapshots)
+    return snapshot_path
+
+def refresh_card_db(all_cards: List[Dict], db_path: str = OUTPUT_DB_PATH, snapshot_dir: str = SNAPSHOT_DIR,
+                    keep_snapshots: int = KEEP_SNAPSHOTS) -> Dict[str, int]:
+    """
+    Aktualisiert die Kartendatenbank inkrementell: Nur neue, geänderte und entfernte Karten
+    werden übernommen, geschrieben werden nur die Shards, in denen sie liegen (siehe
+    `CardStore`). Ohne Änderungen wird nichts geschrieben. Die neue Version wird über ihr
+    Manifest in einem einzigen Schritt atomar (os.replace) eingetauscht, sodass laufende
+    Simulationen nie einen halb geschriebenen Stand lesen, und zusätzlich als versionierter
+    Stand abgelegt. Datensätze und Hashes liegen im selben Stand und können nicht auseinanderlaufen.
+    """
+    old_hashes = load_hashes(db_path)
+    changed, removed, new_hashes = compute_delta(all_cards, old_hashes)
+    summary = {
+        'added': sum(1 for oracle_id in changed if oracle_id not in old_hashes),
+        'updated': sum(1 for oracle_id in changed if oracle_id in old_hashes),
+        'removed': len(removed),
+        'total': len(new_hashes),
+    }
+    if not changed and not removed and os.path.exists(db_path):
+        logging.info(f"Kartendatenbank ist aktuell ({summary['total']} Karten), nichts zu tun.")
+        return summary
+
+    try:
+        CardStore(db_path).apply(changed, removed, new_hashes)
+        snapshot_path = _store_snapshot(db_path, snapshot_dir, keep_snapshots)
+
     except IOError as e:
         logging.error(f"Fehler beim Schreiben der Datenbankdatei: {e}")
         raise
 
-def main():
+    logging.info(f"Kartendatenbank unter {db_path} aktualisiert: {summary['added']} neu, {summary['updated']} geändert, "
+                 f"{summary['removed']} entfernt ({summary['total']} Karten, Version {snapshot_path}).")
+    return summary
+
+def main(argv: Optional[List[str]] = None):
     """Hauptfunktion zur Ausführung des Importers."""
+    parser = argparse.ArgumentParser(description="Importiert bzw. aktualisiert die Kartendatenbank aus Scryfall-Bulk-Daten.")
+    parser.add_argument('--bulk-file', help="Bereits heruntergeladene Bulk-Datei (.json oder .json.gz) statt Download")
+    parser.add_argument('--db', default=OUTPUT_DB_PATH, help="Pfad der Kartendatenbank")
+    parser.add_argument('--keep-snapshots', type=int, default=KEEP_SNAPSHOTS, help="Anzahl aufbewahrter Versionen")
+    args = parser.parse_args(argv)
+
     try:
-        bulk_data_url = get_bulk_data_url()
-        download_and_process_bulk_data(bulk_data_url)
-    except (ValueError, requests.exceptions.RequestException) as e:
+        bulk_path = args.bulk_file or download_bulk_data(get_bulk_data_url())
+        all_cards = load_bulk_cards(bulk_path)
+        refresh_card_db(all_cards, args.db, os.path.join(os.path.dirname(args.db) or '.', 'snapshots'), args.keep_snapshots)
+    except (ValueError, IOError, requests.exceptions.RequestException) as e:
         logging.critical(f"Der Importprozess konnte nicht abgeschlossen werden: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
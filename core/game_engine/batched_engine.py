@@ -0,0 +1,410 @@
+from typing import List, Dict, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .combat_evaluator import resolve_combat
+from .phase_manager import TurnPhase, TurnStep, TURN_ORDER
+from .player import BASIC_LAND_COLORS
+from .stack_manager import PUMP_SPELLS
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game_state import GameState
+
+# Zonen im Struct-of-Arrays-Format
+ZONE_NONE = -1          # Leerer Kartenplatz (Auffüllung)
+ZONE_LIBRARY = 0
+ZONE_HAND = 1
+ZONE_BATTLEFIELD = 2
+ZONE_GRAVEYARD = 3
+
+COLORS = ['W', 'U', 'B', 'R', 'G']
+STARTING_LIFE = 20
+STARTING_HAND_SIZE = 7
+
+# Der Zugablauf des PhaseManagers; in den Hauptphasen werden Aktionen ausgeführt
+BATCH_STEP_ORDER = list(TURN_ORDER)
+
+
+def _has_keyword(card_data: Dict, keyword: str) -> bool:
+    return keyword.lower() in [k.lower() for k in card_data.get('keywords', [])]
+
+
+def parse_mana_cost(cost_string: str):
+    """Zerlegt '{2}{W}{U}' in (generische Kosten, Pips pro Farbe in COLORS-Reihenfolge)."""
+    generic, pips = 0, [0] * len(COLORS)
+    for part in cost_string.replace('{', '').split('}')[:-1]:
+        if part.isdigit():
+            generic += int(part)
+        elif part.upper() in COLORS:
+            pips[COLORS.index(part.upper())] += 1
+    return generic, pips
+
+
+class BatchedActions:
+    """
+    Aktionen für alle K Spiele eines Schritts. Jedes Feld ist optional;
+    Kartenindizes beziehen sich auf die Kartenplätze von `BatchedGameState`, -1 = keine Aktion.
+    """
+    def __init__(self, play_land: Optional[np.ndarray] = None, cast: Optional[np.ndarray] = None,
+                 pump_card: Optional[np.ndarray] = None, pump_target: Optional[np.ndarray] = None,
+                 attackers: Optional[np.ndarray] = None, blocks: Optional[np.ndarray] = None):
+        self.play_land = play_land      # [K] Land aus der Hand
+        self.cast = cast                # [K, C] bool, Kreaturen (in Platzreihenfolge gewirkt)
+        self.pump_card = pump_card      # [K] Pump-Zauber aus der Hand
+        self.pump_target = pump_target  # [K] Ziel-Kreatur des Pump-Zaubers
+        self.attackers = attackers      # [K, C] bool
+        self.blocks = blocks            # [K, C] int, geblockter Angreifer oder -1
+
+
+class BatchedGameState:
+    """
+    Hält K Partien im Struct-of-Arrays-Format und führt sie im Gleichschritt durch den
+    Zugablauf des `PhaseManager`. Unterstützt wird die Teilmenge der Regeln für Länder,
+    Vanilla-Kreaturen, Kampf-Schlüsselwörter und Pump-Zauber; alle Spieler-Aktionen
+    werden als Arrays übergeben.
+    """
+    STATIC_FIELDS = [
+        'owner', 'is_land', 'is_creature', 'land_color', 'cost_generic', 'cost_pips',
+        'base_power', 'base_toughness', 'pump_power', 'pump_toughness', 'is_pump',
+        'first_strike', 'double_strike', 'deathtouch', 'lifelink', 'flying', 'reach', 'vigilance', 'haste',
+    ]
+
+    def __init__(self, num_games: int, num_cards: int):
+        K, C = num_games, num_cards
+        self.num_games = K
+        self.num_cards = C
+
+        # Statische Kartendaten [K, C]
+        self.names: List[List[Optional[str]]] = [[None] * C for _ in range(K)]
+        self.owner = np.zeros((K, C), dtype=np.int8)
+        self.is_land = np.zeros((K, C), dtype=bool)
+        self.is_creature = np.zeros((K, C), dtype=bool)
+        self.land_color = np.full((K, C), -1, dtype=np.int8)
+        self.cost_generic = np.zeros((K, C), dtype=np.int16)
+        self.cost_pips = np.zeros((K, C, len(COLORS)), dtype=np.int16)
+        self.base_power = np.zeros((K, C), dtype=np.int16)
+        self.base_toughness = np.zeros((K, C), dtype=np.int16)
+        self.pump_power = np.zeros((K, C), dtype=np.int16)
+        self.pump_toughness = np.zeros((K, C), dtype=np.int16)
+        self.is_pump = np.zeros((K, C), dtype=bool)
+        self.first_strike = np.zeros((K, C), dtype=bool)
+        self.double_strike = np.zeros((K, C), dtype=bool)
+        self.deathtouch = np.zeros((K, C), dtype=bool)
+        self.lifelink = np.zeros((K, C), dtype=bool)
+        self.flying = np.zeros((K, C), dtype=bool)
+        self.reach = np.zeros((K, C), dtype=bool)
+        self.vigilance = np.zeros((K, C), dtype=bool)
+        self.haste = np.zeros((K, C), dtype=bool)
+
+        # Dynamischer Zustand [K, C]
+        self.zone = np.full((K, C), ZONE_NONE, dtype=np.int8)
+        self.library_pos = np.zeros((K, C), dtype=np.int32)     # kleinere Werte liegen oben
+        self.entered_at = np.zeros((K, C), dtype=np.int64)      # Reihenfolge auf dem Schlachtfeld
+        self.tapped = np.zeros((K, C), dtype=bool)
+        self.sick = np.zeros((K, C), dtype=bool)
+        self.attacking = np.zeros((K, C), dtype=bool)
+        self.blocking = np.full((K, C), -1, dtype=np.int32)
+        self.damage = np.zeros((K, C), dtype=np.int16)
+        self.temp_power = np.zeros((K, C), dtype=np.int16)
+        self.temp_toughness = np.zeros((K, C), dtype=np.int16)
+
+        # Zustand pro Partie [K]
+        self.life = np.full((K, 2), STARTING_LIFE, dtype=np.int32)
+        self.active = np.zeros(K, dtype=np.int8)
+        self.turn = np.ones(K, dtype=np.int32)
+        self.lands_played = np.zeros(K, dtype=np.int8)
+        self.finished = np.zeros(K, dtype=bool)
+        self.step_index = 0
+        self._entry_counter = 0
+        # Zuordnung Kartenplatz -> Card, nur bei `from_game_states` gesetzt
+        self.slot_cards: Optional[List[List['Card']]] = None
+
+    # --- Aufbau -------------------------------------------------------------
+
+    def _load_card(self, k: int, c: int, card_data: Dict, owner: int):
+        type_line = card_data.get('type_line', '') or ''
+        self.names[k][c] = card_data['name']
+        self.owner[k, c] = owner
+        self.is_land[k, c] = 'Land' in type_line
+        self.is_creature[k, c] = 'Creature' in type_line
+        self.land_color[k, c] = COLORS.index(BASIC_LAND_COLORS[card_data['name']]) if card_data['name'] in BASIC_LAND_COLORS else -1
+        self.cost_generic[k, c], self.cost_pips[k, c] = parse_mana_cost(card_data.get('mana_cost', '') or '')
+        if self.is_creature[k, c]:
+            self.base_power[k, c] = int(card_data.get('power', 0))
+            self.base_toughness[k, c] = int(card_data.get('toughness', 0))
+        if card_data['name'] in PUMP_SPELLS:
+            self.is_pump[k, c] = True
+            self.pump_power[k, c], self.pump_toughness[k, c] = PUMP_SPELLS[card_data['name']]
+        self.first_strike[k, c] = _has_keyword(card_data, 'First Strike')
+        self.double_strike[k, c] = _has_keyword(card_data, 'Double Strike')
+        self.deathtouch[k, c] = _has_keyword(card_data, 'Deathtouch')
+        self.lifelink[k, c] = _has_keyword(card_data, 'Lifelink')
+        self.flying[k, c] = _has_keyword(card_data, 'Flying')
+        self.reach[k, c] = _has_keyword(card_data, 'Reach')
+        self.vigilance[k, c] = _has_keyword(card_data, 'Vigilance')
+        self.haste[k, c] = _has_keyword(card_data, 'Haste')
+
+    @classmethod
+    def start_games(cls, decks: Sequence[List[Dict]], num_games: int, rng: Optional[np.random.Generator] = None) -> 'BatchedGameState':
+        """Startet K neue Partien mit denselben Decklisten: Mischen und Starthände vektorisiert."""
+        rng = rng or np.random.default_rng()
+        sizes = [len(deck) for deck in decks]
+        batch = cls(num_games, sum(sizes))
+        offsets = [0, sizes[0]]
+        # Statische Kartendaten nur einmal laden und auf alle Partien übertragen
+        for owner, deck in enumerate(decks):
+            for i, card_data in enumerate(deck):
+                batch._load_card(0, offsets[owner] + i, card_data, owner)
+        for name in batch.STATIC_FIELDS:
+            array = getattr(batch, name)
+            array[1:] = array[0]
+        batch.names = [list(batch.names[0]) for _ in range(num_games)]
+        batch.zone[:] = ZONE_LIBRARY
+        for owner, size in enumerate(sizes):
+            slots = slice(offsets[owner], offsets[owner] + size)
+            # Zufällige Permutation je Partie: Rang der Zufallszahl = Position in der Bibliothek
+            batch.library_pos[:, slots] = np.argsort(np.argsort(rng.random((num_games, size)), axis=1), axis=1)
+            batch.zone[:, slots] = np.where(batch.library_pos[:, slots] < STARTING_HAND_SIZE, ZONE_HAND, ZONE_LIBRARY)
+        batch.active[:] = rng.integers(0, 2, size=num_games)
+        return batch
+
+    @classmethod
+    def from_game_states(cls, games: Sequence['GameState']) -> 'BatchedGameState':
+        """Übernimmt den Zustand bestehender `GameState`-Objekte (z.B. für Konsistenzprüfungen)."""
+        zones = [('library', ZONE_LIBRARY), ('hand', ZONE_HAND), ('battlefield', ZONE_BATTLEFIELD), ('graveyard', ZONE_GRAVEYARD)]
+        num_cards = max(sum(len(getattr(p, name)) for p in g.players for name, _ in zones) for g in games)
+        batch = cls(len(games), num_cards)
+        batch.step_index = BATCH_STEP_ORDER.index(games[0].phase_manager.current_step)
+        batch.slot_cards = []
+        for k, game in enumerate(games):
+            slot_cards = []
+            for player in game.players:
+                for zone_name, zone_id in zones:
+                    for pos, card in enumerate(getattr(player, zone_name)):
+                        c = len(slot_cards)
+                        slot_cards.append(card)
+                        batch._load_card(k, c, card.static_data, player.player_id)
+                        batch.zone[k, c] = zone_id
+                        batch.library_pos[k, c] = pos
+                        batch.entered_at[k, c] = pos
+                        batch.tapped[k, c] = card.is_tapped
+                        batch.sick[k, c] = card.summoning_sick
+                        batch.damage[k, c] = card.damage_marked
+                        batch.temp_power[k, c] = card.power - batch.base_power[k, c] if batch.is_creature[k, c] else 0
+                        batch.temp_toughness[k, c] = card.toughness - batch.base_toughness[k, c] if batch.is_creature[k, c] else 0
+                batch.life[k, player.player_id] = player.life
+            batch.slot_cards.append(slot_cards)
+            batch.active[k] = game.active_player_index
+            batch.turn[k] = game.turn_number
+            batch.lands_played[k] = game.active_player.lands_played_this_turn
+        batch._entry_counter = int(batch.entered_at.max()) + 1
+        return batch
+
+    # --- Abgeleitete Werte ----------------------------------------------------
+
+    @property
+    def current_step(self):
+        return BATCH_STEP_ORDER[self.step_index]
+
+    @property
+    def power(self) -> np.ndarray:
+        return self.base_power + self.temp_power
+
+    @property
+    def toughness(self) -> np.ndarray:
+        return self.base_toughness + self.temp_toughness
+
+    @property
+    def winner(self) -> np.ndarray:
+        """Gewinner je Partie (0/1), -1 solange offen oder bei Unentschieden."""
+        dead = self.life <= 0
+        return np.where(dead[:, 1] & ~dead[:, 0], 0, np.where(dead[:, 0] & ~dead[:, 1], 1, -1))
+
+    def _controlled_by_active(self) -> np.ndarray:
+        return self.owner == self.active[:, None]
+
+    def _running(self) -> np.ndarray:
+        return ~self.finished
+
+    # --- Zugablauf ---------------------------------------------------------------
+
+    def step(self, actions: Optional[BatchedActions] = None):
+        """Führt den aktuellen Schritt in allen laufenden Partien aus und geht zum nächsten weiter."""
+        actions = actions or BatchedActions()
+        step = self.current_step
+
+        if step == TurnStep.UNTAP:
+            mine = self._controlled_by_active() & (self.zone == ZONE_BATTLEFIELD) & self._running()[:, None]
+            self.tapped &= ~mine
+            self.attacking &= ~mine
+            self.sick &= ~mine
+        elif step == TurnStep.DRAW:
+            self._draw(self._running())
+        elif step in (TurnPhase.PRECOMBAT_MAIN, TurnPhase.POSTCOMBAT_MAIN):
+            self._main_phase(actions)
+        elif step == TurnStep.DECLARE_ATTACKERS:
+            self._declare_attackers(actions.attackers)
+        elif step == TurnStep.DECLARE_BLOCKERS:
+            self._declare_blockers(actions.blocks)
+            # Nach den Blocks dürfen Spontanzauber wie Giant Growth gewirkt werden
+            self._cast_pump(actions.pump_card, actions.pump_target)
+        elif step == TurnStep.FIRST_STRIKE_DAMAGE:
+            self._combat_damage(first_strike=True)
+        elif step == TurnStep.COMBAT_DAMAGE:
+            self._combat_damage(first_strike=False)
+        elif step == TurnStep.END_OF_COMBAT:
+            running = self._running()[:, None]
+            self.attacking &= ~running
+            self.blocking = np.where(running, -1, self.blocking)
+        elif step == TurnStep.CLEANUP:
+            running = self._running()
+            self.lands_played[running] = 0
+            self.temp_power[running] = 0
+            self.temp_toughness[running] = 0
+            self.damage[running] = 0
+
+        self.finished |= (self.life <= 0).any(axis=1)
+
+        self.step_index += 1
+        if self.step_index >= len(BATCH_STEP_ORDER):
+            self.step_index = 0
+            running = self._running()
+            self.active = np.where(running, 1 - self.active, self.active).astype(np.int8)
+            self.turn += running & (self.active == 0)
+
+    def run_turn(self, actions_per_step: Optional[Dict] = None):
+        """Spielt einen kompletten Zug; `actions_per_step` ordnet Schritten ihre Aktionen zu."""
+        actions_per_step = actions_per_step or {}
+        for step in BATCH_STEP_ORDER:
+            self.step(actions_per_step.get(step))
+
+    # --- Regelbausteine --------------------------------------------------------
+
+    def _draw(self, mask: np.ndarray):
+        """Der aktive Spieler zieht die oberste Karte seiner Bibliothek (leere Bibliothek: nichts)."""
+        in_library = (self.zone == ZONE_LIBRARY) & self._controlled_by_active()
+        key = np.where(in_library, self.library_pos, np.iinfo(np.int32).max)
+        top = np.argmin(key, axis=1)
+        rows = np.flatnonzero(mask & in_library.any(axis=1))
+        self.zone[rows, top[rows]] = ZONE_HAND
+
+    def _enter_battlefield(self, rows: np.ndarray, slots: np.ndarray):
+        self.zone[rows, slots] = ZONE_BATTLEFIELD
+        self.entered_at[rows, slots] = self._entry_counter
+        self.sick[rows, slots] = self.is_creature[rows, slots]
+        self._entry_counter += 1
+
+    def _main_phase(self, actions: BatchedActions):
+        running = self._running()
+        rows = np.arange(self.num_games)
+        if actions.play_land is not None:
+            slot = np.maximum(actions.play_land, 0)
+            legal = (running & (actions.play_land >= 0) & (self.lands_played == 0)
+                     & self.is_land[rows, slot] & (self.zone[rows, slot] == ZONE_HAND)
+                     & (self.owner[rows, slot] == self.active))
+            self._enter_battlefield(rows[legal], slot[legal])
+            self.lands_played[legal] += 1
+        if actions.cast is not None:
+            for c in np.flatnonzero(actions.cast.any(axis=0)):
+                want = running & actions.cast[:, c] & self.is_creature[:, c]
+                paid = self._pay_cost(want, np.full(self.num_games, c))
+                self._enter_battlefield(rows[paid], np.full(int(paid.sum()), c))
+        self._cast_pump(actions.pump_card, actions.pump_target)
+
+    def _cast_pump(self, pump_card: Optional[np.ndarray], pump_target: Optional[np.ndarray]):
+        if pump_card is None:
+            return
+        rows = np.arange(self.num_games)
+        slot = np.maximum(pump_card, 0)
+        want = self._running() & (pump_card >= 0) & self.is_pump[rows, slot]
+        paid = self._pay_cost(want, slot)
+        self.zone[rows[paid], slot[paid]] = ZONE_GRAVEYARD
+        # Ohne gültiges Ziel verpufft der Zauber (Fizzle), das Mana ist trotzdem bezahlt
+        pump_target = np.full(self.num_games, -1) if pump_target is None else pump_target
+        target = np.maximum(pump_target, 0)
+        hit = paid & (pump_target >= 0) & self.is_creature[rows, target] & (self.zone[rows, target] == ZONE_BATTLEFIELD)
+        self.temp_power[rows[hit], target[hit]] += self.pump_power[rows[hit], slot[hit]]
+        self.temp_toughness[rows[hit], target[hit]] += self.pump_toughness[rows[hit], slot[hit]]
+
+    def _pay_cost(self, want: np.ndarray, slot: np.ndarray) -> np.ndarray:
+        """
+        Bezahlt die Kosten der Karte `slot` je Partie wie `Player.tap_for_cost`: zuerst farbige
+        Kosten mit passenden Ländern, dann generische Kosten mit den übrigen Ländern, jeweils
+        in der Reihenfolge, in der die Länder ins Spiel kamen. Gibt zurück, wo bezahlt wurde.
+        """
+        rows = np.arange(self.num_games)
+        want = want & (self.zone[rows, slot] == ZONE_HAND) & (self.owner[rows, slot] == self.active)
+        untapped = (self.zone == ZONE_BATTLEFIELD) & self.is_land & ~self.tapped & self._controlled_by_active()
+        pips = self.cost_pips[rows, slot].astype(np.int64)                     # [K, 5]
+        generic = self.cost_generic[rows, slot].astype(np.int64)               # [K]
+        available = np.stack([(untapped & (self.land_color == i)).sum(axis=1) for i in range(len(COLORS))], axis=1)
+        paid = want & (available >= pips).all(axis=1) & (untapped.sum(axis=1) - pips.sum(axis=1) >= generic)
+
+        for i in range(len(COLORS)):
+            self._tap_first(paid & (pips[:, i] > 0), untapped & (self.land_color == i), pips[:, i])
+        untapped = (self.zone == ZONE_BATTLEFIELD) & self.is_land & ~self.tapped & self._controlled_by_active()
+        self._tap_first(paid & (generic > 0), untapped, generic)
+        return paid
+
+    def _tap_first(self, games: np.ndarray, candidates: np.ndarray, count: np.ndarray):
+        """Tappt in den gewählten Partien die `count` zuerst ins Spiel gekommenen Kandidaten."""
+        rows = np.flatnonzero(games)
+        if not len(rows):
+            return
+        key = np.where(candidates[rows], self.entered_at[rows], np.iinfo(np.int64).max)
+        order = np.argsort(key, axis=1, kind='stable')
+        take = np.arange(self.num_cards)[None, :] < count[rows, None]
+        self.tapped[np.repeat(rows, take.sum(axis=1)), order[take]] = True
+
+    def _declare_attackers(self, attackers: Optional[np.ndarray]):
+        if attackers is None:
+            return
+        legal = (attackers & self._running()[:, None] & self._controlled_by_active() & self.is_creature
+                 & (self.zone == ZONE_BATTLEFIELD) & ~self.tapped & (~self.sick | self.haste))
+        self.attacking |= legal
+        self.tapped |= legal & ~self.vigilance
+
+    def _declare_blockers(self, blocks: Optional[np.ndarray]):
+        if blocks is None:
+            return
+        rows = np.arange(self.num_games)[:, None]
+        target = np.maximum(blocks, 0)
+        legal = ((blocks >= 0) & self._running()[:, None] & ~self._controlled_by_active() & self.is_creature
+                 & (self.zone == ZONE_BATTLEFIELD) & ~self.tapped & (self.blocking < 0)
+                 & self.attacking[rows, target]
+                 & (~self.flying[rows, target] | self.flying | self.reach))
+        self.blocking = np.where(legal, blocks, self.blocking).astype(np.int32)
+
+    def _combat_arrays(self) -> Dict[str, np.ndarray]:
+        power = self.power.astype(np.int64)
+        toughness = self.toughness.astype(np.int64)
+        return {
+            'power': power,
+            'toughness': toughness - self.damage,
+            'value': (power + toughness).astype(float),
+            'first': self.first_strike | self.double_strike,
+            'regular': ~self.first_strike | self.double_strike,
+            'strikes': np.where(self.double_strike, 2, 1),
+            'deathtouch': self.deathtouch,
+            'lifelink': self.lifelink,
+            'menace': np.zeros_like(self.deathtouch),
+        }
+
+    def _combat_damage(self, first_strike: bool):
+        """Verrechnet einen Schadensschritt über `resolve_combat` und wendet danach SBAs an."""
+        running = self._running()[:, None]
+        on_battlefield = self.zone == ZONE_BATTLEFIELD
+        arrays = self._combat_arrays()
+        outcome = resolve_combat(
+            arrays, arrays, self.attacking & running, np.where(running, self.blocking, -1),
+            segments=(first_strike,), attacker_alive=on_battlefield, blocker_alive=on_battlefield,
+        )
+        self.damage += (outcome.attacker_damage + outcome.blocker_damage).astype(np.int16)
+        rows = np.arange(self.num_games)
+        self.life[rows, self.active] += outcome.attacker_life_delta.astype(np.int32)
+        self.life[rows, 1 - self.active] += outcome.defender_life_delta.astype(np.int32)
+
+        # Zustandsbasierte Aktionen: tödlicher Schaden
+        dies = on_battlefield & self.is_creature & (self.damage >= self.toughness)
+        self.zone[dies] = ZONE_GRAVEYARD
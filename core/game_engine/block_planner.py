@@ -0,0 +1,230 @@
+import logging
+from typing import List, Dict, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .combat_evaluator import creature_arrays
+
+if TYPE_CHECKING:
+    from .card import Card
+
+# Gewicht für verhinderten Schaden. Mit 1.0 lohnt sich ein Block, sobald der
+# Trade-Wert größer ist als der Schaden, den der Angreifer sonst zufügen würde.
+DEFAULT_DAMAGE_WEIGHT = 1.0
+# Ist das Leben in Gefahr, zählt jeder verhinderte Schadenspunkt mehr als jeder Trade (Chump-Blocks).
+CHUMP_DAMAGE_WEIGHT = 100.0
+# Kosten für unzulässige Paare in der Zuweisungsmatrix
+_ILLEGAL_COST = 1e9
+
+
+def block_legality_matrix(attackers: List['Card'], blockers: List['Card']) -> np.ndarray:
+    """Matrix [Angreifer, Blocker]: True, wenn der Blocker den Angreifer (allein) blocken darf."""
+    legal = np.zeros((len(attackers), len(blockers)), dtype=bool)
+    for a, attacker in enumerate(attackers):
+        for b, blocker in enumerate(blockers):
+            legal[a, b] = attacker.can_be_blocked_by(blocker)
+    return legal
+
+
+def trade_value_matrix(att: Dict[str, np.ndarray], blk: Dict[str, np.ndarray], damage_weight: float) -> np.ndarray:
+    """
+    Bewertet jeden Einzelblock [Angreifer, Blocker] aus Sicht des Verteidigers:
+    Wert des getöteten Angreifers - Wert des verlorenen Blockers + verhinderter Schaden.
+    Beide Schadensschritte (Erstschlag/regulär) werden berücksichtigt.
+    """
+    a_p, a_t = att['power'][:, None], att['toughness'][:, None]
+    b_p, b_t = blk['power'][None, :], blk['toughness'][None, :]
+    a_dt, b_dt = att['deathtouch'][:, None], blk['deathtouch'][None, :]
+
+    # Erstschlag-Schadensschritt
+    to_b1 = np.where(att['first'][:, None] & (a_p > 0), a_p, 0)
+    to_a1 = np.where(blk['first'][None, :] & (b_p > 0), b_p, 0)
+    b_dead1 = (to_b1 > 0) & (a_dt | (to_b1 >= b_t))
+    a_dead1 = (to_a1 > 0) & (b_dt | (to_a1 >= a_t))
+
+    # Regulärer Schadensschritt: nur noch lebende Kreaturen mit lebendem Gegenüber
+    both_alive = ~a_dead1 & ~b_dead1
+    to_b2 = np.where(att['regular'][:, None] & both_alive & (a_p > 0), a_p, 0)
+    to_a2 = np.where(blk['regular'][None, :] & both_alive & (b_p > 0), b_p, 0)
+    b_dead = b_dead1 | ((to_b2 > 0) & (a_dt | (to_b1 + to_b2 >= b_t)))
+    a_dead = a_dead1 | ((to_a2 > 0) & (b_dt | (to_a1 + to_a2 >= a_t)))
+
+    prevented = np.maximum(att['power'], 0) * att['strikes']
+    return (att['value'][:, None] * a_dead
+            - blk['value'][None, :] * b_dead
+            + damage_weight * prevented[:, None])
+
+
+def min_cost_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Ungarische Methode (mit Potentialen) für eine rechteckige Kostenmatrix mit
+    Zeilen <= Spalten. Gibt für jede Zeile die zugewiesene Spalte zurück.
+    Laufzeit O(n^2 * m), die innere Schleife ist vektorisiert.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)     # p[j]: Zeile (1-basiert), die Spalte j belegt
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free & (cur < minv[1:])
+            minv[1:][improved] = cur[improved]
+            way[1:][improved] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = np.full(n, -1, dtype=np.int64)
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    return assignment
+
+
+def group_block_value(attacker: 'Card', group: List['Card'], damage_weight: float) -> float:
+    """
+    Bewertet einen (Mehrfach-)Block mit denselben Regeln wie `GameState.assign_combat_damage`:
+    Der Angreifer weist seinen Blockern der Reihe nach tödlichen Schaden zu.
+    """
+    if not group:
+        return 0.0
+    attacker_damage = attacker.damage_marked
+    attacker_alive = True
+    blocker_damage = [b.damage_marked for b in group]
+    blocker_alive = [True] * len(group)
+
+    for first_strike in (True, False):
+        to_blockers = [0] * len(group)
+        if attacker_alive and attacker.power > 0 and attacker.deals_damage_in_segment(first_strike):
+            remaining = attacker.power
+            alive = [i for i in range(len(group)) if blocker_alive[i]]
+            for k, i in enumerate(alive):
+                if k == len(alive) - 1:
+                    amount = remaining
+                else:
+                    lethal = 1 if attacker.has_keyword('Deathtouch') else max(group[i].toughness - blocker_damage[i], 0)
+                    amount = min(remaining, lethal)
+                remaining -= amount
+                to_blockers[i] = amount
+        to_attacker = 0
+        attacker_deathtouched = False
+        if attacker_alive:
+            for i, blocker in enumerate(group):
+                if blocker_alive[i] and blocker.power > 0 and blocker.deals_damage_in_segment(first_strike):
+                    to_attacker += blocker.power
+                    attacker_deathtouched |= blocker.has_keyword('Deathtouch')
+
+        for i, blocker in enumerate(group):
+            if to_blockers[i] > 0:
+                blocker_damage[i] += blocker.toughness if attacker.has_keyword('Deathtouch') else to_blockers[i]
+                blocker_alive[i] = blocker_damage[i] < blocker.toughness
+        if to_attacker > 0:
+            attacker_damage += attacker.toughness if attacker_deathtouched else to_attacker
+            attacker_alive = attacker_damage < attacker.toughness
+
+    strikes = 2 if attacker.has_keyword('Double Strike') else 1
+    value = damage_weight * max(attacker.power, 0) * strikes
+    if not attacker_alive:
+        value += attacker.power + attacker.toughness
+    for i, blocker in enumerate(group):
+        if not blocker_alive[i]:
+            value -= blocker.power + blocker.toughness
+    return value
+
+
+def _plan_with_weight(attackers: List['Card'], blockers: List['Card'], legal: np.ndarray, damage_weight: float) -> List[List['Card']]:
+    att = creature_arrays(attackers)
+    blk = creature_arrays(blockers)
+    values = trade_value_matrix(att, blk, damage_weight)
+
+    # Schritt 1: Optimale Einzelblocks per Min-Cost-Matching. Menace-Angreifer
+    # können nicht allein geblockt werden. Zusätzliche Spalten = "nicht blocken" (Wert 0).
+    single_legal = legal & ~att['menace'][:, None]
+    cost = np.hstack([
+        np.where(single_legal, -values, _ILLEGAL_COST),
+        np.zeros((len(attackers), len(attackers))),
+    ])
+    assignment = min_cost_assignment(cost)
+
+    groups: List[List['Card']] = [[] for _ in attackers]
+    unused = set(range(len(blockers)))
+    for a, b in enumerate(assignment):
+        if b < len(blockers) and values[a, b] > 0:
+            groups[a].append(blockers[b])
+            unused.discard(b)
+
+    # Schritt 2: Mehrfachblocks. Übrige Blocker schließen sich dem Block an, der
+    # den größten Zugewinn bringt; ungeblockte Menace-Angreifer brauchen ein Paar.
+    for b in sorted(unused, key=lambda i: blk['value'][i]):
+        best_gain, best_attacker = 0.0, None
+        for a, attacker in enumerate(attackers):
+            if not legal[a, b] or (att['menace'][a] and not groups[a]):
+                continue
+            gain = group_block_value(attacker, groups[a] + [blockers[b]], damage_weight) - group_block_value(attacker, groups[a], damage_weight)
+            if gain > best_gain:
+                best_gain, best_attacker = gain, a
+        if best_attacker is not None:
+            groups[best_attacker].append(blockers[b])
+            unused.discard(b)
+
+    for a in np.flatnonzero(att['menace']):
+        if groups[a]:
+            continue
+        candidates = [b for b in unused if legal[a, b]]
+        best_gain, best_pair = 0.0, None
+        for i, b1 in enumerate(candidates):
+            for b2 in candidates[i + 1:]:
+                gain = group_block_value(attackers[a], [blockers[b1], blockers[b2]], damage_weight)
+                if gain > best_gain:
+                    best_gain, best_pair = gain, (b1, b2)
+        if best_pair:
+            groups[a] = [blockers[b] for b in best_pair]
+            unused.difference_update(best_pair)
+
+    return groups
+
+
+def unblocked_damage(attackers: List['Card'], groups: List[List['Card']]) -> int:
+    """Schaden, den die ungeblockten Angreifer dem Verteidiger zufügen."""
+    return sum(max(a.power, 0) * (2 if a.has_keyword('Double Strike') else 1)
+               for a, group in zip(attackers, groups) if not group)
+
+
+def plan_blocks(attackers: List['Card'], blockers: List['Card'], defender_life: int,
+                legal: Optional[np.ndarray] = None) -> List[List['Card']]:
+    """
+    Berechnet die Blockzuweisung des Verteidigers. Gibt für jeden Angreifer die Liste
+    seiner Blocker (in Schadenszuweisungsreihenfolge) zurück.
+    Würde der ungeblockte Schaden tödlich sein, wird mit Chump-Gewichtung neu geplant.
+    Eine bereits berechnete Legalitätsmatrix kann übergeben werden.
+    """
+    if not attackers or not blockers:
+        return [[] for _ in attackers]
+
+    if legal is None:
+        legal = block_legality_matrix(attackers, blockers)
+    groups = _plan_with_weight(attackers, blockers, legal, DEFAULT_DAMAGE_WEIGHT)
+    if unblocked_damage(attackers, groups) >= defender_life:
+        logging.info("KI-Block-Analyse: Tödlicher Angriff droht, plane Chump-Blocks.")
+        groups = _plan_with_weight(attackers, blockers, legal, CHUMP_DAMAGE_WEIGHT)
+    return groups
@@ -1,5 +1,6 @@
-from typing import Dict, Any, TYPE_CHECKING, List
-from .effect_system import Effect # NEU
+from typing import Dict, Any, TYPE_CHECKING, List, Optional
+from .effect_system import Effect, EffectDuration # NEU
+from core.data.card_registry import get_active_registry
 
 if TYPE_CHECKING:
     from .player import Player
@@ -9,6 +10,10 @@ class Card:
     """
     def __init__(self, card_data: Dict[str, Any], owner: 'Player'):
         self.static_data = card_data
+        # Kleine Integer-ID im Kartenregister (None, wenn die Daten aus einem einfachen Dict stammen)
+        self.card_id: Optional[int] = card_data.get('card_id')
+        # ID des Objekts im Arena-Client (nur für gespiegelte Live-Partien)
+        self.instance_id: Optional[int] = None
         self.owner = owner
         
         # Dynamische Attribute
@@ -20,6 +25,23 @@ class Card:
         self.active_effects: List[Effect] = [] # NEU: Liste für temporäre Effekte
         self.target: 'Card' = None # Wird verwendet, wenn die Karte auf dem Stapel ist
 
+        # Kampfzustand: Blocker eines Angreifers (in Schadenszuweisungsreihenfolge)
+        # bzw. der Angreifer, den diese Kreatur blockt
+        self.blockers: List['Card'] = []
+        self.blocking: Optional['Card'] = None
+
+    def __getstate__(self):
+        # Mit Register werden beim Kopieren/Pickeln nur die Karten-IDs übertragen, nicht die Kartendaten
+        state = self.__dict__.copy()
+        if self.card_id is not None and get_active_registry() is not None:
+            del state['static_data']
+        return state
+
+    def __setstate__(self, state):
+        if 'static_data' not in state:
+            state['static_data'] = get_active_registry().card(state['card_id'])
+        self.__dict__.update(state)
+
     @property
     def name(self) -> str:
         return self.static_data['name']
@@ -42,13 +64,18 @@ class Card:
         """Prüft, ob die Karte den Typ 'Land' in ihrer Typenzeile hat."""
         return 'Land' in self.static_data.get('type_line', '')
 
-    def toughness(self) -> int:
-        return int(self.static_data.get('toughness', 0))
+    def add_effect(self, effect: Effect):
+        """Fügt einen Effekt hinzu und aktualisiert die inkrementelle Bewertung."""
+        self.active_effects.append(effect)
+        self.owner.game.board_features.on_characteristics_changed(self)
+
+    def remove_end_of_turn_effects(self):
+        """Entfernt alle "bis zum Ende des Zuges"-Effekte."""
+        remaining = [effect for effect in self.active_effects if effect.duration != EffectDuration.END_OF_TURN]
+        if len(remaining) != len(self.active_effects):
+            self.active_effects = remaining
+            self.owner.game.board_features.on_characteristics_changed(self)
 
-    def is_land(self) -> bool:
-        """Prüft, ob die Karte den Typ 'Land' in ihrer Typenzeile hat."""
-        return 'Land' in self.static_data.get('type_line', '')
-    
     def has_lethal_damage(self) -> bool:
         """Prüft, ob die Kreatur tödlichen Schaden erlitten hat."""
         if self.toughness <= 0: # Gilt für 0/X Kreaturen
@@ -58,6 +85,33 @@ class Card:
     def has_keyword(self, keyword: str) -> bool:
         """Prüft, ob die Karte ein bestimmtes Schlüsselwort hat."""
         return keyword.lower() in [k.lower() for k in self.static_data.get('keywords', [])]
+
+    def deals_damage_in_segment(self, first_strike: bool) -> bool:
+        """Prüft, ob die Kreatur im Erstschlag- bzw. regulären Schadensschritt Schaden zufügt."""
+        if first_strike:
+            return self.has_keyword('First Strike') or self.has_keyword('Double Strike')
+        return not self.has_keyword('First Strike') or self.has_keyword('Double Strike')
+
+    def can_be_blocked_by(self, blocker: 'Card') -> bool:
+        """Prüft die Ausweichfähigkeiten dieses Angreifers gegenüber einem einzelnen Blocker."""
+        # Flying: Kann nur von Flying oder Reach geblockt werden.
+        if self.has_keyword('Flying') and not blocker.has_keyword('Flying') and not blocker.has_keyword('Reach'):
+            return False
+        is_artifact = 'Artifact' in blocker.static_data.get('type_line', '')
+        # Fear: Kann nicht von nicht-schwarzen, nicht-Artefakt Kreaturen geblockt werden.
+        if self.has_keyword('Fear') and not is_artifact and 'B' not in blocker.static_data.get('colors', []):
+            return False
+        # Intimidate: Nur Artefaktkreaturen und Kreaturen, die eine Farbe teilen.
+        if self.has_keyword('Intimidate') and not is_artifact:
+            if not set(self.static_data.get('colors', [])) & set(blocker.static_data.get('colors', [])):
+                return False
+        return True
+
+    def clear_combat_state(self):
+        """Entfernt alle Angriffs- und Blockmarkierungen nach dem Kampf."""
+        self.is_attacking = False
+        self.blockers = []
+        self.blocking = None
     
 
     
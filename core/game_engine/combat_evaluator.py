@@ -0,0 +1,184 @@
+from typing import List, Dict, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .evaluation import NUM_FEATURES
+
+if TYPE_CHECKING:
+    from .card import Card
+
+
+def creature_arrays(cards: List['Card']) -> Dict[str, np.ndarray]:
+    """Packt die kampfrelevanten Werte einer Kreaturenliste in NumPy-Arrays."""
+    power = np.array([c.power for c in cards], dtype=np.int64)
+    toughness = np.array([c.toughness for c in cards], dtype=np.int64)
+    double_strike = np.array([c.has_keyword('Double Strike') for c in cards], dtype=bool)
+    first_strike = np.array([c.has_keyword('First Strike') for c in cards], dtype=bool)
+    return {
+        'power': power,
+        # Verbleibende Widerstandskraft, bereits markierter Schaden zählt mit
+        'toughness': toughness - np.array([c.damage_marked for c in cards], dtype=np.int64),
+        'value': (power + toughness).astype(float),
+        'first': first_strike | double_strike,
+        'regular': ~first_strike | double_strike,
+        'strikes': np.where(double_strike, 2, 1),
+        'deathtouch': np.array([c.has_keyword('Deathtouch') for c in cards], dtype=bool),
+        'lifelink': np.array([c.has_keyword('Lifelink') for c in cards], dtype=bool),
+        'menace': np.array([c.has_keyword('Menace') for c in cards], dtype=bool),
+    }
+
+
+def _per_config(arrays: Dict[str, np.ndarray], K: int, n: int) -> Dict[str, np.ndarray]:
+    """Bringt Kreaturen-Arrays auf die Form [K, n]; 1-D-Arrays gelten für alle Konfigurationen."""
+    return {key: np.broadcast_to(value, (K, n)) for key, value in arrays.items()}
+
+
+class CombatOutcome:
+    """Ergebnis von K Kampfkonfigurationen, jeweils als Array über die Konfigurationen."""
+    def __init__(self, attacker_dead: np.ndarray, blocker_dead: np.ndarray,
+                 attacker_damage: np.ndarray, blocker_damage: np.ndarray,
+                 attacker_life_delta: np.ndarray, defender_life_delta: np.ndarray,
+                 defender_life_delta_first_strike: np.ndarray):
+        self.attacker_dead = attacker_dead                  # [K, A]
+        self.blocker_dead = blocker_dead                    # [K, B]
+        # Neu markierter Schaden (Deathtouch markiert die verbleibende Widerstandskraft)
+        self.attacker_damage = attacker_damage              # [K, A]
+        self.blocker_damage = blocker_damage                # [K, B]
+        self.attacker_life_delta = attacker_life_delta      # [K]
+        self.defender_life_delta = defender_life_delta      # [K]
+        # Lebensänderung des Verteidigers nach dem Erstschlag-Schritt (für Letalitätsprüfungen)
+        self.defender_life_delta_first_strike = defender_life_delta_first_strike  # [K]
+
+    def feature_deltas(self, att: Dict[str, np.ndarray], blk: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Änderung des Merkmalsvektors (siehe `evaluation.FEATURE_NAMES`) aus Sicht des
+        Angreifers für jede Konfiguration [K, NUM_FEATURES].
+        """
+        deltas = np.zeros((len(self.attacker_life_delta), NUM_FEATURES))
+        deltas[:, 0] = self.attacker_life_delta
+        deltas[:, 1] = self.defender_life_delta
+        deltas[:, 2] = -(self.attacker_dead * att['value']).sum(axis=1)
+        deltas[:, 3] = -(self.blocker_dead * blk['value']).sum(axis=1)
+        deltas[:, 4] = -self.attacker_dead.sum(axis=1)
+        deltas[:, 5] = -self.blocker_dead.sum(axis=1)
+        return deltas
+
+
+def resolve_combat(att: Dict[str, np.ndarray], blk: Dict[str, np.ndarray],
+                   attack_mask: np.ndarray, blocks: np.ndarray,
+                   block_rank: Optional[np.ndarray] = None,
+                   segments: Sequence[bool] = (True, False),
+                   attacker_alive: Optional[np.ndarray] = None,
+                   blocker_alive: Optional[np.ndarray] = None) -> CombatOutcome:
+    """
+    Verrechnet K Kampfkonfigurationen gleichzeitig nach denselben Regeln wie
+    `GameState.assign_combat_damage` (inkl. zustandsbasierter Aktionen zwischen den
+    Schadensschritten).
+
+    att/blk:        Kreaturen-Arrays (siehe `creature_arrays`), entweder [A] für alle
+                    Konfigurationen oder [K, A] je Konfiguration.
+    attack_mask:    [K, A] bool, welche Kreaturen angreifen.
+    blocks:         [K, B] int, Index des geblockten Angreifers oder -1.
+    block_rank:     [K, B] optional, Schadenszuweisungsreihenfolge unter den Blockern
+                    eines Angreifers (aufsteigend); Standard ist der Blocker-Index.
+    segments:       Zu verrechnende Schadensschritte (True = Erstschlag).
+    attacker_alive/blocker_alive: optional, welche Kreaturen noch auf dem Schlachtfeld
+                    sind (z.B. für den regulären Schritt nach einem Erstschlag-Schritt).
+    """
+    attack_mask = np.asarray(attack_mask, dtype=bool)
+    blocks = np.asarray(blocks, dtype=np.int64)
+    K, A = attack_mask.shape
+    B = blocks.shape[1]
+    rows = np.arange(K)
+    att = _per_config(att, K, A)
+    blk = _per_config(blk, K, B)
+
+    # Blocks auf nicht angreifende Kreaturen zählen nicht
+    safe_blocks = np.maximum(blocks, 0)
+    is_blocking = (blocks >= 0) & attack_mask[rows[:, None], safe_blocks] if B else np.zeros((K, 0), dtype=bool)
+    blocked = np.zeros((K, A), dtype=bool)
+    np.logical_or.at(blocked, (np.repeat(rows, B), safe_blocks.ravel()), is_blocking.ravel())
+
+    if block_rank is None:
+        order = np.broadcast_to(np.arange(B), (K, B))
+    else:
+        order = np.argsort(block_rank, axis=1, kind='stable')
+    ordered_blocks = np.take_along_axis(np.where(is_blocking, blocks, -1), order, axis=1)
+
+    att_alive = attack_mask.copy() if attacker_alive is None else attack_mask & attacker_alive
+    blk_alive = is_blocking.copy() if blocker_alive is None else is_blocking & blocker_alive
+    initially_alive_att = att_alive.copy()
+    initially_alive_blk = blk_alive.copy()
+    att_damage = np.zeros((K, A), dtype=np.int64)
+    blk_damage = np.zeros((K, B), dtype=np.int64)
+    attacker_life = np.zeros(K, dtype=np.int64)
+    defender_life = np.zeros(K, dtype=np.int64)
+    defender_life_first_strike = np.zeros(K, dtype=np.int64)
+
+    for first_strike in segments:
+        seg_att = att['first'] if first_strike else att['regular']
+        seg_blk = blk['first'] if first_strike else blk['regular']
+        att_deals = att_alive & seg_att & (att['power'] > 0)
+        to_att = np.zeros((K, A), dtype=np.int64)
+        dt_att = np.zeros((K, A), dtype=bool)
+        to_blk = np.zeros((K, B), dtype=np.int64)
+
+        # Ungeblockte Angreifer treffen den Verteidiger
+        unblocked = att_deals & ~blocked
+        to_player = np.where(unblocked, att['power'], 0).sum(axis=1)
+
+        # Angreifer verteilen Schaden in Reihenfolge auf ihre noch lebenden Blocker
+        remaining = np.where(att_deals & blocked, att['power'], 0)
+        alive_left = np.zeros((K, A), dtype=np.int64)
+        ordered_alive = np.take_along_axis(blk_alive, order, axis=1)
+        for j in range(B):
+            a = ordered_blocks[:, j]
+            valid = ordered_alive[:, j] & (a >= 0)
+            np.add.at(alive_left, (rows[valid], a[valid]), 1)
+        for j in range(B):
+            b = order[:, j]
+            a = ordered_blocks[:, j]
+            valid = ordered_alive[:, j] & (a >= 0)
+            a_safe = np.maximum(a, 0)
+            alive_left[rows, a_safe] -= valid
+            is_last = alive_left[rows, a_safe] == 0
+            lethal = np.where(att['deathtouch'][rows, a_safe], 1,
+                              np.maximum(blk['toughness'][rows, b] - blk_damage[rows, b], 0))
+            left = remaining[rows, a_safe]
+            amount = np.where(valid, np.where(is_last, left, np.minimum(left, lethal)), 0)
+            remaining[rows, a_safe] -= amount
+            to_blk[rows, b] += amount
+
+        # Blocker treffen den Angreifer, den sie blocken, sofern er noch lebt
+        blk_deals = blk_alive & seg_blk & (blk['power'] > 0) & att_alive[rows[:, None], safe_blocks]
+        blk_hits = np.where(blk_deals, blk['power'], 0)
+        np.add.at(to_att, (np.repeat(rows, B), safe_blocks.ravel()), blk_hits.ravel())
+        np.logical_or.at(dt_att, (np.repeat(rows, B), safe_blocks.ravel()), (blk_deals & blk['deathtouch']).ravel())
+
+        # Schaden gleichzeitig anwenden (Deathtouch markiert Schaden in Höhe der Widerstandskraft)
+        att_dealt = np.where(unblocked, att['power'], 0)
+        np.add.at(att_dealt, (np.repeat(rows, B), np.maximum(ordered_blocks, 0).ravel()),
+                  np.take_along_axis(to_blk, order, axis=1).ravel())
+        blk_damage += np.where((to_blk > 0) & att['deathtouch'][rows[:, None], safe_blocks],
+                               np.maximum(blk['toughness'] - blk_damage, 0), to_blk)
+        att_damage += np.where(dt_att, np.maximum(att['toughness'] - att_damage, 0), to_att)
+
+        defender_life -= to_player
+        attacker_life += np.where(att['lifelink'], att_dealt, 0).sum(axis=1)
+        defender_life += np.where(blk['lifelink'], blk_hits, 0).sum(axis=1)
+
+        # Zustandsbasierte Aktionen
+        att_alive &= att_damage < att['toughness']
+        blk_alive &= blk_damage < blk['toughness']
+        if first_strike:
+            defender_life_first_strike = defender_life.copy()
+
+    return CombatOutcome(
+        attacker_dead=initially_alive_att & ~att_alive,
+        blocker_dead=initially_alive_blk & ~blk_alive,
+        attacker_damage=att_damage,
+        blocker_damage=blk_damage,
+        attacker_life_delta=attacker_life,
+        defender_life_delta=defender_life,
+        defender_life_delta_first_strike=defender_life_first_strike,
+    )
@@ -0,0 +1,228 @@
+import copy
+import logging
+import math
+import time
+from collections import Counter
+from typing import List, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from core.data.archetype_priors import ArchetypePrior
+from .card import Card
+
+if TYPE_CHECKING:
+    from .game_state import GameState
+
+# Anzahl der Welten, über die die Aktionssuche der KI mittelt
+DEFAULT_SEARCH_WORLDS = 4
+# Anzahl der Zuweisungen, die pro Stapel auf einmal gezogen werden
+DEFAULT_BATCH_SIZE = 64
+# Öffentliche Zonen, deren Karten beide Spieler kennen
+PUBLIC_ZONES = ('battlefield', 'graveyard', 'exile')
+# Landanteil eines Decks, wenn ohne Archetyp-Daten aus den beobachteten Karten geschätzt wird
+GENERIC_LAND_SHARE = 0.4
+
+
+class InformationSet:
+    """
+    Was `player_id` über einen Spielzustand weiß: eigene Karten, alle öffentlichen Zonen und
+    die Größen von gegnerischer Hand und Bibliothek. Die Reihenfolge der eigenen Bibliothek
+    ist ebenfalls unbekannt. `known_hand` sind gegnerische Handkarten, die aufgedeckt wurden.
+    """
+    def __init__(self, game: 'GameState', player_id: int, known_hand: Sequence[Card] = ()):
+        self.player_id = player_id
+        player = game.get_player(player_id)
+        opponent = game.get_player(1 - player_id)
+        known_ids = {id(c) for c in known_hand}
+        self.known_hand_indices = [i for i, c in enumerate(opponent.hand) if id(c) in known_ids]
+        self.hidden_hand_size = len(opponent.hand) - len(self.known_hand_indices)
+        self.library_size = len(opponent.library)
+        self.own_library_size = len(player.library)
+
+        seen = [c for zone in PUBLIC_ZONES for c in getattr(opponent, zone)]
+        seen += [opponent.hand[i] for i in self.known_hand_indices]
+        self.observed: Dict[str, int] = dict(Counter(c.name for c in seen))
+        self.observed_cards: Dict[str, Dict] = {c.name: c.static_data for c in seen}
+        self.opponent_deck_size = len(seen) + self.hidden_hand_size + self.library_size
+        # Die eigene Deckliste ist bekannt (Grundlage der Schätzung, solange nichts beobachtet wurde)
+        self.own_decklist = [c.static_data for zone in ('library', 'hand') + PUBLIC_ZONES for c in getattr(player, zone)]
+
+    @property
+    def hidden_count(self) -> int:
+        """Anzahl der gegnerischen Karten mit unbekannter Identität (Hand + Bibliothek)."""
+        return self.hidden_hand_size + self.library_size
+
+    def key(self) -> Tuple:
+        """Signatur der verdeckten Information: gleiche Signatur = Stichproben wiederverwendbar."""
+        return (self.player_id, self.hidden_hand_size, self.library_size, self.own_library_size,
+                tuple(self.known_hand_indices), tuple(sorted(self.observed.items())))
+
+
+def public_prior(info: InformationSet) -> ArchetypePrior:
+    """
+    Prior ohne Archetyp-Daten, nur aus öffentlicher Information: Der Gegner spielt die
+    beobachteten Karten, verteilt auf `GENERIC_LAND_SHARE` Länder und sonst Zauber zu gleichen
+    Teilen. Solange noch nichts beobachtet wurde, wird das eigene Deck als Spiegel angenommen.
+    """
+    if not info.observed_cards:
+        counts = Counter(card['name'] for card in info.own_decklist)
+        cards = {card['name']: card for card in info.own_decklist}
+        return ArchetypePrior('Spiegel', counts, cards, deck_size=info.opponent_deck_size)
+
+    lands = [name for name, card in info.observed_cards.items() if 'Land' in (card.get('type_line') or '')]
+    spells = [name for name in info.observed_cards if name not in lands]
+    land_slots = info.opponent_deck_size * (GENERIC_LAND_SHARE if spells else 1.0) if lands else 0.0
+    spell_slots = info.opponent_deck_size - land_slots
+    counts = {name: max(land_slots / len(lands), info.observed[name]) for name in lands}
+    counts.update({name: max(spell_slots / len(spells), info.observed[name]) for name in spells})
+    return ArchetypePrior('Beobachtet', counts, info.observed_cards, deck_size=info.opponent_deck_size)
+
+
+class Determinization:
+    """Eine Zuweisung der verdeckten Karten: gegnerische Hand und Bibliothek sowie die eigene Reihenfolge."""
+    __slots__ = ('archetype', 'hand', 'library', 'own_library_order')
+
+    def __init__(self, archetype: str, hand: List[Dict], library: List[Dict], own_library_order: np.ndarray):
+        self.archetype = archetype
+        self.hand = hand
+        self.library = library
+        self.own_library_order = own_library_order
+
+    def apply(self, game: 'GameState', info: InformationSet) -> 'GameState':
+        """Erzeugt die Welt: eine Kopie von `game` mit den zugewiesenen verdeckten Karten."""
+        world = game.clone()
+        player = world.get_player(info.player_id)
+        opponent = world.get_player(1 - info.player_id)
+        known = [opponent.hand[i] for i in info.known_hand_indices]
+        opponent.hand = known + [Card(data, opponent) for data in self.hand]
+        opponent.library = [Card(data, opponent) for data in self.library]
+        player.library = [player.library[i] for i in self.own_library_order]
+        return world
+
+
+class DeterminizationSampler:
+    """
+    Erzeugt determinisierte Welten, die mit der Information eines Spielers verträglich sind.
+    Die Archetypen werden nach den beobachteten Karten gewichtet (Bayes), dann werden die
+    verdeckten Karten ohne Zurücklegen aus dem Rest des Decks gezogen. Ohne Archetyp-Daten
+    wird `public_prior` verwendet; die echte Hand und Bibliothek des Gegners werden nie gelesen. Gezogen wird in
+    Stapeln (NumPy); solange sich die verdeckte Information nicht ändert, werden bereits
+    gezogene Zuweisungen wiederverwendet, sodass alle Suchiterationen dieselben Welten sehen.
+    """
+    def __init__(self, archetypes: Optional[Sequence[ArchetypePrior]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 rng: Optional[np.random.Generator] = None):
+        self.archetypes = list(archetypes or [])
+        self.batch_size = batch_size
+        self.rng = rng or np.random.default_rng()
+        self._cache_key: Optional[Tuple] = None
+        self._cache: List[Determinization] = []
+        self.sampled = 0
+        self.reused = 0
+
+    def __deepcopy__(self, memo):
+        # Wird von Simulationskopien geteilt
+        return self
+
+    def posterior(self, info: InformationSet, archetypes: Sequence[ArchetypePrior]) -> np.ndarray:
+        """Gewichte der Archetypen gegeben die beobachteten Karten."""
+        log_weights = np.array([math.log(a.weight) + a.log_likelihood(info.observed) if a.weight > 0 else -math.inf
+                                for a in archetypes])
+        if not np.isfinite(log_weights).any():
+            # Keiner passt (z.B. Karte außerhalb der Daten): auf die Vorab-Gewichte zurückfallen
+            logging.debug("Keine Archetyp-Prior passt zu den beobachteten Karten, verwende Vorab-Gewichte.")
+            log_weights = np.log(np.array([max(a.weight, 1e-12) for a in archetypes]))
+        weights = np.exp(log_weights - log_weights.max())
+        return weights / weights.sum()
+
+    def sample(self, info: InformationSet, n: int) -> List[Determinization]:
+        """Gibt `n` Zuweisungen zurück; bereits gezogene werden bei gleicher Information wiederverwendet."""
+        key = info.key()
+        if key != self._cache_key:
+            self._cache_key, self._cache = key, []
+        self.reused += min(n, len(self._cache))
+        while len(self._cache) < n:
+            self._cache.extend(self._sample_batch(info, max(self.batch_size, n - len(self._cache))))
+        return self._cache[:n]
+
+    def worlds(self, game: 'GameState', player_id: int, n: int = DEFAULT_SEARCH_WORLDS,
+               known_hand: Sequence[Card] = ()) -> List['GameState']:
+        """Erzeugt `n` determinisierte Welten aus Sicht von `player_id`."""
+        info = InformationSet(game, player_id, known_hand)
+        return [d.apply(game, info) for d in self.sample(info, n)]
+
+    def _sample_batch(self, info: InformationSet, batch: int) -> List[Determinization]:
+        archetypes = self.archetypes or [public_prior(info)]
+        choice = self.rng.choice(len(archetypes), size=batch, p=self.posterior(info, archetypes))
+        # Eigene Bibliothek: nur die Reihenfolge ist unbekannt
+        own_orders = np.argsort(self.rng.random((batch, info.own_library_size)), axis=1)
+        self.sampled += batch
+
+        result: List[Optional[Determinization]] = [None] * batch
+        for k, archetype in enumerate(archetypes):
+            rows = np.flatnonzero(choice == k)
+            if len(rows) == 0:
+                continue
+            types = self._draw_types(archetype, info, len(rows))
+            data = [archetype.cards[name] for name in archetype.names]
+            for row, drawn in zip(rows, types.tolist()):
+                cards = [data[t] for t in drawn]
+                result[row] = Determinization(archetype.name, cards[:info.hidden_hand_size],
+                                              cards[info.hidden_hand_size:], own_orders[row])
+        return result
+
+    def _draw_types(self, archetype: ArchetypePrior, info: InformationSet, rows: int) -> np.ndarray:
+        """Zieht für `rows` Welten die verdeckten Karten (Kartentyp-Indizes) ohne Zurücklegen [rows, hidden]."""
+        observed = np.array([info.observed.get(name, 0) for name in archetype.names], dtype=np.int64)
+        remaining = np.maximum(archetype.integer_counts() - observed, 0)
+        pool = np.repeat(np.arange(len(archetype.names)), remaining)
+        needed = info.hidden_count
+        if len(pool) >= needed:
+            # Zufällige Schlüssel je Welt sortieren = gleichverteilte Permutationen des Restdecks
+            order = np.argsort(self.rng.random((rows, len(pool))), axis=1)[:, :needed]
+            return pool[order]
+        # Das Restdeck reicht nicht (Daten passen nicht exakt): fehlende Karten nach Prior ergänzen
+        extra = self.rng.choice(len(archetype.names), size=(rows, needed - len(pool)),
+                                p=archetype.counts / archetype.counts.sum())
+        drawn = np.concatenate([np.broadcast_to(pool, (rows, len(pool))), extra], axis=1)
+        return np.take_along_axis(drawn, np.argsort(self.rng.random(drawn.shape), axis=1), axis=1)
+
+
+def benchmark_determinization(game: 'GameState', player_id: int, num_worlds: int = 1000,
+                              archetypes: Optional[Sequence[ArchetypePrior]] = None,
+                              batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, float]:
+    """
+    Misst den Durchsatz des Samplers (Zuweisungen pro Sekunde), die Kosten pro erzeugter Welt
+    und zum Vergleich die Kosten einer `copy.deepcopy` des Spielzustands.
+    """
+    info = InformationSet(game, player_id)
+    sampler = DeterminizationSampler(archetypes, batch_size, np.random.default_rng(0))
+
+    start = time.perf_counter()
+    determinizations = sampler.sample(info, num_worlds)
+    sample_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sampler.sample(info, num_worlds)
+    reuse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for determinization in determinizations:
+        determinization.apply(game, info)
+    world_seconds = time.perf_counter() - start
+
+    copies = max(num_worlds // 20, 1)
+    start = time.perf_counter()
+    for _ in range(copies):
+        copy.deepcopy(game)
+    deepcopy_seconds = time.perf_counter() - start
+
+    summary = {
+        'worlds': num_worlds,
+        'samples_per_s': num_worlds / sample_seconds,
+        'sample_us': sample_seconds / num_worlds * 1e6,
+        'reuse_us': reuse_seconds / num_worlds * 1e6,
+        'world_ms': world_seconds / num_worlds * 1000.0,
+        'deepcopy_ms': deepcopy_seconds / copies * 1000.0,
+    }
+    logging.info(f"Determinisierungs-Benchmark: {summary}")
+    return summary
@@ -0,0 +1,155 @@
+from typing import List, Dict, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game_state import GameState
+
+# Reihenfolge der Merkmale im Merkmalsvektor, jeweils aus Sicht eines Spielers
+FEATURE_NAMES = [
+    'life', 'opponent_life',
+    'board_value', 'opponent_board_value',
+    'creatures', 'opponent_creatures',
+    'cards', 'opponent_cards',
+]
+NUM_FEATURES = len(FEATURE_NAMES)
+
+
+def creature_value(card: 'Card') -> float:
+    """Wert einer Kreatur auf dem Schlachtfeld = Power + Toughness (Nicht-Kreaturen zählen 0)."""
+    if 'Creature' not in card.static_data.get('type_line', ''):
+        return 0.0
+    return float(card.power + card.toughness)
+
+
+def card_count(game: 'GameState', player_id: int) -> int:
+    """
+    Kartenvorrat eines Spielers: Nicht-Länder auf der Hand plus Länder im Spiel. Ein gespieltes
+    Land bleibt so Teil des Vorrats, statt als Kartennachteil gegenüber dem Halten zu zählen.
+    """
+    spells_in_hand = sum(1 for card in game.get_player(player_id).hand if not card.is_land())
+    return spells_in_hand + game.board_features.land_count[player_id]
+
+
+class BoardFeatures:
+    """
+    Inkrementell gepflegte Summen über beide Schlachtfelder. Zonenwechsel und
+    Änderungen der Effekte einer Karte wenden nur ein Delta an, sodass die
+    Bewertung eines Zustands kein Schlachtfeld mehr durchlaufen muss.
+    Lebenspunkte werden direkt gelesen, die Hand (wenige Karten) beim Bewerten gezählt.
+    """
+    def __init__(self):
+        self.board_value: List[float] = [0.0, 0.0]
+        self.creature_count: List[int] = [0, 0]
+        self.land_count: List[int] = [0, 0]
+        # Aktueller Beitrag jeder Karte auf dem Schlachtfeld
+        self._contributions: Dict['Card', float] = {}
+
+    def on_enter_battlefield(self, card: 'Card'):
+        """Verbucht eine Karte, die das Schlachtfeld betritt."""
+        value = creature_value(card)
+        self._contributions[card] = value
+        pid = card.owner.player_id
+        self.board_value[pid] += value
+        if 'Creature' in card.static_data.get('type_line', ''):
+            self.creature_count[pid] += 1
+        if card.is_land():
+            self.land_count[pid] += 1
+
+    def on_leave_battlefield(self, card: 'Card'):
+        """Entfernt den Beitrag einer Karte, die das Schlachtfeld verlässt."""
+        value = self._contributions.pop(card, None)
+        if value is None:
+            return
+        pid = card.owner.player_id
+        self.board_value[pid] -= value
+        if 'Creature' in card.static_data.get('type_line', ''):
+            self.creature_count[pid] -= 1
+        if card.is_land():
+            self.land_count[pid] -= 1
+
+    def on_characteristics_changed(self, card: 'Card'):
+        """Wendet das Delta an, wenn sich Power/Toughness einer Karte (z.B. durch Effekte) ändern."""
+        old_value = self._contributions.get(card)
+        if old_value is None:
+            return
+        new_value = creature_value(card)
+        self._contributions[card] = new_value
+        self.board_value[card.owner.player_id] += new_value - old_value
+
+    def rebuild(self, game: 'GameState'):
+        """Berechnet alle Summen neu, z.B. nachdem Zonen direkt befüllt wurden."""
+        self.board_value = [0.0, 0.0]
+        self.creature_count = [0, 0]
+        self.land_count = [0, 0]
+        self._contributions = {}
+        for player in game.players:
+            for card in player.battlefield:
+                self.on_enter_battlefield(card)
+
+
+def feature_vector(game: 'GameState', player_id: int) -> np.ndarray:
+    """Merkmalsvektor (siehe FEATURE_NAMES) eines Zustands aus Sicht von `player_id`."""
+    player = game.get_player(player_id)
+    opponent = game.get_player(1 - player_id)
+    features = game.board_features
+    return np.array([
+        player.life, opponent.life,
+        features.board_value[player_id], features.board_value[1 - player_id],
+        features.creature_count[player_id], features.creature_count[1 - player_id],
+        card_count(game, player_id), card_count(game, 1 - player_id),
+    ], dtype=float)
+
+
+class Evaluator:
+    """
+    Basisklasse für Bewertungsfunktionen. Eine Bewertung bildet Merkmalsvektoren
+    auf Scores ab und kann ganze Stapel von Zuständen auf einmal bewerten.
+    Evaluatoren sind zustandslos und werden von Simulationskopien geteilt.
+    """
+    def evaluate_features(self, features: np.ndarray) -> np.ndarray:
+        """Bewertet einen Stapel von Merkmalsvektoren [N, NUM_FEATURES]."""
+        raise NotImplementedError
+
+    def evaluate(self, game: 'GameState', player_id: int) -> float:
+        """Bewertet einen einzelnen Zustand aus Sicht von `player_id`."""
+        return float(self.evaluate_features(feature_vector(game, player_id)[None, :])[0])
+
+    def evaluate_batch(self, games: Sequence['GameState'], player_id: int) -> np.ndarray:
+        """Bewertet mehrere Zustände in einem Durchlauf."""
+        if not games:
+            return np.zeros(0)
+        return self.evaluate_features(np.stack([feature_vector(g, player_id) for g in games]))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class HeuristicEvaluator(Evaluator):
+    """Die bisherige heuristische Bewertung: Leben, Board Presence und Kartenvorteil."""
+    def __init__(self, life_weight: float = 1.5, board_weight: float = 1.0, hand_weight: float = 0.5):
+        self.life_weight = life_weight
+        self.board_weight = board_weight
+        self.hand_weight = hand_weight
+
+    @property
+    def weights(self) -> np.ndarray:
+        return np.array([
+            self.life_weight, -self.life_weight,
+            self.board_weight, -self.board_weight,
+            0.0, 0.0,
+            self.hand_weight, -self.hand_weight,
+        ])
+
+    def evaluate_features(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.weights
+
+    def evaluate(self, game: 'GameState', player_id: int) -> float:
+        # Skalarer Pfad ohne NumPy-Overhead: O(1) dank der inkrementellen BoardFeatures
+        player = game.get_player(player_id)
+        opponent = game.get_player(1 - player_id)
+        board_value = game.board_features.board_value
+        return (self.life_weight * (player.life - opponent.life)
+                + self.board_weight * (board_value[player_id] - board_value[1 - player_id])
+                + self.hand_weight * (card_count(game, player_id) - card_count(game, 1 - player_id)))
@@ -0,0 +1,104 @@
+import logging
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game_state import GameState
+
+# Sicherheitsnetz gegen Endlosschleifen: danach endet die Partie unentschieden
+DEFAULT_MAX_TURNS = 10
+
+
+class GameResult:
+    """Ergebnis einer vollständig gespielten Partie."""
+    def __init__(self, winner: Optional[int], turns: int, decision_calls: int, auto_passed_steps: int):
+        # Spieler-ID des Gewinners, None bei Unentschieden (auch bei Erreichen des Zuglimits)
+        self.winner = winner
+        self.turns = turns
+        # Statistik: KI-Entscheidungen und automatisch übersprungene Schritte
+        self.decision_calls = decision_calls
+        self.auto_passed_steps = auto_passed_steps
+
+    def __repr__(self) -> str:
+        return (f"GameResult(winner={self.winner}, turns={self.turns}, "
+                f"decisions={self.decision_calls}, auto_passed={self.auto_passed_steps})")
+
+
+def run_game(game: 'GameState', max_turns: int = DEFAULT_MAX_TURNS) -> GameResult:
+    """
+    Spielt eine bereits gestartete Partie (`GameState.start_game`) mit einem regelkonformen
+    Prioritätssystem bis zum Ende oder bis zum Zuglimit. Beide Spieler entscheiden über
+    ihre KI (`Player.choose_action`).
+    """
+    game_over = False
+    decision_calls = 0
+    auto_passed_steps = 0
+
+    while not game_over and game.turn_number <= max_turns:
+        # Führe zu Beginn eines Schrittes regelbasierte Aktionen aus
+        game.phase_manager.execute_current_step_actions()
+        game.check_state_based_actions()
+
+        # Kann niemand etwas tun, wird ohne Prioritätsrunde weitergeschaltet (Stopps siehe PhaseManager.stops)
+        action_in_step_loop = not game.can_auto_pass()
+        if action_in_step_loop:
+            # Nach der Aktion bekommt der aktive Spieler Priorität
+            game.grant_priority(game.active_player.player_id)
+        else:
+            auto_passed_steps += 1
+            game.phase_manager.advance_to_next_step()
+
+        while action_in_step_loop:
+            player_with_prio = game.get_player(game.player_with_priority)
+            action = player_with_prio.choose_action()
+            decision_calls += 1
+
+            if action == "pass_priority":
+                game.passed_priority_count += 1
+                game.player_with_priority = 1 - game.player_with_priority
+            else:
+                # AKTION AUSFÜHREN
+                if action.startswith("play_land_"):
+                    card_name = action.replace("play_land_", "")
+                    land_to_play = next((c for c in player_with_prio.hand if c.name == card_name), None)
+                    if land_to_play:
+                        player_with_prio.play_land(land_to_play)
+
+                elif action.startswith("cast_"):
+                    card_name = action.replace("cast_", "")
+                    card_to_cast = next((c for c in player_with_prio.hand if c.name == card_name), None)
+                    if card_to_cast:
+                        player_with_prio.cast_spell(card_to_cast)
+
+                elif action.startswith("activate_"):
+                    # Logik für aktivierbare Fähigkeiten
+                    permanent_name = action.replace("activate_", "")
+                    permanent_to_activate = next((p for p in player_with_prio.battlefield if p.name == permanent_name), None)
+
+                    if permanent_to_activate and not permanent_to_activate.is_tapped:
+                        # Harcoded-Effekt für Llanowar Elfen
+                        if permanent_to_activate.name == "Llanowar Elves":
+                            logging.info(f"Spieler {player_with_prio.player_id} aktiviert '{permanent_to_activate.name}' für grünes Mana.")
+                            permanent_to_activate.is_tapped = True
+                            player_with_prio.mana_pool['G'] += 1
+
+                # Nach einer erfolgreichen Aktion bekommt der aktive Spieler wieder Priorität
+                game.grant_priority(game.active_player.player_id)
+
+            # Prüfe, ob der Schritt oder die Phase beendet werden kann
+            if game.passed_priority_count >= 2:
+                if not game.stack_manager.is_empty():
+                    # Beide Spieler passen -> oberstes Element des Stacks verrechnen
+                    game.stack_manager.resolve_top_item()
+                    game.check_state_based_actions()
+                    game.grant_priority(game.active_player.player_id) # Erneut Priorität
+                else:
+                    # Beide Spieler passen bei leerem Stack -> zum nächsten Schritt gehen
+                    game.phase_manager.advance_to_next_step()
+                    action_in_step_loop = False # Verlasse die innere Schleife
+
+        if game.players[0].life <= 0 or game.players[1].life <= 0:
+            game_over = True
+
+    alive = [p.player_id for p in game.players if p.life > 0]
+    winner = alive[0] if game_over and len(alive) == 1 else None
+    return GameResult(winner, game.turn_number, decision_calls, auto_passed_steps)
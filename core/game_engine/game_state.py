@@ -6,7 +6,10 @@ from .player import Player
 from .card import Card
 from .phase_manager import PhaseManager
 from .stack_manager import StackManager
+from .evaluation import BoardFeatures
 
+# Kartenzonen eines Spielers
+PLAYER_ZONES = ('library', 'hand', 'battlefield', 'graveyard', 'exile')
 
 
 class GameState:
@@ -21,6 +24,8 @@ class GameState:
         self.turn_number: int = 1
         self.phase_manager = PhaseManager(self)
         self.stack_manager = StackManager(self)
+        # Inkrementell gepflegte Bewertungsmerkmale beider Schlachtfelder
+        self.board_features = BoardFeatures()
 
         self.player_with_priority: Optional[int] = None
         self.passed_priority_count: int = 0
@@ -31,6 +36,62 @@ class GameState:
         self.player_with_priority = player_id
         self.passed_priority_count = 0
 
+    def can_auto_pass(self) -> bool:
+        """
+        Prüft, ob der aktuelle Schritt ohne Prioritätsrunde übersprungen werden kann: kein
+        Stopp gesetzt, Stapel leer, keine mögliche ausgelöste Fähigkeit, und kein Spieler hat
+        eine legale Aktion außer Passen. Die Prüfung ist billig (keine Aktionsliste, keine
+        Suche) und im Zweifel konservativ.
+        """
+        if self.phase_manager.current_step in self.phase_manager.stops or not self.stack_manager.is_empty():
+            return False
+        if self.phase_manager.has_step_triggers():
+            return False
+        return not any(player.has_priority_action() for player in self.players)
+
+    def clone(self) -> 'GameState':
+        """
+        Unabhängige Kopie für Simulationen. Karten werden flach geklont: statische Kartendaten
+        und Effektobjekte werden geteilt, alle veränderlichen Zustände (Zonen, Tapped-Status,
+        Schaden, Effektlisten, Kampfzuordnungen, Stapel) sind getrennt. Deutlich schneller
+        als `copy.deepcopy`.
+        """
+        game = GameState.__new__(GameState)
+        game.__dict__.update(self.__dict__)
+        game.phase_manager = PhaseManager.__new__(PhaseManager)
+        game.phase_manager.__dict__.update(self.phase_manager.__dict__)
+        game.phase_manager.game_state = game
+        game.stack_manager = StackManager(game)
+
+        clones: Dict[Card, Card] = {}
+        game.players = []
+        for source in self.players:
+            player = Player.__new__(Player)
+            player.__dict__.update(source.__dict__)
+            player.game = game
+            player.mana_pool = dict(source.mana_pool)
+            for zone in PLAYER_ZONES:
+                cloned_zone = []
+                for card in getattr(source, zone):
+                    clone = Card.__new__(Card)
+                    clone.__dict__.update(card.__dict__)
+                    clone.owner = player
+                    clone.active_effects = list(card.active_effects)
+                    clone.counters = dict(card.counters)
+                    clones[card] = clone
+                    cloned_zone.append(clone)
+                setattr(player, zone, cloned_zone)
+            game.players.append(player)
+        for card, clone in clones.items():
+            clone.blockers = [clones[b] for b in card.blockers if b in clones]
+            clone.blocking = clones.get(card.blocking)
+            clone.target = clones.get(card.target)
+        game.stack_manager.stack = [clones[c] for c in self.stack_manager.stack if c in clones]
+
+        game.board_features = BoardFeatures()
+        game.board_features.rebuild(game)
+        return game
+
     def get_player(self, player_id: int) -> Player:
         """Gibt das Spielerobjekt für eine gegebene ID zurück."""
         return self.players[player_id]
@@ -60,7 +121,11 @@ class GameState:
     
 
     def assign_combat_damage(self, first_strike: bool):
-        """Verrechnet Kampfschaden, inkl. Deathtouch und Lifelink."""
+        """
+        Verrechnet Kampfschaden, inkl. Mehrfachblocks, Deathtouch und Lifelink.
+        Der gesamte Schaden eines Segments wird gleichzeitig zugefügt; nur Kreaturen,
+        die sich noch auf dem Schlachtfeld befinden, teilen Schaden aus oder erhalten ihn.
+        """
         log_prefix = "Erstschlag" if first_strike else "Regulärer"
         logging.info(f"--- {log_prefix} Kampfschaden ---")
         
@@ -68,43 +133,52 @@ class GameState:
         defending_player = self.get_player(1 - attacking_player.player_id)
         
         all_attackers = [c for c in attacking_player.battlefield if c.is_attacking]
+        # (Quelle, Ziel-Kreatur oder None für den verteidigenden Spieler, Schaden)
+        damage_events = []
 
         for attacker in all_attackers:
-            deals_damage_this_segment = (
-                (first_strike and (attacker.has_keyword('First Strike') or attacker.has_keyword('Double Strike'))) or
-                (not first_strike and not attacker.has_keyword('First Strike'))
-            )
-            if not deals_damage_this_segment:
+            if not attacker.deals_damage_in_segment(first_strike):
                 continue
-
             attacker_damage = attacker.power
             if attacker_damage <= 0: continue
 
-            if hasattr(attacker, 'blocker') and attacker.blocker:
-                blocker = attacker.blocker
-                blocker_damage = blocker.power
-                
-                # Deathtouch-Logik
-                if attacker.has_keyword('Deathtouch'):
-                    blocker.damage_marked += blocker.toughness
-                else:
-                    blocker.damage_marked += attacker_damage
-                
-                if blocker.has_keyword('Deathtouch'):
-                    attacker.damage_marked += attacker.toughness
-                else:
-                    attacker.damage_marked += blocker_damage
-                
-                # Lifelink-Logik
-                if attacker.has_keyword('Lifelink'):
-                    attacking_player.life += attacker_damage
-                if blocker.has_keyword('Lifelink'):
-                    defending_player.life += blocker_damage
+            if attacker.blockers:
+                # Ein geblockter Angreifer bleibt geblockt, auch wenn seine Blocker nicht mehr da sind.
+                remaining_blockers = [b for b in attacker.blockers if b in defending_player.battlefield]
+                for i, blocker in enumerate(remaining_blockers):
+                    if i == len(remaining_blockers) - 1:
+                        amount = attacker_damage
+                    else:
+                        # Jedem Blocker in Reihenfolge tödlichen Schaden zuweisen, bevor der nächste etwas erhält
+                        lethal = 1 if attacker.has_keyword('Deathtouch') else max(blocker.toughness - blocker.damage_marked, 0)
+                        amount = min(attacker_damage, lethal)
+                    attacker_damage -= amount
+                    if amount > 0:
+                        damage_events.append((attacker, blocker, amount))
             else:
                 # Ungeblockter Schaden
-                defending_player.life -= attacker_damage
-                if attacker.has_keyword('Lifelink'):
-                    attacking_player.life += attacker_damage
+                damage_events.append((attacker, None, attacker_damage))
+
+        for blocker in defending_player.battlefield:
+            attacker = blocker.blocking
+            if attacker is None or attacker not in attacking_player.battlefield:
+                continue
+            if not blocker.deals_damage_in_segment(first_strike) or blocker.power <= 0:
+                continue
+            damage_events.append((blocker, attacker, blocker.power))
+
+        for source, target, amount in damage_events:
+            if target is None:
+                defending_player.life -= amount
+            # Deathtouch-Logik
+            elif source.has_keyword('Deathtouch'):
+                target.damage_marked += target.toughness
+            else:
+                target.damage_marked += amount
+
+            # Lifelink-Logik
+            if source.has_keyword('Lifelink'):
+                source.owner.life += amount
 
     def check_state_based_actions(self):
         """
@@ -122,8 +196,7 @@ class GameState:
                 for creature in creatures_on_battlefield:
                     if creature.has_lethal_damage():
                         # Bewege die Kreatur vom Schlachtfeld in den Friedhof
-                        player.battlefield.remove(creature)
-                        player.graveyard.append(creature)
+                        player.remove_from_battlefield(creature, player.graveyard)
                         action_happened = True
                         logging.info(f"Zustandsbasierte Aktion: '{creature.name}' wird wegen tödlichen Schadens auf den Friedhof gelegt.")
                         # Breche die Schleife ab und starte die Überprüfung von vorne,
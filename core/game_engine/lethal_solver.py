@@ -0,0 +1,764 @@
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import List, Dict, Optional, Tuple, FrozenSet, Iterator, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .effect_system import EffectDuration
+from .phase_manager import TurnPhase, TurnStep
+from .search_budget import SearchBudget, SearchStats
+from .stack_manager import PUMP_SPELLS
+
+if TYPE_CHECKING:
+    from .card import Card
+    from .game_state import GameState
+
+# Bewiesene Ergebnisse aus Sicht des Spielers, für den gelöst wird
+WIN = 1
+UNDECIDED = 0
+LOSS = -1
+
+# Suchhorizont in Zügen: der aktuelle Kampf und der Gegenangriff im nächsten Zug
+DEFAULT_HORIZON = 2
+# Knotenlimit und Anteil an der Entscheidungszeit, die der Solver vor der Heuristik nutzen darf
+SOLVER_MAX_NODES = 50_000
+SOLVER_TIME_SHARE = 0.25
+
+# Schritte des eigenen Zuges, in denen der Angriff noch bevorsteht
+PRE_COMBAT_STEPS = (TurnStep.UNTAP, TurnStep.UPKEEP, TurnStep.DRAW, TurnPhase.PRECOMBAT_MAIN, TurnStep.BEGIN_COMBAT)
+# Schritte nach der Blockerdeklaration, in denen Pump-Zauber den Kampf entscheiden können
+PUMP_STEPS = (TurnStep.DECLARE_BLOCKERS, TurnStep.FIRST_STRIKE_DAMAGE)
+# Modell einer verdeckten gegnerischen Handkarte: der stärkste Pump-Zauber (Name, Manakosten)
+HIDDEN_PUMP = ("Giant Growth", "{G}")
+
+
+class _BudgetExhausted(Exception):
+    """Bricht die Suche ab; unvollständige Teilbäume liefern keinen Beweis."""
+
+
+class CombatCreature:
+    """Kampfrelevante Werte einer Kreatur für den Solver (unabhängig vom Spielobjekt)."""
+    __slots__ = ('card', 'power', 'toughness', 'next_power', 'next_toughness', 'first', 'regular', 'strikes',
+                 'deathtouch', 'lifelink', 'menace', 'vigilance', 'flying', 'reach', 'untapped', 'can_attack')
+
+    def __init__(self, power: int, toughness: int, keywords: Sequence[str] = (), untapped: bool = True,
+                 can_attack: bool = True, next_power: Optional[int] = None, next_toughness: Optional[int] = None,
+                 card: Optional['Card'] = None):
+        keywords = {k.lower() for k in keywords}
+        self.card = card
+        self.power = power
+        # Verbleibende Widerstandskraft (bereits markierter Schaden ist abgezogen)
+        self.toughness = toughness
+        # Werte im nächsten Zug: Schaden und "bis zum Ende des Zuges"-Effekte sind dann entfernt
+        self.next_power = power if next_power is None else next_power
+        self.next_toughness = toughness if next_toughness is None else next_toughness
+        double_strike = 'double strike' in keywords
+        self.first = 'first strike' in keywords or double_strike
+        self.regular = 'first strike' not in keywords or double_strike
+        self.strikes = 2 if double_strike else 1
+        self.deathtouch = 'deathtouch' in keywords
+        self.lifelink = 'lifelink' in keywords
+        self.menace = 'menace' in keywords
+        self.vigilance = 'vigilance' in keywords
+        self.flying = 'flying' in keywords
+        self.reach = 'reach' in keywords
+        self.untapped = untapped
+        self.can_attack = can_attack and untapped
+
+    @classmethod
+    def from_card(cls, card: 'Card') -> 'CombatCreature':
+        end_of_turn = [e for e in card.active_effects if e.duration == EffectDuration.END_OF_TURN]
+        return cls(card.power, card.toughness - card.damage_marked, card.static_data.get('keywords', []),
+                   untapped=not card.is_tapped,
+                   can_attack=not card.summoning_sick or card.has_keyword('Haste'),
+                   next_power=card.power - sum(getattr(e, 'power_modifier', 0) for e in end_of_turn),
+                   next_toughness=card.toughness - sum(getattr(e, 'toughness_modifier', 0) for e in end_of_turn),
+                   card=card)
+
+    def can_be_blocked_by(self, blocker: 'CombatCreature') -> bool:
+        if self.card is not None and blocker.card is not None:
+            return self.card.can_be_blocked_by(blocker.card)
+        return not self.flying or blocker.flying or blocker.reach
+
+    def __repr__(self) -> str:
+        name = self.card.name if self.card is not None else 'Kreatur'
+        return f"{name} {self.power}/{self.toughness}"
+
+
+class Pump:
+    """Ein Pump-Zauber auf der Hand (siehe `stack_manager.PUMP_SPELLS`)."""
+    __slots__ = ('card', 'name', 'power', 'toughness', 'generic', 'pips')
+
+    def __init__(self, name: str, mana_cost: str, card: Optional['Card'] = None):
+        self.card = card
+        self.name = name
+        self.power, self.toughness = PUMP_SPELLS[name]
+        self.generic, self.pips = 0, []
+        for part in mana_cost.replace('{', '').split('}')[:-1]:
+            if part.isdigit():
+                self.generic += int(part)
+            else:
+                self.pips.append(part.upper())
+
+    @classmethod
+    def from_card(cls, card: 'Card') -> 'Pump':
+        return cls(card.name, card.static_data.get('mana_cost', ''), card)
+
+    def __repr__(self) -> str:
+        return f"Pump({self.name} +{self.power}/+{self.toughness})"
+
+    def pay(self, lands: Tuple[FrozenSet[str], ...]) -> Optional[Tuple[FrozenSet[str], ...]]:
+        """Bezahlt den Zauber mit ungetappten Ländern (Farben je Land); gibt die übrigen Länder zurück."""
+        remaining = list(lands)
+        for color in self.pips:
+            # Farbige Kosten zuerst, mit dem Land, das die wenigsten Farben erzeugt
+            sources = [k for k, colors in enumerate(remaining) if color in colors]
+            if not sources:
+                return None
+            remaining.pop(min(sources, key=lambda k: len(remaining[k])))
+        if len(remaining) < self.generic:
+            return None
+        remaining.sort(key=len)
+        return tuple(remaining[self.generic:])
+
+
+class CombatPosition:
+    """
+    Kampfrelevanter Ausschnitt eines Spielzustands. Seite 0 ist der aktive (angreifende)
+    Spieler, Seite 1 der Verteidiger. Läuft der Kampf bereits, sind Angreifer und
+    Blocks (in Schadenszuweisungsreihenfolge) festgelegt.
+    """
+    def __init__(self, life: Sequence[int], creatures: Sequence[List[CombatCreature]],
+                 pumps: Sequence[List[Pump]] = ((), ()),
+                 untapped_lands: Sequence[Sequence[FrozenSet[str]]] = ((), ()),
+                 all_lands: Optional[Sequence[Sequence[FrozenSet[str]]]] = None,
+                 attacking: Optional[Sequence[int]] = None, blocks: Optional[Dict[int, List[int]]] = None,
+                 first_strike_done: bool = False):
+        self.life = tuple(life)
+        self.creatures = [list(side) for side in creatures]
+        self.pumps = [list(side) for side in pumps]
+        self.untapped_lands = [tuple(side) for side in untapped_lands]
+        self.all_lands = [tuple(side) for side in (all_lands if all_lands is not None else untapped_lands)]
+        self.attacking = tuple(attacking) if attacking is not None else None
+        self.blocks = blocks or {}
+        self.first_strike_done = first_strike_done
+
+    @classmethod
+    def from_game(cls, game: 'GameState', player_id: Optional[int] = None) -> 'CombatPosition':
+        """
+        Erzeugt die Position aus einem Spielzustand; ein laufender Kampf wird übernommen.
+        Mit `player_id` wird aus dessen Sicht gelöst: Die Hand des Gegners wird nicht gelesen,
+        sondern konservativ modelliert (siehe `hidden_hand_pumps`).
+        """
+        sides = [game.active_player, game.get_player(1 - game.active_player.player_id)]
+        cards = [[c for c in p.battlefield if 'Creature' in c.static_data.get('type_line', '')] for p in sides]
+        creatures = [[CombatCreature.from_card(c) for c in side] for side in cards]
+        pumps = [[Pump.from_card(c) for c in p.hand if c.name in PUMP_SPELLS]
+                 if player_id is None or p.player_id == player_id else hidden_hand_pumps(p) for p in sides]
+        lands = [[c for c in p.battlefield if c.is_land()] for p in sides]
+
+        attacking, blocks = None, {}
+        attack_index = {id(c): i for i, c in enumerate(cards[0]) if c.is_attacking}
+        if attack_index:
+            attacking = sorted(attack_index.values())
+            block_index = {id(c): j for j, c in enumerate(cards[1])}
+            for i in attacking:
+                blocks[i] = [block_index[id(b)] for b in cards[0][i].blockers if id(b) in block_index]
+        return cls([p.life for p in sides], creatures, pumps,
+                   [[frozenset(l.static_data.get('color_identity', [])) for l in side if not l.is_tapped] for side in lands],
+                   [[frozenset(l.static_data.get('color_identity', [])) for l in side] for side in lands],
+                   attacking, blocks,
+                   first_strike_done=game.phase_manager.current_step == TurnStep.FIRST_STRIKE_DAMAGE)
+
+
+def hidden_hand_pumps(player) -> List[Pump]:
+    """
+    Worst-Case-Modell einer verdeckten Hand: Jede Handkarte könnte ein Pump-Zauber sein
+    (`HIDDEN_PUMP`), höchstens einer pro Land, da jeder Zauber Mana kostet. Ob der Gegner
+    die Farben bezahlen kann, prüft der Solver über seine Länder. Bewiesene Ergebnisse
+    gelten damit für jede Hand, deren Kampftricks in `PUMP_SPELLS` modelliert sind; andere
+    Spontanzauber (Removal, Blocker mit Aufblitzen usw.) kennt der Solver nicht.
+    """
+    count = min(len(player.hand), sum(1 for c in player.battlefield if c.is_land()))
+    return [Pump(*HIDDEN_PUMP) for _ in range(count)]
+
+
+class LethalResult:
+    """Ergebnis des Solvers aus Sicht eines Spielers."""
+    def __init__(self, value: Optional[int], stats: SearchStats):
+        # WIN/LOSS/UNDECIDED, oder None, wenn das Budget vor dem Ende der Suche erschöpft war
+        self.value = value
+        self.stats = stats
+        # Angriff, der den Sieg erzwingt (Karten)
+        self.attack: List['Card'] = []
+        # Pump-Zauber des Spielers, die das Ergebnis erzwingen: (Zauber, Ziel)
+        self.pumps: List[Tuple[Pump, CombatCreature]] = []
+        # Bewiesene Werte einzelner Angriffe, Schlüssel siehe `attack_value`
+        self.attack_values: Dict[Tuple, int] = {}
+        self._signatures: Dict[int, Tuple] = {}
+
+    @property
+    def proven(self) -> bool:
+        return self.value is not None
+
+    def attack_value(self, cards: Sequence['Card']) -> Optional[int]:
+        """Bewiesener Wert eines Angriffs mit `cards` (gleichwertige Kreaturen sind austauschbar)."""
+        return self.attack_values.get(_attack_key(self._signatures[id(c)] for c in cards))
+
+    def __repr__(self) -> str:
+        names = {WIN: 'Sieg', LOSS: 'Niederlage', UNDECIDED: 'offen', None: 'unbewiesen'}
+        return f"LethalResult({names[self.value]}, {self.stats})"
+
+
+def _attack_key(signatures) -> Tuple:
+    return tuple(sorted(signatures))
+
+
+class _Turn:
+    """Zustand zu Beginn eines Kampfes innerhalb der Suche."""
+    __slots__ = ('attacker', 'life', 'alive', 'untapped', 'lands', 'pumps', 'phase', 'turns_left', 'first_strike_done')
+
+    def __init__(self, attacker, life, alive, untapped, lands, pumps, phase, turns_left, first_strike_done=False):
+        self.attacker = attacker
+        self.life = life
+        self.alive = alive
+        self.untapped = untapped
+        self.lands = lands
+        self.pumps = pumps
+        # 0 = aktuelle Werte, 1 = Werte im nächsten Zug
+        self.phase = phase
+        self.turns_left = turns_left
+        self.first_strike_done = first_strike_done
+
+
+class LethalSolver:
+    """
+    Exakter Solver für kurze Horizonte: Alpha-Beta-Suche über Angriffe, Blocks und
+    Pump-Zauber beider Seiten für den aktuellen Kampf und den Gegenangriff im nächsten Zug.
+    Werte sind aus Sicht von Seite 0: WIN, wenn der Verteidiger im aktuellen Kampf stirbt,
+    LOSS, wenn Seite 0 im Gegenangriff stirbt, sonst UNDECIDED. Nachgezogene oder neu
+    gewirkte Karten werden nicht berücksichtigt.
+
+    Reihenfolge innerhalb eines Kampfes: Angriff, Blocks, Pumps des Angreifers, Pumps des
+    Verteidigers (der Verteidiger antwortet zuletzt). Die Schadensverrechnung folgt
+    `GameState.assign_combat_damage`.
+    """
+    def __init__(self, position: CombatPosition, budget: Optional[SearchBudget] = None,
+                 horizon: int = DEFAULT_HORIZON):
+        self.position = position
+        self.budget = budget or SearchBudget(time_limit=None, max_nodes=SOLVER_MAX_NODES, pause_gc=False)
+        self.horizon = horizon
+        creatures = position.creatures
+        # Werte je [Phase][Seite][Kreatur]
+        self._stats = [[[(c.power, c.toughness) for c in side] for side in creatures],
+                       [[(c.next_power, c.next_toughness) for c in side] for side in creatures]]
+        # legal[s][i][j]: Kreatur i von Seite s kann als Angreifer von Kreatur j der Gegenseite geblockt werden
+        self._legal = [[[att.can_be_blocked_by(blk) for blk in creatures[1 - s]] for att in creatures[s]] for s in (0, 1)]
+        self._signatures = [[self._signature(s, i) for i in range(len(creatures[s]))] for s in (0, 1)]
+        self._pump_bonus_cache: Dict[Tuple, int] = {}
+        # Transpositionstabelle für den letzten Kampf (viele Blocks führen zum selben Folgezustand)
+        self._last_turn_cache: Dict[Tuple, int] = {}
+
+    def _signature(self, side: int, i: int) -> Tuple:
+        """Gleiche Signatur = austauschbare Kreaturen (Symmetriereduktion bei Angriffen und Blocks)."""
+        c = self.position.creatures[side][i]
+        return (c.power, c.toughness, c.next_power, c.next_toughness, c.first, c.regular, c.deathtouch,
+                c.lifelink, c.menace, c.vigilance, c.untapped, c.can_attack, tuple(self._legal[side][i]),
+                tuple(row[i] for row in self._legal[1 - side]))
+
+    # --- Einstiegspunkte ---------------------------------------------------------------
+
+    def solve_attack(self, exact: bool = False) -> LethalResult:
+        """
+        Sucht einen Angriff, der den Sieg in diesem Kampf erzwingt. Mit `exact` werden danach
+        alle Angriffe (bis auf Symmetrie) auf eine erzwungene Niederlage im Gegenzug geprüft.
+        Ohne `exact` ist das Ergebnis einer vollständigen Suche WIN oder UNDECIDED (LOSS wird
+        dann nicht untersucht).
+        """
+        self.budget.start()
+        root = self._root_turn()
+        attackers = [i for i in root.alive[0] if self.position.creatures[0][i].can_attack]
+        result = LethalResult(None, self.budget.stats)
+        result._signatures = {id(c.card): self._signatures[0][i]
+                              for i, c in enumerate(self.position.creatures[0]) if c.card is not None}
+        try:
+            # Für den Sieg in diesem Kampf ist der volle Angriff mindestens so gut wie jede
+            # Teilmenge; nur Lifelink-Blocker können das umkehren.
+            if any(self.position.creatures[1][j].lifelink for j in root.untapped[1]):
+                win_candidates = list(self._attack_subsets(root, attackers))
+            else:
+                win_candidates = [tuple(attackers)]
+            for subset in win_candidates:
+                if self._blocks(root, subset, UNDECIDED, WIN, 1) >= WIN:
+                    result.value = WIN
+                    result.attack = [self.position.creatures[0][i].card for i in subset]
+                    result.attack_values[self._key(subset)] = WIN
+                    self.budget.finish(True)
+                    return result
+            if not exact:
+                # Kein Angriff erzwingt den Sieg; der Gegenangriff wird nicht geprüft
+                result.value = UNDECIDED
+            else:
+                # Nullfenster-Test je Angriff: erzwingt der Gegner im nächsten Zug den Sieg?
+                for subset in self._attack_subsets(root, attackers):
+                    value = self._blocks(root, subset, LOSS, UNDECIDED, 1)
+                    result.attack_values[self._key(subset)] = LOSS if value <= LOSS else UNDECIDED
+                result.value = max(result.attack_values.values())
+        except _BudgetExhausted:
+            self.budget.finish(False)
+            return result
+        self.budget.finish(True)
+        return result
+
+    def solve_pumps(self, side: int) -> LethalResult:
+        """
+        Löst einen laufenden Kampf (Angreifer und Blocks stehen fest) für die Pump-Zauber
+        von `side`. Ändert ein Pump-Plan das bewiesene Ergebnis gegenüber dem Verzicht,
+        wird er zurückgegeben. Der Wert ist aus Sicht von `side`.
+        """
+        self.budget.start()
+        root = self._root_turn()
+        attacking = self.position.attacking or ()
+        groups = {i: tuple(self.position.blocks.get(i, ())) for i in attacking}
+        result = LethalResult(None, self.budget.stats)
+        sign = 1 if side == 0 else -1
+        completed = False
+        try:
+            no_pump_value, best_value, best_plan = None, None, ()
+            targets = self._pump_targets(root, side, attacking, groups)
+            for plan, pumps, lands in self._pump_plans(side, root.pumps[side], root.lands[side], targets):
+                self._count(1)
+                new_pumps = _replace(root.pumps, side, pumps)
+                new_lands = _replace(root.lands, side, lands)
+                if side == 0:
+                    value = self._pump_layer(root, attacking, groups, 1, plan, new_lands, new_pumps, LOSS, WIN, 2)
+                else:
+                    value = self._resolve(root, attacking, groups, plan, new_lands, new_pumps, LOSS, WIN, 2)
+                value *= sign
+                if not plan:
+                    no_pump_value = value
+                if best_value is None or value > best_value:
+                    best_value, best_plan = value, plan
+            result.value = best_value
+            if best_value is not None and no_pump_value is not None and best_value > no_pump_value:
+                creatures = self.position.creatures
+                result.pumps = [(self.position.pumps[side][k], creatures[s][i]) for k, s, i in best_plan]
+            completed = True
+        except _BudgetExhausted:
+            pass
+        self.budget.finish(completed)
+        return result
+
+    # --- Suchbaum ------------------------------------------------------------------------
+
+    def _root_turn(self) -> _Turn:
+        position = self.position
+        return _Turn(attacker=0, life=position.life,
+                     alive=tuple(frozenset(range(len(side))) for side in position.creatures),
+                     untapped=tuple(frozenset(i for i, c in enumerate(side) if c.untapped) for side in position.creatures),
+                     lands=tuple(position.untapped_lands),
+                     pumps=tuple(tuple(range(len(side))) for side in position.pumps),
+                     phase=0, turns_left=self.horizon, first_strike_done=position.first_strike_done)
+
+    def _count(self, depth: int):
+        self.budget.count_node(depth)
+        if self.budget.exhausted():
+            raise _BudgetExhausted()
+
+    def _key(self, subset: Sequence[int]) -> Tuple:
+        return _attack_key(self._signatures[0][i] for i in subset)
+
+    def _win_for(self, side: int) -> int:
+        return WIN if side == 0 else LOSS
+
+    def _attack_subsets(self, st: _Turn, attackers: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+        """Alle Angriffe bis auf Symmetrie, größere Angriffe zuerst."""
+        signatures = self._signatures[st.attacker]
+        classes: Dict[Tuple, List[int]] = {}
+        for i in attackers:
+            classes.setdefault(signatures[i], []).append(i)
+        members = list(classes.values())
+        combos = itertools.product(*(range(len(m), -1, -1) for m in members))
+        subsets = [tuple(i for m, n in zip(members, counts) for i in m[:n]) for counts in combos]
+        power = self._stats[st.phase][st.attacker]
+        subsets.sort(key=lambda s: (-len(s), -sum(power[i][0] for i in s)))
+        return iter(subsets)
+
+    def _pump_bonus(self, pumps: Tuple[int, ...], lands: Tuple, side: int) -> int:
+        """Höchster Power-Bonus, den `side` mit den übrigen Pump-Zaubern und Ländern bezahlen kann."""
+        key = (side, pumps, lands)
+        if key not in self._pump_bonus_cache:
+            best = 0
+            for n in range(len(pumps), 0, -1):
+                for chosen in itertools.combinations(pumps, n):
+                    remaining = lands
+                    for k in chosen:
+                        remaining = self.position.pumps[side][k].pay(remaining)
+                        if remaining is None:
+                            break
+                    if remaining is not None:
+                        best = max(best, sum(self.position.pumps[side][k].power for k in chosen))
+            self._pump_bonus_cache[key] = best
+        return self._pump_bonus_cache[key]
+
+    def _max_damage(self, st: _Turn, attackers: Sequence[int]) -> int:
+        """Obere Schranke des Schadens, den der Angreifer dem Verteidiger in diesem Kampf zufügen kann."""
+        a = st.attacker
+        creatures, stats = self.position.creatures[a], self._stats[st.phase][a]
+        if not attackers:
+            return 0
+        damage = sum(max(stats[i][0], 0) * creatures[i].strikes for i in attackers)
+        return damage + self._pump_bonus(st.pumps[a], st.lands[a], a) * max(creatures[i].strikes for i in attackers)
+
+    def _attack(self, st: _Turn, alpha: int, beta: int, depth: int) -> int:
+        a, d = st.attacker, 1 - st.attacker
+        if st.turns_left <= 1:
+            # Im letzten Kampf kann nur noch der Angreifer gewinnen
+            if a == 0 and beta <= UNDECIDED:
+                return beta
+            if a == 1 and alpha >= UNDECIDED:
+                return alpha
+            # Im letzten Kampf gibt es nur zwei Werte, das Ergebnis ist hier also exakt
+            key = (a, st.life, st.alive, st.untapped, st.lands, st.pumps, st.phase)
+            if key not in self._last_turn_cache:
+                self._last_turn_cache[key] = self._search_attacks(st, alpha, beta, depth)
+            return self._last_turn_cache[key]
+        return self._search_attacks(st, alpha, beta, depth)
+
+    def _search_attacks(self, st: _Turn, alpha: int, beta: int, depth: int) -> int:
+        a, d = st.attacker, 1 - st.attacker
+        attackers = [i for i in sorted(st.alive[a]) if i in st.untapped[a]]
+        if self._max_damage(st, attackers) < st.life[d]:
+            # Der Angreifer kann in diesem Kampf nicht gewinnen, danach ist der Gegner am Zug
+            if st.turns_left <= 1:
+                return UNDECIDED
+            if a == 0 and alpha >= UNDECIDED:
+                return alpha
+            if a == 1 and beta <= UNDECIDED:
+                return beta
+        if st.turns_left <= 1 and not any(self.position.creatures[d][j].lifelink for j in st.alive[d]):
+            # Im letzten Kampf zählt nur der Sieg, dafür genügt der volle Angriff
+            subsets = iter([tuple(attackers)])
+        else:
+            subsets = self._attack_subsets(st, attackers)
+
+        maximizing = a == 0
+        best = LOSS - 1 if maximizing else WIN + 1
+        for subset in subsets:
+            self._count(depth)
+            value = self._blocks(st, subset, alpha, beta, depth + 1)
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+        return best
+
+    def _block_options(self, st: _Turn, attacking: Sequence[int]) -> Tuple[List[int], List[List[int]]]:
+        """Mögliche Blocker und je Blocker die blockbaren Angreifer (gefährlichste zuerst, -1 = nicht blocken)."""
+        a, d = st.attacker, 1 - st.attacker
+        stats = self._stats[st.phase][a]
+        creatures = self.position.creatures[a]
+        by_threat = sorted(attacking, key=lambda i: -max(stats[i][0], 0) * creatures[i].strikes)
+        blockers = sorted((j for j in st.alive[d] if j in st.untapped[d]), key=lambda j: self._signatures[d][j])
+        options = [[i for i in by_threat if self._legal[a][i][j]] + [-1] for j in blockers]
+        return blockers, options
+
+    def _block_assignments(self, st: _Turn, attacking: Sequence[int]) -> Iterator[Dict[int, Tuple[int, ...]]]:
+        """Alle legalen Blockzuweisungen (Menace beachtet), gleichwertige Blocker nur einmal."""
+        a, d = st.attacker, 1 - st.attacker
+        blockers, options = self._block_options(st, attacking)
+        signatures = self._signatures[d]
+        choice = [0] * len(blockers)
+
+        def assign(k: int):
+            if k == len(blockers):
+                groups = {i: [] for i in attacking}
+                for j, c in zip(blockers, choice):
+                    if options_for[j][c] >= 0:
+                        groups[options_for[j][c]].append(j)
+                if all(len(g) != 1 or not self.position.creatures[a][i].menace for i, g in groups.items()):
+                    yield {i: tuple(g) for i, g in groups.items()}
+                return
+            start = 0
+            if k > 0 and signatures[blockers[k]] == signatures[blockers[k - 1]]:
+                start = choice[k - 1]
+            for c in range(start, len(options[k])):
+                choice[k] = c
+                yield from assign(k + 1)
+
+        options_for = dict(zip(blockers, options))
+        return assign(0)
+
+    def _blocks(self, st: _Turn, attacking: Sequence[int], alpha: int, beta: int, depth: int) -> int:
+        a, d = st.attacker, 1 - st.attacker
+        if not attacking:
+            return self._next_or_undecided(st, attacking, (), st.lands, st.pumps, alpha, beta, depth)
+        maximizing = a == 1
+        best = LOSS - 1 if maximizing else WIN + 1
+        for groups in self._block_assignments(st, attacking):
+            self._count(depth)
+            value = self._after_blocks(st, attacking, groups, alpha, beta, depth + 1)
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+        return best
+
+    def _after_blocks(self, st: _Turn, attacking: Sequence[int], groups: Dict[int, Tuple[int, ...]],
+                      alpha: int, beta: int, depth: int) -> int:
+        a, d = st.attacker, 1 - st.attacker
+        unblocked = [i for i in attacking if not groups[i]]
+        blocking = [j for g in groups.values() for j in g]
+        if not any(self.position.creatures[d][j].lifelink for j in blocking):
+            # Ohne Lebensgewinn des Verteidigers entscheidet allein der ungeblockte Schaden
+            if unblocked and self._max_damage(st, unblocked) >= st.life[d]:
+                return self._win_for(a)
+        return self._pump_layer(st, attacking, groups, a, (), st.lands, st.pumps, alpha, beta, depth)
+
+    def _pump_targets(self, st: _Turn, side: int, attacking: Sequence[int], groups: Dict[int, Tuple[int, ...]]) -> List[Tuple[int, int]]:
+        """Sinnvolle Ziele für Pump-Zauber von `side`: eigene Kreaturen im Kampf, ungeblockte Angreifer zuerst."""
+        if side == st.attacker:
+            creatures = self.position.creatures[side]
+            ordered = sorted(attacking, key=lambda i: (bool(groups[i]), -creatures[i].strikes))
+            return [(side, i) for i in ordered]
+        return [(side, j) for i in attacking for j in groups[i]]
+
+    def _pump_plans(self, side: int, pumps: Tuple[int, ...], lands: Tuple, targets: List[Tuple[int, int]]):
+        """
+        Alle bezahlbaren Zuweisungen der Pump-Zauber von `side` an Ziele, größte Pläne zuerst.
+        Gleichnamige Zauber sind austauschbar (Ziele nicht absteigend, benutzte Zauber zuerst).
+        Liefert (Plan, übrige Zauber, übrige Länder); ein Plan ist ein Tupel (Zauber, Seite, Kreatur).
+        """
+        spells = self.position.pumps[side]
+        plans = []
+
+        def assign(k: int, plan: Tuple, remaining: Tuple, unused: Tuple, last: Dict[str, int]):
+            if k == len(pumps):
+                plans.append((plan, unused, remaining))
+                return
+            pump = spells[pumps[k]]
+            start = last.get(pump.name, 0)
+            for t in range(start, len(targets) + 1):
+                if t == len(targets):
+                    assign(k + 1, plan, remaining, unused + (pumps[k],), {**last, pump.name: t})
+                    continue
+                paid = pump.pay(remaining)
+                if paid is None:
+                    continue
+                target_side, target = targets[t]
+                assign(k + 1, plan + ((pumps[k], target_side, target),), paid, unused, {**last, pump.name: t})
+
+        if not targets:
+            return [((), pumps, lands)]
+        assign(0, (), lands, (), {})
+        plans.sort(key=lambda p: -len(p[0]))
+        return plans
+
+    def _pump_layer(self, st: _Turn, attacking: Sequence[int], groups: Dict[int, Tuple[int, ...]], side: int,
+                    bonus: Tuple, lands: Tuple, pumps: Tuple, alpha: int, beta: int, depth: int) -> int:
+        targets = self._pump_targets(st, side, attacking, groups)
+        maximizing = side == 0
+        best = LOSS - 1 if maximizing else WIN + 1
+        for plan, rest, remaining in self._pump_plans(side, pumps[side], lands[side], targets):
+            self._count(depth)
+            new_lands = _replace(lands, side, remaining)
+            new_pumps = _replace(pumps, side, rest)
+            if side == st.attacker:
+                value = self._pump_layer(st, attacking, groups, 1 - side, bonus + plan, new_lands, new_pumps,
+                                         alpha, beta, depth + 1)
+            else:
+                value = self._resolve(st, attacking, groups, bonus + plan, new_lands, new_pumps, alpha, beta, depth + 1)
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+        return best
+
+    def _fight(self, st: _Turn, attacking: Sequence[int], groups: Dict[int, Tuple[int, ...]],
+               bonus: Tuple) -> Tuple[List[int], set]:
+        """Verrechnet den Kampfschaden wie `GameState.assign_combat_damage`. Gibt (Leben, Tote) zurück."""
+        a, d = st.attacker, 1 - st.attacker
+        creatures = self.position.creatures
+        power, toughness, damage = {}, {}, {}
+        for i in attacking:
+            power[(a, i)], toughness[(a, i)] = self._stats[st.phase][a][i]
+            damage[(a, i)] = 0
+            for j in groups[i]:
+                power[(d, j)], toughness[(d, j)] = self._stats[st.phase][d][j]
+                damage[(d, j)] = 0
+        spells = self.position.pumps
+        for k, s, i in bonus:
+            owner = a if s == a else d
+            power[(s, i)] += spells[owner][k].power
+            toughness[(s, i)] += spells[owner][k].toughness
+
+        life = list(st.life)
+        dead = {key for key, t in toughness.items() if t <= 0}
+        for first_strike in (True, False):
+            if first_strike and st.first_strike_done:
+                continue
+            events = []
+            for i in attacking:
+                if (a, i) in dead:
+                    continue
+                attacker = creatures[a][i]
+                p = power[(a, i)]
+                if p <= 0 or not (attacker.first if first_strike else attacker.regular):
+                    pass
+                elif groups[i]:
+                    remaining = [j for j in groups[i] if (d, j) not in dead]
+                    for n, j in enumerate(remaining):
+                        if n == len(remaining) - 1:
+                            amount = p
+                        else:
+                            lethal = 1 if attacker.deathtouch else max(toughness[(d, j)] - damage[(d, j)], 0)
+                            amount = min(p, lethal)
+                        p -= amount
+                        if amount > 0:
+                            events.append((a, i, (d, j), amount))
+                else:
+                    events.append((a, i, None, p))
+                for j in groups[i]:
+                    blocker = creatures[d][j]
+                    if (d, j) in dead or power[(d, j)] <= 0 or not (blocker.first if first_strike else blocker.regular):
+                        continue
+                    events.append((d, j, (a, i), power[(d, j)]))
+
+            for s, i, target, amount in events:
+                source = creatures[s][i]
+                if target is None:
+                    life[d] -= amount
+                elif source.deathtouch:
+                    damage[target] += toughness[target]
+                else:
+                    damage[target] += amount
+                if source.lifelink:
+                    life[s] += amount
+            dead.update(key for key, dmg in damage.items() if dmg > 0 and dmg >= toughness[key])
+        return life, dead
+
+    def _resolve(self, st: _Turn, attacking: Sequence[int], groups: Dict[int, Tuple[int, ...]], bonus: Tuple,
+                 lands: Tuple, pumps: Tuple, alpha: int, beta: int, depth: int) -> int:
+        life, dead = self._fight(st, attacking, groups, bonus)
+        if life[1 - st.attacker] <= 0:
+            return self._win_for(st.attacker)
+        next_st = _Turn(st.attacker, tuple(life), st.alive, st.untapped, lands, pumps, st.phase, st.turns_left)
+        return self._next_or_undecided(next_st, attacking, dead, lands, pumps, alpha, beta, depth)
+
+    def _next_or_undecided(self, st: _Turn, attacking: Sequence[int], dead, lands: Tuple, pumps: Tuple,
+                           alpha: int, beta: int, depth: int) -> int:
+        """Beginnt den Kampf des nächsten Zuges oder bricht am Horizont ab."""
+        if st.turns_left <= 1:
+            return UNDECIDED
+        a, d = st.attacker, 1 - st.attacker
+        creatures = self.position.creatures[a]
+        alive = [side - {i for s, i in dead if s == n} for n, side in enumerate(st.alive)]
+        untapped = [None, None]
+        # Angreifer ohne Wachsamkeit bleiben im Zug des Gegners getappt
+        untapped[a] = frozenset(i for i in st.untapped[a] & alive[a] if i not in attacking or creatures[i].vigilance)
+        # Der neue aktive Spieler enttappt alles; seine Kreaturen sind nicht mehr neu im Spiel
+        untapped[d] = frozenset(alive[d])
+        new_lands = _replace(lands, d, self.position.all_lands[d])
+        next_st = _Turn(d, st.life, tuple(alive), tuple(untapped), new_lands, pumps, 1, st.turns_left - 1)
+        return self._attack(next_st, alpha, beta, depth)
+
+
+def _replace(pair: Tuple, side: int, value) -> Tuple:
+    return (value, pair[1]) if side == 0 else (pair[0], value)
+
+
+def solver_budget(time_limit: Optional[float], cancel: Optional[threading.Event] = None) -> SearchBudget:
+    """Budget des Solvers als Anteil der Entscheidungszeit, begrenzt durch `SOLVER_MAX_NODES`."""
+    # Der Solver arbeitet auf Tupeln ohne Referenzzyklen, die GC muss nicht pausieren
+    return SearchBudget(time_limit=time_limit * SOLVER_TIME_SHARE if time_limit is not None else None,
+                        max_nodes=SOLVER_MAX_NODES, pause_gc=False, cancel=cancel)
+
+
+def find_lethal_attack(game: 'GameState', player_id: int, budget: Optional[SearchBudget] = None,
+                       exact: bool = False) -> LethalResult:
+    """
+    Prüft für den aktiven Spieler `player_id`, ob ein Angriff den Sieg erzwingt, ohne die Hand
+    des Gegners zu kennen. Mit `exact` werden außerdem Angriffe markiert, nach denen der
+    Gegner im nächsten Zug tödlich ist.
+    """
+    if game.active_player.player_id != player_id:
+        raise ValueError("Angriffe können nur für den aktiven Spieler gelöst werden.")
+    solver = LethalSolver(CombatPosition.from_game(game, player_id), budget)
+    result = solver.solve_attack(exact)
+    logging.info(f"Lethal-Solver (Angriff, Spieler {player_id}): {result}")
+    return result
+
+
+def find_combat_pumps(game: 'GameState', player_id: int, budget: Optional[SearchBudget] = None) -> LethalResult:
+    """Sucht Pump-Zauber, die den laufenden Kampf (nach der Blockerdeklaration) für `player_id` entscheiden."""
+    side = 0 if game.active_player.player_id == player_id else 1
+    solver = LethalSolver(CombatPosition.from_game(game, player_id), budget)
+    result = solver.solve_pumps(side)
+    logging.info(f"Lethal-Solver (Pumps, Spieler {player_id}): {result}, Plan: {result.pumps}")
+    return result
+
+
+# --- Benchmark ---------------------------------------------------------------------------
+
+_KEYWORD_POOL = [(), (), (), ('Flying',), ('Reach',), ('First strike',), ('Double strike',), ('Deathtouch',),
+                 ('Lifelink',), ('Menace',), ('Vigilance',), ('Flying', 'Lifelink')]
+_GIANT_GROWTH_COST = '{G}'
+
+
+def random_position(rng: random.Random, max_creatures: int = 5, max_pumps: int = 2, max_lands: int = 4) -> CombatPosition:
+    """Erzeugt eine zufällige Kampfposition (Benchmark-Korpus)."""
+    creatures, pumps, lands = [], [], []
+    for side in (0, 1):
+        side_creatures = []
+        for _ in range(rng.randint(0, max_creatures)):
+            power, toughness = rng.randint(0, 5), rng.randint(1, 5)
+            side_creatures.append(CombatCreature(power, toughness, rng.choice(_KEYWORD_POOL),
+                                                 untapped=rng.random() > 0.1, can_attack=rng.random() > 0.2))
+        creatures.append(side_creatures)
+        pumps.append([Pump("Giant Growth", _GIANT_GROWTH_COST) for _ in range(rng.randint(0, max_pumps))])
+        lands.append([frozenset('G')] * rng.randint(0, max_lands))
+    return CombatPosition([rng.randint(1, 20), rng.randint(1, 20)], creatures, pumps, lands)
+
+
+def benchmark_solver(num_positions: int = 1000, seed: int = 0, max_nodes: int = SOLVER_MAX_NODES,
+                     exact: bool = True) -> Dict[str, float]:
+    """
+    Löst einen Korpus zufälliger Kampfpositionen und berichtet bewiesene Ergebnisse,
+    durchsuchte Knoten und Laufzeit pro Position.
+    """
+    rng = random.Random(seed)
+    outcomes = {WIN: 0, LOSS: 0, UNDECIDED: 0, None: 0}
+    nodes, seconds = [], []
+    for _ in range(num_positions):
+        solver = LethalSolver(random_position(rng), SearchBudget(time_limit=None, max_nodes=max_nodes, pause_gc=False))
+        start = time.perf_counter()
+        result = solver.solve_attack(exact)
+        seconds.append(time.perf_counter() - start)
+        nodes.append(result.stats.nodes_searched)
+        outcomes[result.value] += 1
+
+    ms = np.array(seconds) * 1000.0
+    summary = {
+        'positions': num_positions, 'win': outcomes[WIN], 'loss': outcomes[LOSS],
+        'undecided': outcomes[UNDECIDED], 'unproven': outcomes[None],
+        'nodes_p50': float(np.percentile(nodes, 50)), 'nodes_p95': float(np.percentile(nodes, 95)),
+        'nodes_max': float(np.max(nodes)),
+        'ms_p50': float(np.percentile(ms, 50)), 'ms_p95': float(np.percentile(ms, 95)), 'ms_max': float(ms.max()),
+    }
+    logging.info(f"Lethal-Solver-Benchmark: {summary}")
+    return summary
@@ -1,11 +1,10 @@
 from enum import Enum, auto
 import logging
-from typing import TYPE_CHECKING # NEU: Import für Type-Checking
+from typing import Iterable, Optional, Set, TYPE_CHECKING # NEU: Import für Type-Checking
 
 # NEU: Dieser Block bricht den Import-Kreislauf
 if TYPE_CHECKING:
     from .game_state import GameState
-    from .effect_system import EffectDuration
 
 class TurnPhase(Enum):
     BEGINNING = auto()
@@ -29,41 +28,89 @@ class TurnStep(Enum):
     END_STEP = auto()
     CLEANUP = auto()
 
+# Reihenfolge der Schritte für einen kompletten Zug
+STEP_ORDER = [
+    TurnStep.UNTAP, TurnStep.UPKEEP, TurnStep.DRAW,
+    # Precombat Main Phase (implizit)
+    TurnStep.BEGIN_COMBAT, TurnStep.DECLARE_ATTACKERS, TurnStep.DECLARE_BLOCKERS,
+    TurnStep.FIRST_STRIKE_DAMAGE, # NEU
+    TurnStep.COMBAT_DAMAGE, TurnStep.END_OF_COMBAT,
+    # Postcombat Main Phase (implizit)
+    TurnStep.END_STEP, TurnStep.CLEANUP
+]
+
+# Vollständiger Zugablauf: Die Hauptphasen haben keine Schritte, in ihnen ist die Phase selbst
+# der aktuelle Schritt (Spieler handeln dort nur über Priorität)
+TURN_ORDER = []
+for _step in STEP_ORDER:
+    TURN_ORDER.append(_step)
+    if _step == TurnStep.DRAW:
+        TURN_ORDER.append(TurnPhase.PRECOMBAT_MAIN)
+    elif _step == TurnStep.END_OF_COMBAT:
+        TURN_ORDER.append(TurnPhase.POSTCOMBAT_MAIN)
+
+# Schritte, in denen standardmäßig immer Priorität vergeben wird (wie die Stopps in Arena).
+# Leer: Jeder Schritt, in dem kein Spieler etwas tun kann, wird automatisch übersprungen.
+DEFAULT_STOPS: Set[TurnStep] = set()
+
+# Oracle-Text, an dem ausgelöste Fähigkeiten eines Schritts erkannt werden (konservativ: jede
+# bleibende Karte mit passendem Text verhindert das automatische Passen in diesem Schritt)
+STEP_TRIGGER_TEXT = {
+    TurnStep.UNTAP: ('untap step',),
+    TurnStep.UPKEEP: ('upkeep',),
+    TurnStep.DRAW: ('draw step', 'whenever you draw', 'draws a card'),
+    TurnStep.BEGIN_COMBAT: ('beginning of combat',),
+    TurnStep.DECLARE_ATTACKERS: ('attacks',),
+    TurnStep.DECLARE_BLOCKERS: ('blocks', 'becomes blocked'),
+    TurnStep.FIRST_STRIKE_DAMAGE: ('combat damage', 'dealt damage', 'dies'),
+    TurnStep.COMBAT_DAMAGE: ('combat damage', 'dealt damage', 'dies'),
+    TurnStep.END_OF_COMBAT: ('end of combat',),
+    TurnStep.END_STEP: ('end step',),
+    TurnStep.CLEANUP: (),
+}
+
 class PhaseManager:
     """Steuert den Phasen- und Schrittablauf eines Spielzugs."""
-    def __init__(self, game_state: 'GameState'):
+    def __init__(self, game_state: 'GameState', stops: Optional[Iterable[TurnStep]] = None):
         self.game_state = game_state
         self.current_phase = TurnPhase.BEGINNING
         self.current_step = TurnStep.UNTAP
         # Definiert die Reihenfolge der Schritte für einen kompletten Zug
-        self.step_order = [
-            TurnStep.UNTAP, TurnStep.UPKEEP, TurnStep.DRAW,
-            # Precombat Main Phase (implizit)
-            TurnStep.BEGIN_COMBAT, TurnStep.DECLARE_ATTACKERS, TurnStep.DECLARE_BLOCKERS,
-            TurnStep.FIRST_STRIKE_DAMAGE, # NEU
-            TurnStep.COMBAT_DAMAGE, TurnStep.END_OF_COMBAT,
-            # Postcombat Main Phase (implizit)
-            TurnStep.END_STEP, TurnStep.CLEANUP
-        ]
+        self.step_order = list(TURN_ORDER)
         self.step_index = 0
+        # Stopps: In diesen Schritten wird nie automatisch gepasst (set(TURN_ORDER) = volle Kontrolle)
+        self.stops: Set[TurnStep] = set(DEFAULT_STOPS if stops is None else stops)
 
     def advance_to_next_step(self):
-        """Schaltet zum nächsten Schritt im Zug weiter und führt die Aktionen aus."""
-        # Aktionen des aktuellen Schritts ausführen
-        self.execute_current_step_actions()
-
-        # Zum nächsten Schritt wechseln
+        """
+        Schaltet zum nächsten Schritt im Zug weiter. Die Aktionen des neuen Schritts führt die
+        Spielschleife zu dessen Beginn aus (`execute_current_step_actions`), nicht diese Methode.
+        """
         self.step_index += 1
         if self.step_index >= len(self.step_order):
             self.end_turn()
         else:
             self.current_step = self.step_order[self.step_index]
             # Phasen-Update für die Logik
-            if self.current_step == TurnStep.BEGIN_COMBAT:
+            if isinstance(self.current_step, TurnPhase):
+                self.current_phase = self.current_step
+            elif self.current_step == TurnStep.BEGIN_COMBAT:
                 self.current_phase = TurnPhase.COMBAT
             elif self.current_step == TurnStep.END_STEP:
                 self.current_phase = TurnPhase.ENDING
 
+    def has_step_triggers(self) -> bool:
+        """Prüft konservativ, ob im aktuellen Schritt eine ausgelöste Fähigkeit anfallen könnte."""
+        phrases = STEP_TRIGGER_TEXT.get(self.current_step, ())
+        if not phrases:
+            return False
+        for player in self.game_state.players:
+            for permanent in player.battlefield:
+                text = permanent.static_data.get('oracle_text', '').lower()
+                if text and any(phrase in text for phrase in phrases):
+                    return True
+        return False
+
     def execute_current_step_actions(self):
         """Führt automatische, regelbasierte Aktionen für den aktuellen Schritt aus."""
         active_player = self.game_state.active_player
@@ -94,6 +141,12 @@ class PhaseManager:
 
         elif self.current_step == TurnStep.COMBAT_DAMAGE:
             self.game_state.assign_combat_damage(first_strike=False)
+
+        elif self.current_step == TurnStep.END_OF_COMBAT:
+            # Angriffs- und Blockzuweisungen gelten nur für diesen Kampf
+            for p in self.game_state.players:
+                for permanent in p.battlefield:
+                    permanent.clear_combat_state()
             
         elif self.current_step == TurnStep.CLEANUP:
             # Reset "lands played" count for the active player
@@ -103,10 +156,9 @@ class PhaseManager:
             for p in self.game_state.players: # CORRECTED: was self.game
                 # Remove "until end of turn" effects
                 for permanent in p.battlefield:
-                    permanent.active_effects = [
-                        effect for effect in permanent.active_effects 
-                        if effect.duration != EffectDuration.END_OF_TURN
-                    ]
+                    permanent.remove_end_of_turn_effects()
+                    # Markierter Schaden wird im Cleanup-Schritt entfernt
+                    permanent.damage_marked = 0
                 # Reset mana pools
                 p.mana_pool = {k: 0 for k in p.mana_pool}
             
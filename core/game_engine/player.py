@@ -1,15 +1,32 @@
-from typing import List, Dict, Optional, TYPE_CHECKING
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 import logging
-import copy             # <-- HINZUGEFÜGT
-import itertools        # <-- HINZUGEFÜGT
+import itertools
+import threading
 from collections import defaultdict
 
+import numpy as np
+
+from .block_planner import plan_blocks, block_legality_matrix
+from .combat_evaluator import creature_arrays, resolve_combat
+from .determinization import DeterminizationSampler, DEFAULT_SEARCH_WORLDS
+from .evaluation import Evaluator, HeuristicEvaluator, feature_vector
+from .lethal_solver import (WIN, LOSS, UNDECIDED, PRE_COMBAT_STEPS, PUMP_STEPS, find_lethal_attack,
+                            find_combat_pumps, solver_budget)
+from .search_budget import SearchBudget, SearchStats, DEFAULT_DECISION_TIME_LIMIT
+from .stack_manager import PUMP_SPELLS
+
 if TYPE_CHECKING:
     from .card import Card
     from .game_state import GameState
 
+# A simple map for basic land types. This can be expanded.
+BASIC_LAND_COLORS = {'Forest': 'G', 'Island': 'U', 'Swamp': 'B', 'Mountain': 'R', 'Plains': 'W'}
+
 class Player:
     """Repräsentiert einen Spieler im Spiel."""
+    # Maximale Anzahl eigener Aktionen, die hintereinander simuliert werden
+    MAX_ACTION_DEPTH = 2
+
     def __init__(self, game: 'GameState', player_id: int):
         self.game = game
         self.player_id = player_id
@@ -27,6 +44,20 @@ class Player:
         
         self.lands_played_this_turn: int = 0
 
+        # Zeitbudget pro KI-Entscheidung und Statistiken der letzten Suche
+        self.decision_time_limit: Optional[float] = DEFAULT_DECISION_TIME_LIMIT
+        self.last_search_stats: Optional[SearchStats] = None
+        # Statistiken des letzten Lethal-Solver-Aufrufs (siehe `lethal_solver`)
+        self.last_solver_stats: Optional[SearchStats] = None
+        # Abbruchsignal für alle Suchen dieses Spielers (gesetzt, wenn die Entscheidung überholt ist)
+        self.cancel_event: Optional[threading.Event] = None
+        # Bewertungsfunktion der KI (austauschbar, z.B. gegen einen gelernten Evaluator aus ai_model)
+        self.evaluator: Evaluator = HeuristicEvaluator()
+        # Die Suche läuft auf determinisierten Welten statt auf dem echten Zustand (verdeckte
+        # Karten des Gegners sind unbekannt); Archetyp-Priors können dem Sampler übergeben werden
+        self.determinizer = DeterminizationSampler()
+        self.num_worlds: int = DEFAULT_SEARCH_WORLDS
+
     def draw_card(self) -> Optional['Card']:
         """Zieht die oberste Karte der Bibliothek und fügt sie der Hand hinzu."""
         if not self.library:
@@ -55,67 +86,217 @@ class Player:
 
         # 2. Zauber wirken
         for card in self.hand:
+            if card.is_land():
+                continue
             # Spontanzauber können immer gewirkt werden, andere Zauber nur in der eigenen Hauptphase bei leerem Stack.
             if "Instant" in card.static_data.get('type_line', '') or (is_our_turn and is_main_phase and stack_is_empty):
-                cost_dict = self._parse_cost_string(card.static_data.get('mana_cost', ''))
-                # Vereinfachte Prüfung, ob Mana potenziell verfügbar ist.
-                # Eine volle Prüfung würde alle Manaquellen berücksichtigen.
-                available_mana_sources = sum(1 for p in self.battlefield if p.is_land() and not p.is_tapped)
-                if available_mana_sources >= sum(cost_dict.values()):
-                     actions.append(f"cast_{card.name}")
+                if self.can_pay(self._parse_cost_string(card.static_data.get('mana_cost', ''))):
+                    actions.append(f"cast_{card.name}")
 
         # 3. Angreifen (wird durch PhaseManager ausgelöst, nicht als Aktion gewählt)
         # 4. Fähigkeiten aktivieren (TODO)
 
         return list(set(actions)) # Entferne Duplikate
 
-    def choose_action(self) -> str:
+    def has_priority_action(self) -> bool:
+        """
+        Schnelle Prüfung, ob `get_available_actions` eine Aktion außer Passen enthalten würde,
+        ohne die Aktionsliste aufzubauen. Muss dieselben Bedingungen verwenden, damit das
+        automatische Passen (`GameState.can_auto_pass`) keine legale Aktion überspringt.
+        """
+        if not self.hand:
+            return False
+        is_our_turn = self.game.active_player.player_id == self.player_id
+        sorcery_speed = (is_our_turn and "MAIN" in self.game.phase_manager.current_phase.name
+                         and self.game.stack_manager.is_empty())
+        if sorcery_speed and self.lands_played_this_turn == 0 and any(card.is_land() for card in self.hand):
+            return True
+
+        for card in self.hand:
+            if card.is_land():
+                continue
+            if sorcery_speed or "Instant" in card.static_data.get('type_line', ''):
+                if self.can_pay(self._parse_cost_string(card.static_data.get('mana_cost', ''))):
+                    return True
+        return False
+
+    def can_pay(self, cost_dict: Dict[str, int]) -> bool:
+        """
+        Prüft, ob `tap_for_cost` die Kosten mit den ungetappten Ländern bezahlen kann: jedes Land
+        gibt genau eine Farbe (`BASIC_LAND_COLORS`, sonst farblos), farbige Kosten brauchen
+        passende Länder, der Rest wird von beliebigen Ländern bezahlt.
+        """
+        untapped_lands = [p for p in self.battlefield if p.is_land() and not p.is_tapped]
+        if len(untapped_lands) < sum(cost_dict.values()):
+            return False
+        for color, amount in cost_dict.items():
+            if color != 'generic' and sum(1 for land in untapped_lands if BASIC_LAND_COLORS.get(land.name) == color) < amount:
+                return False
+        return True
+
+    def choose_action(self, budget: Optional[SearchBudget] = None) -> str:
         """
         Die KI wählt die beste Aktion durch Simulation und Bewertung aller Möglichkeiten.
+        Die Suche ist iterativ vertiefend und anytime: Nach Tiefe 1 steht immer eine
+        beste Aktion fest, tiefere Iterationen (Folgeaktionen) laufen nur, solange
+        das Budget es erlaubt.
         """
         available_actions = self.get_available_actions()
         if len(available_actions) == 1 and available_actions[0] == "pass_priority":
             return "pass_priority"
 
-        best_action = "pass_priority"
-        # Der Basis-Score ist der Zustand, wenn wir einfach passen.
-        best_score = self.evaluate_state()
-        logging.info(f"KI Spieler {self.player_id} analysiert Aktionen... Basis-Score: {best_score:.2f}")
+        proven_action = self._proven_combat_action(available_actions)
+        if proven_action is not None:
+            return proven_action
+
+        with (budget or SearchBudget(self.decision_time_limit, cancel=self.cancel_event)) as budget:
+            best_action = "pass_priority"
+            # Dieselben Welten für alle Aktionen, Tiefen und das Passen (gemeinsame Zufallszahlen)
+            worlds = self.determinizer.worlds(self.game, self.player_id, self.num_worlds)
+            # Der Basis-Score ist der Zustand, wenn wir einfach passen, gemittelt über dieselben Welten.
+            base_score = float(np.mean(self.evaluator.evaluate_batch(worlds, self.player_id)))
+            best_score = base_score
+            logging.info(f"KI Spieler {self.player_id} analysiert Aktionen... Basis-Score: {best_score:.2f}")
+
+            candidate_actions = self._order_actions(a for a in available_actions if a != "pass_priority")
+            completed = True
+
+            for depth in range(1, self.MAX_ACTION_DEPTH + 1):
+                depth_best_action = "pass_priority"
+                depth_best_score = base_score
+                for action in candidate_actions:
+                    world_scores = []
+                    for world in worlds:
+                        if budget.exhausted():
+                            break
+                        score, searched = self._search_action(world, action, depth, budget)
+                        if not searched:
+                            # Abgeschnittene Suche: das Teilmaximum zählt nicht als vollständige Tiefe
+                            break
+                        world_scores.append(score)
+                    if len(world_scores) < len(worlds):
+                        completed = False
+                        break
+                    current_score = float(np.mean(world_scores))
+                    logging.info(f"  Aktion '{action}' (Tiefe {depth}) -> Sim-Score: {current_score:.2f}")
+                    if current_score > depth_best_score:
+                        depth_best_score = current_score
+                        depth_best_action = action
+                else:
+                    # Nur vollständig durchsuchte Tiefen ersetzen das bisher beste Ergebnis.
+                    best_action, best_score = depth_best_action, depth_best_score
+                    # Zuerst das bisher beste Ergebnis prüfen (Move Ordering für die nächste Tiefe)
+                    if best_action in candidate_actions:
+                        candidate_actions.remove(best_action)
+                        candidate_actions.insert(0, best_action)
+                    continue
+                # Budget erschöpft: Auf Tiefe 1 ist das Teilergebnis besser als gar keines.
+                if depth == 1:
+                    best_action, best_score = depth_best_action, depth_best_score
+                break
 
-        for action in available_actions:
-            if action == "pass_priority":
-                continue
+            self.last_search_stats = budget.finish(completed)
+        logging.info(f"KI Spieler {self.player_id} wählt beste Aktion: '{best_action}' (Score: {best_score:.2f}, {self.last_search_stats})")
+        return best_action
 
-            # Simuliere die Ausführung der Aktion
-            sim_game = copy.deepcopy(self.game)
-            sim_player = sim_game.get_player(self.player_id)
-            
-            # Führe die Aktion in der Simulation aus
+    def _proven_combat_action(self, available_actions: List[str]) -> Optional[str]:
+        """
+        Kurzschluss über den Lethal-Solver: Ist vor dem eigenen Angriff ein Sieg bewiesen, wird
+        gepasst, damit das Mana für Pump-Zauber frei bleibt. Nach der Blockerdeklaration wird ein
+        Pump-Zauber gewirkt, wenn er das bewiesene Ergebnis des Kampfes verbessert.
+        Gibt None zurück, wenn nichts bewiesen ist (dann entscheidet die heuristische Suche).
+        """
+        step = self.game.phase_manager.current_step
+        is_our_turn = self.game.active_player.player_id == self.player_id
+
+        if is_our_turn and step in PRE_COMBAT_STEPS and self.game.stack_manager.is_empty():
+            result = find_lethal_attack(self.game, self.player_id, solver_budget(self.decision_time_limit, self.cancel_event))
+            self.last_solver_stats = result.stats
+            if result.value == WIN:
+                logging.info(f"KI Spieler {self.player_id}: Tödlicher Angriff bewiesen, passe bis zum Kampf.")
+                return "pass_priority"
+
+        elif step in PUMP_STEPS and any(c.is_attacking for c in self.game.active_player.battlefield) \
+                and any(a.startswith("cast_") and a[len("cast_"):] in PUMP_SPELLS for a in available_actions):
+            result = find_combat_pumps(self.game, self.player_id, solver_budget(self.decision_time_limit, self.cancel_event))
+            self.last_solver_stats = result.stats
+            if result.pumps:
+                pump, target = result.pumps[0]
+                # Der Zauber wird als erster seines Namens auf der Hand gewirkt und trifft dieses Ziel
+                pump.card.target = target.card
+                logging.info(f"KI Spieler {self.player_id}: '{pump.name}' auf '{target.card.name}' erzwingt das Kampfergebnis.")
+                return f"cast_{pump.name}"
+            if result.value == WIN:
+                return "pass_priority"
+        return None
+
+    def _order_actions(self, actions) -> List[str]:
+        """Sortiert Aktionen heuristisch, damit bei knappem Budget die vielversprechendsten zuerst simuliert werden."""
+        def priority(action: str):
             if action.startswith("play_land_"):
-                card_name = action.replace("play_land_", "")
-                card_to_play = next((c for c in sim_player.hand if c.name == card_name), None)
-                if card_to_play:
-                    sim_player.play_land(card_to_play)
-
-            elif action.startswith("cast_"):
-                card_name = action.replace("cast_", "")
-                card_to_cast = next((c for c in sim_player.hand if c.name == card_name), None)
-                if card_to_cast:
-                    sim_player.cast_spell(card_to_cast)
-                    # In der Sim müssen wir den Stack manuell auflösen
-                    if not sim_game.stack_manager.is_empty():
-                        sim_game.stack_manager.resolve_top_item()
-
-            # Bewerte den resultierenden Zustand
-            current_score = sim_player.evaluate_state()
-            logging.info(f"  Aktion '{action}' -> Sim-Score: {current_score:.2f}")
-
-            if current_score > best_score:
-                best_score = current_score
-                best_action = action
-        
-        logging.info(f"KI Spieler {self.player_id} wählt beste Aktion: '{best_action}' (Score: {best_score:.2f})")
-        return best_action
+                return (0, 0)
+            card_name = action.replace("cast_", "")
+            card = next((c for c in self.hand if c.name == card_name), None)
+            cmc = card.static_data.get('cmc', 0) if card else 0
+            return (1, -cmc)
+        return sorted(actions, key=priority)
+
+    def _search_action(self, game: 'GameState', action: str, depth: int, budget: SearchBudget,
+                       ply: int = 1) -> Tuple[float, bool]:
+        """
+        Simuliert `action` und bewertet den besten Folgezustand bis zur gegebenen Tiefe.
+        Gibt (Score, vollständig) zurück; vollständig ist False, wenn das Budget während der
+        Suche nach Folgeaktionen erschöpft war und der Score nur ein Teilmaximum ist.
+        """
+        sim_game = self._simulate_action(game, action)
+        budget.count_node(ply)
+        if depth <= 1:
+            return self.evaluator.evaluate(sim_game, self.player_id), True
+
+        sim_player = sim_game.get_player(self.player_id)
+        follow_ups = sim_player._order_actions(a for a in sim_player.get_available_actions() if a != "pass_priority")
+        if depth == 2:
+            # Blattzustände sammeln und in einem Stapel bewerten (lohnt sich für gelernte Evaluatoren)
+            leaves = [sim_game]
+            for follow_up in follow_ups:
+                if budget.exhausted():
+                    break
+                leaves.append(self._simulate_action(sim_game, follow_up))
+                budget.count_node(ply + 1)
+            return float(np.max(self.evaluator.evaluate_batch(leaves, self.player_id))), len(leaves) == len(follow_ups) + 1
+
+        best_score = self.evaluator.evaluate(sim_game, self.player_id)
+        for follow_up in follow_ups:
+            if budget.exhausted():
+                return best_score, False
+            score, searched = self._search_action(sim_game, follow_up, depth - 1, budget, ply + 1)
+            best_score = max(best_score, score)
+            if not searched:
+                return best_score, False
+        return best_score, True
+
+    def _simulate_action(self, game: 'GameState', action: str) -> 'GameState':
+        """Gibt eine Kopie von `game` zurück, in der dieser Spieler `action` ausgeführt hat."""
+        sim_game = game.clone()
+        sim_game.get_player(self.player_id)._apply_simulated_action(action)
+        return sim_game
+
+    def _apply_simulated_action(self, action: str):
+        """Führt eine Aktion in einer Simulation aus, inklusive sofortiger Verrechnung des Stapels."""
+        if action.startswith("play_land_"):
+            card_name = action.replace("play_land_", "")
+            card_to_play = next((c for c in self.hand if c.name == card_name), None)
+            if card_to_play:
+                self.play_land(card_to_play)
+
+        elif action.startswith("cast_"):
+            card_name = action.replace("cast_", "")
+            card_to_cast = next((c for c in self.hand if c.name == card_name), None)
+            if card_to_cast:
+                self.cast_spell(card_to_cast)
+                # In der Sim müssen wir den Stack manuell auflösen
+                if not self.game.stack_manager.is_empty():
+                    self.game.stack_manager.resolve_top_item()
 
     def play_land(self, card_in_hand: 'Card') -> bool:
         """Versucht, eine Landkarte von der Hand auf das Schlachtfeld zu spielen."""
@@ -129,12 +310,23 @@ class Player:
 
         # Bewege die Karte von der Hand auf das Schlachtfeld
         self.hand.remove(card_in_hand)
-        self.battlefield.append(card_in_hand)
+        self.put_onto_battlefield(card_in_hand)
         self.lands_played_this_turn += 1
         
         logging.info(f"Spieler {self.player_id} spielt {card_in_hand.name}.")
         return True
 
+    def put_onto_battlefield(self, card: 'Card'):
+        """Legt eine Karte auf das Schlachtfeld und verbucht sie in der inkrementellen Bewertung."""
+        self.battlefield.append(card)
+        self.game.board_features.on_enter_battlefield(card)
+
+    def remove_from_battlefield(self, card: 'Card', destination: List['Card']):
+        """Bewegt eine Karte vom Schlachtfeld in eine andere Zone (z.B. den Friedhof)."""
+        self.battlefield.remove(card)
+        destination.append(card)
+        self.game.board_features.on_leave_battlefield(card)
+
     def _parse_cost_string(self, cost_string: str) -> Dict[str, int]:
         """A helper function to parse mana cost strings like '{2}{W}{U}' into a dictionary."""
         cost = defaultdict(int)
@@ -156,8 +348,7 @@ class Player:
         Returns a list of the lands that were tapped.
         """
         tapped_lands = []
-        # A simple map for basic land types. This can be expanded.
-        color_map = {'Forest': 'G', 'Island': 'U', 'Swamp': 'B', 'Mountain': 'R', 'Plains': 'W'}
+        color_map = BASIC_LAND_COLORS
         
         untapped_lands = [p for p in self.battlefield if p.is_land() and not p.is_tapped]
         
@@ -204,11 +395,12 @@ class Player:
 
         cost_dict = self._parse_cost_string(cost_string)
         
-        # Step 1: Tap lands and fill the mana pool.
+        # Step 1: Tap lands and fill the mana pool (the backup is taken before tapping,
+        # so a failed payment doesn't leave the tapped mana floating in the pool).
+        mana_pool_backup = self.mana_pool.copy()
         tapped_lands = self.tap_for_cost(cost_dict)
 
         # Step 2: Try to pay the cost from the pool.
-        mana_pool_backup = self.mana_pool.copy()
         
         # Pay colored costs
         for color, amount in cost_dict.items():
@@ -242,10 +434,12 @@ class Player:
         return True
 
 
-    def declare_attackers(self):
+    def declare_attackers(self, budget: Optional[SearchBudget] = None):
         """
         KI-Logik: Findet die optimale Kombination von Angreifern durch Simulation
         aller möglichen Angriffsszenarien.
+        Die Kombinationen werden nach Größe aufsteigend durchsucht (iterative Vertiefung);
+        ist das Budget erschöpft, wird der bisher beste Angriff gewählt.
         """
         potential_attackers = [
             c for c in self.battlefield 
@@ -254,142 +448,127 @@ class Player:
             and (not c.summoning_sick or c.has_keyword('Haste'))
         ]
         
-        best_attack_combination = []
-        best_score = self.evaluate_state() 
-        logging.info(f"KI-Angriffsanalyse: Basis-Score (kein Angriff) = {best_score:.2f}")
-
-        # Iteriere durch alle möglichen Kombinationen von Angreifern
-        for i in range(1, len(potential_attackers) + 1):
-            for combo in itertools.combinations(potential_attackers, i):
-                sim_game = copy.deepcopy(self.game)
-                sim_player = sim_game.get_player(self.player_id)
-                
-                sim_combo_ids = [card.static_data['oracle_id'] for card in combo]
-                sim_attackers = [c for c in sim_player.battlefield if c.static_data['oracle_id'] in sim_combo_ids]
-                
-                for attacker in sim_attackers:
-                    attacker.is_attacking = True
-                
-                sim_opponent = sim_game.get_player(1 - self.player_id)
-                sim_opponent.declare_blockers()
-                # Für eine korrekte Simulation müssen beide Schadenssegmente durchlaufen werden
-                sim_game.assign_combat_damage(first_strike=True)
-                sim_game.check_state_based_actions()
-                sim_game.assign_combat_damage(first_strike=False)
-                sim_game.check_state_based_actions()
-
-                current_score = sim_player.evaluate_state()
-
-                if current_score > best_score:
-                    best_score = current_score
-                    best_attack_combination = combo
+        # Zuerst exakt lösen: bewiesener Sieg, und welche Angriffe den Gegenangriff tödlich machen
+        solved = find_lethal_attack(self.game, self.player_id, solver_budget(self.decision_time_limit, self.cancel_event), exact=True)
+        self.last_solver_stats = solved.stats
+        if solved.value == WIN:
+            logging.info(f"Entscheidung: Tödlicher Angriff bewiesen ({solved.stats}). Greife an mit: {[c.name for c in solved.attack]}")
+            self._attack_with(solved.attack)
+            return
+        # Bewiesen verlierende Angriffe werden gemieden, sofern es einen bewiesen sicheren gibt
+        avoid_losing = any(value == UNDECIDED for value in solved.attack_values.values())
+
+        if budget is None and self.decision_time_limit is not None:
+            budget = SearchBudget(max(self.decision_time_limit - solved.stats.elapsed, 0.0), cancel=self.cancel_event)
+        with (budget or SearchBudget(self.decision_time_limit, cancel=self.cancel_event)) as budget:
+            completed = True
+
+            best_attack_combination = []
+            best_score = self.evaluate_state() 
+            if avoid_losing and solved.attack_value([]) == LOSS:
+                best_score = -np.inf
+            logging.info(f"KI-Angriffsanalyse: Basis-Score (kein Angriff) = {best_score:.2f}")
+
+            opponent = self.game.get_player(1 - self.player_id)
+            potential_blockers = [
+                c for c in opponent.battlefield
+                if 'Creature' in c.static_data.get('type_line', '') and not c.is_tapped and c.blocking is None
+            ]
+            blocker_index = {id(b): j for j, b in enumerate(potential_blockers)}
+            # Kampfwerte und Blocklegalität einmal packen, statt das Spiel pro Kombination zu kopieren
+            att = creature_arrays(potential_attackers)
+            blk = creature_arrays(potential_blockers)
+            legal = block_legality_matrix(potential_attackers, potential_blockers)
+            base_features = feature_vector(self.game, self.player_id)
+
+            # Iteriere durch alle möglichen Kombinationen von Angreifern
+            for i in range(1, len(potential_attackers) + 1):
+                combos, attack_masks, blocks, block_ranks = [], [], [], []
+                for combo in itertools.combinations(range(len(potential_attackers)), i):
+                    if budget.exhausted():
+                        completed = False
+                        break
+                    budget.count_node(i)
+                    if avoid_losing and solved.attack_value([potential_attackers[a] for a in combo]) == LOSS:
+                        continue
+
+                    # Antwort des Gegners mit derselben Blocklogik wie `declare_blockers`
+                    combo = list(combo)
+                    block_plan = plan_blocks([potential_attackers[a] for a in combo], potential_blockers, opponent.life, legal[combo])
+                    attack_mask = np.zeros(len(potential_attackers), dtype=bool)
+                    attack_mask[combo] = True
+                    block_row = np.full(len(potential_blockers), -1, dtype=np.int64)
+                    rank_row = np.zeros(len(potential_blockers))
+                    for a, group in zip(combo, block_plan):
+                        for rank, blocker in enumerate(group):
+                            block_row[blocker_index[id(blocker)]] = a
+                            rank_row[blocker_index[id(blocker)]] = rank
+
+                    combos.append(combo)
+                    attack_masks.append(attack_mask)
+                    blocks.append(block_row)
+                    block_ranks.append(rank_row)
+
+                if combos:
+                    # Alle Kombinationen dieser Größe in einem vektorisierten Durchlauf bewerten
+                    outcome = resolve_combat(att, blk, np.array(attack_masks), np.array(blocks), np.array(block_ranks))
+                    scores = self.evaluator.evaluate_features(base_features + outcome.feature_deltas(att, blk))
+                    k = int(np.argmax(scores))
+                    if scores[k] > best_score:
+                        best_score = float(scores[k])
+                        best_attack_combination = [potential_attackers[a] for a in combos[k]]
+                if not completed:
+                    break
+
+            self.last_search_stats = budget.finish(completed)
+        logging.info(f"KI-Angriffsanalyse beendet: {self.last_search_stats}")
         
         if best_attack_combination:
             logging.info(f"Entscheidung: Optimaler Angriff gefunden mit Score {best_score:.2f}. Greife an mit: {[c.name for c in best_attack_combination]}")
-            for attacker_card in best_attack_combination:
-                real_attacker = next(c for c in self.battlefield if c.static_data['oracle_id'] == attacker_card.static_data['oracle_id'])
-                real_attacker.is_attacking = True
-                # KORRIGIERT: Vigilance-Logik. Kreaturen tappen nur, wenn sie KEINE Vigilance haben.
-                if not real_attacker.has_keyword('Vigilance'):
-                    real_attacker.is_tapped = True
+            self._attack_with(best_attack_combination)
         else:
             logging.info("Entscheidung: Kein vorteilhafter Angriff gefunden.")
 
+    def _attack_with(self, attackers: List['Card']):
+        """Deklariert die gegebenen Kreaturen als Angreifer."""
+        for attacker in attackers:
+            attacker.is_attacking = True
+            # KORRIGIERT: Vigilance-Logik. Kreaturen tappen nur, wenn sie KEINE Vigilance haben.
+            if not attacker.has_keyword('Vigilance'):
+                attacker.is_tapped = True
+
 
     def declare_blockers(self):
         """
-        KI-Logik: Findet die beste Verteidigung durch eine wertorientierte Zuweisung
-        von Blockern zu Angreifern, unter Berücksichtigung von Flying und Fear.
+        KI-Logik: Findet die beste Verteidigung durch eine optimale, wertorientierte
+        Zuweisung von Blockern zu Angreifern (siehe `block_planner`), unter
+        Berücksichtigung von Ausweichfähigkeiten, Mehrfach- und Chump-Blocks.
         """
         attackers = [c for c in self.game.active_player.battlefield if c.is_attacking]
-        potential_blockers = [c for c in self.battlefield if 'Creature' in c.static_data.get('type_line', '') and not c.is_tapped]
+        potential_blockers = [
+            c for c in self.battlefield
+            if 'Creature' in c.static_data.get('type_line', '') and not c.is_tapped and c.blocking is None
+        ]
         
         if not attackers or not potential_blockers:
             return
 
-        for attacker in attackers:
-            best_blocker_for_this_attacker = None
-            best_trade_value = -int(attacker.power)
-
-            # HINZUGEFÜGT: Filtere Blocker basierend auf den Fähigkeiten des Angreifers
-            valid_blockers = []
-            for blocker in potential_blockers:
-                # Prüfe, ob dieser Blocker bereits einem anderen Angreifer zugewiesen wurde
-                if hasattr(blocker, 'is_blocking') and blocker.is_blocking:
-                    continue
-
-                can_block = True
-                # Flying Check: Kann nur von Flying oder Reach geblockt werden.
-                if attacker.has_keyword('Flying') and not blocker.has_keyword('Flying') and not blocker.has_keyword('Reach'):
-                    can_block = False
-                # Fear Check: Kann nicht von nicht-schwarzen, nicht-Artefakt Kreaturen geblockt werden.
-                if attacker.has_keyword('Fear'):
-                    is_black = 'B' in blocker.static_data.get('color_identity', [])
-                    is_artifact = 'Artifact' in blocker.static_data.get('type_line', '')
-                    if not is_black and not is_artifact:
-                        can_block = False
-                
-                if can_block:
-                    valid_blockers.append(blocker)
-
-            # Führe die Trade-Bewertung nur für valide Blocker durch
-            for blocker in valid_blockers:
-                attacker_power = attacker.power
-                attacker_toughness = attacker.toughness
-                blocker_power = blocker.power
-                blocker_toughness = blocker.toughness
-
-                attacker_dies = blocker_power >= attacker_toughness
-                blocker_dies = attacker_power >= blocker_toughness
-
-                attacker_value = attacker_power + attacker_toughness
-                blocker_value = blocker_power + blocker_toughness
-
-                trade_value = 0
-                if attacker_dies: trade_value += attacker_value
-                if blocker_dies: trade_value -= blocker_value
-                
-                if trade_value > best_trade_value:
-                    best_trade_value = trade_value
-                    best_blocker_for_this_attacker = blocker
-
-            if best_blocker_for_this_attacker:
-                logging.info(f"KI-Block-Analyse: Bester Block für '{attacker.name}' ist '{best_blocker_for_this_attacker.name}' (Trade-Wert: {best_trade_value}).")
-                attacker.blocker = best_blocker_for_this_attacker
-                best_blocker_for_this_attacker.is_blocking = True # Markiere als verwendet für diesen Kampf
+        block_plan = plan_blocks(attackers, potential_blockers, self.life)
+        for attacker, blockers in zip(attackers, block_plan):
+            if not blockers:
+                continue
+            logging.info(f"KI-Block-Analyse: '{attacker.name}' wird geblockt von {[b.name for b in blockers]}.")
+            for blocker in blockers:
+                attacker.blockers.append(blocker)
+                blocker.blocking = attacker
 
     def evaluate_state(self) -> float:
         """
         Berechnet einen Score für den aktuellen Spielzustand aus Sicht dieses Spielers.
-        Dies ist eine einfache, heuristische Bewertungsfunktion.
+        Mit dem heuristischen Evaluator ist das dank der inkrementell gepflegten
+        `BoardFeatures` eine O(1)-Abfrage.
         """
-        score = 0.0
-        opponent = self.game.get_player(1 - self.player_id)
-
-        # 1. Lebenspunkte sind der wichtigste Faktor
-        score += self.life * 1.5
-        score -= opponent.life * 1.5
-
-        # 2. Kreaturen auf dem Schlachtfeld (Board Presence)
-        for creature in self.battlefield:
-            if 'Creature' in creature.static_data.get('type_line', ''):
-                # Wert einer Kreatur = Power + Toughness
-                score += int(creature.static_data.get('power', 0))
-                score += creature.toughness
-
-        for creature in opponent.battlefield:
-             if 'Creature' in creature.static_data.get('type_line', ''):
-                score -= int(creature.static_data.get('power', 0))
-                score -= creature.toughness
-        
-        # 3. Karten auf der Hand (Card Advantage)
-        score += len(self.hand) * 0.5
-        score -= len(opponent.hand) * 0.5
-
-        return score
-
-
-    
+        return self.evaluator.evaluate(self.game, self.player_id)
 
 
     def __repr__(self) -> str:
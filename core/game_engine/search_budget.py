@@ -0,0 +1,124 @@
+import gc
+import threading
+import time
+from typing import Optional
+
+# Standardbudget für eine einzelne KI-Entscheidung gegen die Arena-Uhr.
+DEFAULT_DECISION_TIME_LIMIT = 1.0
+# Glättung der Schätzung, wie lange das Aufräumen nach einer Suche pro neuem Objekt dauert
+GC_ESTIMATE_SMOOTHING = 0.2
+
+# Gleitender Mittelwert der Aufräumzeit pro neuem Objekt über alle bisherigen Suchen des Prozesses
+_gc_seconds_per_object: float = 0.0
+
+
+def gc_cleanup_estimate(young_objects: int) -> float:
+    """Geschätzte Dauer von `gc.collect(0)` bei `young_objects` neuen GC-Objekten."""
+    return young_objects * _gc_seconds_per_object
+
+
+def calibrate_gc_cleanup(young_objects: int, seconds: float):
+    """Verrechnet eine gemessene Aufräumzeit in die Schätzung pro Objekt."""
+    global _gc_seconds_per_object
+    if not young_objects:
+        return
+    per_object = seconds / young_objects
+    if _gc_seconds_per_object == 0.0:
+        _gc_seconds_per_object = per_object
+    else:
+        _gc_seconds_per_object += GC_ESTIMATE_SMOOTHING * (per_object - _gc_seconds_per_object)
+
+
+class SearchStats:
+    """Statistiken darüber, wie viel eine Suche innerhalb ihres Budgets erkundet hat."""
+    def __init__(self):
+        self.nodes_searched: int = 0
+        self.depth_reached: int = 0
+        self.elapsed: float = 0.0
+        self.completed: bool = False
+
+    def __repr__(self) -> str:
+        return (f"SearchStats(nodes={self.nodes_searched}, depth={self.depth_reached}, "
+                f"elapsed={self.elapsed * 1000:.1f}ms, completed={self.completed})")
+
+
+class SearchBudget:
+    """
+    Zeit- und/oder Knotenbudget für eine anytime-Suche.
+    Die Suche fragt vor jedem Knoten `exhausted()` ab und liefert dann ihr
+    bisher bestes Ergebnis zurück.
+    Zwischen `start()` und `finish()` ist die zyklische Garbage Collection pausiert: Die
+    Simulationskopien erzeugen viele Referenzzyklen, und ein GC-Lauf mitten in der Suche
+    (10-15 ms) würde die Deadline reißen. `finish()` räumt die junge Generation gezielt
+    auf; die dafür geschätzte Zeit (proportional zur Zahl neuer GC-Objekte) wird vom
+    Zeitbudget vorab abgezogen, sodass auch das Aufräumen innerhalb der Deadline liegt.
+    Als Kontextmanager (`with budget:`) wird die GC auch dann wieder eingeschaltet, wenn
+    die Suche mit einer Ausnahme abbricht.
+    """
+
+    def __init__(self, time_limit: Optional[float] = DEFAULT_DECISION_TIME_LIMIT, max_nodes: Optional[int] = None,
+                 pause_gc: bool = True, cancel: Optional[threading.Event] = None):
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.pause_gc = pause_gc
+        # Von außen gesetzt, wenn das Ergebnis nicht mehr gebraucht wird (z.B. überholte Live-Entscheidung)
+        self.cancel = cancel
+        self.stats = SearchStats()
+        self._start: float = 0.0
+        self._deadline: Optional[float] = None
+        self._resume_gc = False
+
+    @classmethod
+    def unlimited(cls) -> 'SearchBudget':
+        """Ein Budget ohne Zeit- und Knotenlimit (vollständige Suche)."""
+        return cls(time_limit=None, max_nodes=None)
+
+    def start(self) -> 'SearchBudget':
+        """Startet die Uhr und setzt die Statistiken zurück."""
+        self.stats = SearchStats()
+        self._start = time.perf_counter()
+        self._deadline = self._start + self.time_limit if self.time_limit is not None else None
+        # Verschachtelte Budgets: nur das äußerste schaltet die GC wieder ein
+        if self.pause_gc and gc.isenabled():
+            gc.disable()
+            self._resume_gc = True
+        return self
+
+    def __enter__(self) -> 'SearchBudget':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        # Ohne `finish()` beendet (Ausnahme): die GC darf nicht pausiert bleiben
+        if self._resume_gc:
+            self.finish(False)
+        return False
+
+    def exhausted(self) -> bool:
+        """Prüft, ob das Zeit- oder Knotenbudget aufgebraucht oder die Suche abgebrochen ist."""
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        if self.max_nodes is not None and self.stats.nodes_searched >= self.max_nodes:
+            return True
+        if self._deadline is None:
+            return False
+        cleanup = gc_cleanup_estimate(gc.get_count()[0]) if self._resume_gc else 0.0
+        return time.perf_counter() + cleanup >= self._deadline
+
+    def count_node(self, depth: int = 0):
+        """Verbucht einen durchsuchten Knoten."""
+        self.stats.nodes_searched += 1
+        if depth > self.stats.depth_reached:
+            self.stats.depth_reached = depth
+
+    def finish(self, completed: bool) -> SearchStats:
+        """Beendet die Suche, räumt die Simulationskopien auf und gibt die Statistiken zurück."""
+        if self._resume_gc:
+            self._resume_gc = False
+            gc.enable()
+            young_objects = gc.get_count()[0]
+            cleanup_start = time.perf_counter()
+            gc.collect(0)
+            calibrate_gc_cleanup(young_objects, time.perf_counter() - cleanup_start)
+        self.stats.elapsed = time.perf_counter() - self._start
+        self.stats.completed = completed
+        return self.stats
@@ -6,6 +6,9 @@ if TYPE_CHECKING:
     from .card import Card
     from .game_state import GameState
 
+# Pump-Zauber mit ihrem Power/Toughness-Bonus bis zum Ende des Zuges
+PUMP_SPELLS = {"Giant Growth": (3, 3)}
+
 class StackManager:
     """Verwaltet den Stapel (Stack)."""
     def __init__(self, game_state: 'GameState'):
@@ -24,12 +27,13 @@ class StackManager:
         
         spell = self.stack.pop()
         
-        # Harcoded-Logik für Giant Growth
-        if spell.name == "Giant Growth":
+        # Harcoded-Logik für Pump-Zauber wie Giant Growth
+        if spell.name in PUMP_SPELLS:
             if spell.target:
                 logging.info(f"'{spell.name}' wird verrechnet. Ziel: '{spell.target.name}'.")
-                effect = ModifyPowerToughness(power_modifier=3, toughness_modifier=3, duration=EffectDuration.END_OF_TURN)
-                spell.target.active_effects.append(effect)
+                power_bonus, toughness_bonus = PUMP_SPELLS[spell.name]
+                effect = ModifyPowerToughness(power_modifier=power_bonus, toughness_modifier=toughness_bonus, duration=EffectDuration.END_OF_TURN)
+                spell.target.add_effect(effect)
             else:
                 logging.warning(f"'{spell.name}' wurde ohne Ziel verrechnet (Fizzled).")
         
@@ -37,10 +41,12 @@ class StackManager:
         elif 'Creature' in spell.static_data.get('type_line', ''):
             logging.info(f"'{spell.name}' wird verrechnet und kommt ins Spiel.")
             spell.owner.hand.remove(spell)
-            spell.owner.battlefield.append(spell)
+            spell.owner.put_onto_battlefield(spell)
         
         # Spontanzauber/Hexereien gehen nach der Verrechnung auf den Friedhof
         if "Instant" in spell.static_data.get('type_line', '') or "Sorcery" in spell.static_data.get('type_line', ''):
+            if spell in spell.owner.hand:
+                spell.owner.hand.remove(spell)
             spell.owner.graveyard.append(spell)
     def is_empty(self) -> bool:
         """Prüft, ob der Stapel leer ist."""
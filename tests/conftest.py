@@ -0,0 +1,114 @@
+import random
+import uuid
+from typing import Dict, List, Sequence
+
+import pytest
+
+from core.game_engine.card import Card
+from core.game_engine.game_state import GameState
+from core.game_engine.phase_manager import TurnPhase
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true', default=False,
+                     help="auch langsame bzw. lastabhängige Tests ausführen (Markierung 'slow')")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "slow: langsamer oder lastabhängiger Test, nur mit --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-slow'):
+        return
+    skip_slow = pytest.mark.skip(reason="nur mit --run-slow")
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
+
+
+def card_data(name: str, mana_cost: str, cmc: float, type_line: str, power=None, toughness=None,
+              colors: Sequence[str] = (), keywords: Sequence[str] = (), color_identity=None) -> Dict:
+    """Kartendatensatz im Format der Kartendatenbank (siehe `scryfall_importer.card_record`)."""
+    return {
+        'name': name, 'mana_cost': mana_cost, 'cmc': float(cmc), 'type_line': type_line, 'oracle_text': '',
+        'power': power, 'toughness': toughness, 'colors': list(colors),
+        'color_identity': list(colors if color_identity is None else color_identity),
+        'keywords': list(keywords), 'legalities': {}, 'arena_id': None,
+    }
+
+
+# Kleine Kartendatenbank mit allen Schlüsselwörtern, die die Engine unterstützt
+TEST_CARDS = [
+    card_data('Forest', '', 0, 'Basic Land — Forest', color_identity=['G']),
+    card_data('Island', '', 0, 'Basic Land — Island', color_identity=['U']),
+    card_data('Plains', '', 0, 'Basic Land — Plains', color_identity=['W']),
+    card_data('Grizzly Bears', '{1}{G}', 2, 'Creature — Bear', '2', '2', ['G']),
+    card_data('Llanowar Elves', '{G}', 1, 'Creature — Elf Druid', '1', '1', ['G']),
+    card_data('Giant Growth', '{G}', 1, 'Instant', colors=['G']),
+    card_data('Serra Angel', '{3}{W}{W}', 5, 'Creature — Angel', '4', '4', ['W'], ['Flying', 'Vigilance']),
+    card_data('Giant Spider', '{3}{G}', 4, 'Creature — Spider', '2', '4', ['G'], ['Reach']),
+    card_data('Typhoid Rats', '{B}', 1, 'Creature — Rat', '1', '1', ['B'], ['Deathtouch']),
+    card_data('Youthful Knight', '{1}{W}', 2, 'Creature — Human Knight', '2', '1', ['W'], ['First strike']),
+    card_data('Vampire Nighthawk', '{1}{B}{B}', 3, 'Creature — Vampire', '2', '3', ['B'], ['Flying', 'Deathtouch', 'Lifelink']),
+    card_data('Fencing Ace', '{1}{W}', 2, 'Creature — Human Soldier', '1', '1', ['W'], ['Double strike']),
+    card_data('Hill Giant', '{3}{R}', 4, 'Creature — Giant', '3', '3', ['R']),
+    card_data('Goblin War Drums Bearer', '{2}{R}', 3, 'Creature — Goblin', '2', '2', ['R'], ['Menace']),
+]
+TEST_CARD_DB = {str(uuid.uuid5(uuid.NAMESPACE_DNS, data['name'])): data for data in TEST_CARDS}
+CARDS_BY_NAME = {data['name']: data for data in TEST_CARDS}
+CREATURE_NAMES = [data['name'] for data in TEST_CARDS if 'Creature' in data['type_line']]
+
+
+@pytest.fixture
+def card_db() -> Dict[str, Dict]:
+    return TEST_CARD_DB
+
+
+def deck(names: Sequence[str]) -> List[Dict]:
+    """Deckliste aus Kartennamen der Test-Datenbank."""
+    return [CARDS_BY_NAME[name] for name in names]
+
+
+def put(game: GameState, player_id: int, name: str, tapped: bool = False, sick: bool = False) -> Card:
+    """Legt eine Karte direkt auf das Schlachtfeld eines Spielers."""
+    player = game.get_player(player_id)
+    card = Card(CARDS_BY_NAME[name], player)
+    card.is_tapped = tapped
+    card.summoning_sick = sick
+    player.put_onto_battlefield(card)
+    return card
+
+
+def creature(game: GameState, player_id: int, power: int, toughness: int, keywords: Sequence[str] = (),
+             name: str = None) -> Card:
+    """Legt eine beliebige Kreatur (nicht aus der Test-Datenbank) auf das Schlachtfeld."""
+    player = game.get_player(player_id)
+    data = card_data(name or f"Creature {power}/{toughness}", '', 0, 'Creature — Test', str(power), str(toughness),
+                     keywords=keywords)
+    card = Card(data, player)
+    card.summoning_sick = False
+    player.put_onto_battlefield(card)
+    return card
+
+
+def empty_game(seed: int = 0, library: Sequence[str] = ("Forest",) * 20) -> GameState:
+    """Partie ohne Starthand: Bibliotheken aus `library`, Spieler 0 ist am Zug."""
+    random.seed(seed)
+    game = GameState(TEST_CARD_DB)
+    for player in game.players:
+        player.library = [Card(data, player) for data in deck(library)]
+    game.active_player_index = 0
+    return game
+
+
+def enter_main_phase(game: GameState):
+    """Versetzt die Partie in die erste Hauptphase des aktiven Spielers."""
+    game.phase_manager.current_phase = TurnPhase.PRECOMBAT_MAIN
+
+
+def random_board(game: GameState, rng: random.Random, max_creatures: int = 5):
+    """Legt auf beide Seiten zufällige, ungetappte Kreaturen."""
+    for player_id in (0, 1):
+        for _ in range(rng.randint(0, max_creatures)):
+            put(game, player_id, rng.choice(CREATURE_NAMES))
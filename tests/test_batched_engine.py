@@ -0,0 +1,183 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from core.game_engine.batched_engine import (
+    BATCH_STEP_ORDER, BatchedActions, BatchedGameState, ZONE_BATTLEFIELD, ZONE_GRAVEYARD, ZONE_HAND, ZONE_LIBRARY,
+)
+from core.game_engine.game_state import GameState
+from core.game_engine.phase_manager import TurnPhase, TurnStep
+
+from conftest import TEST_CARD_DB, deck
+
+DECK_NAMES = (["Forest"] * 9 + ["Island"] * 3 + [
+    "Grizzly Bears", "Llanowar Elves", "Giant Growth", "Serra Angel", "Giant Spider", "Typhoid Rats",
+    "Youthful Knight", "Vampire Nighthawk", "Fencing Ace", "Hill Giant"] * 2)
+MAIN_PHASES = (TurnPhase.PRECOMBAT_MAIN, TurnPhase.POSTCOMBAT_MAIN)
+RULE_STEPS = (TurnStep.UNTAP, TurnStep.UPKEEP, TurnStep.DRAW, TurnStep.BEGIN_COMBAT, TurnStep.END_OF_COMBAT,
+              TurnStep.END_STEP, TurnStep.CLEANUP)
+
+
+def started_games(num_games: int, seed: int):
+    random.seed(seed)
+    games = []
+    for _ in range(num_games):
+        game = GameState(TEST_CARD_DB)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.start_game([deck(DECK_NAMES), deck(DECK_NAMES)])
+        games.append(game)
+    return games
+
+
+def slots(mask: np.ndarray):
+    return np.flatnonzero(mask).tolist()
+
+
+def random_actions(batch: BatchedGameState, step, rng: np.random.Generator) -> BatchedActions:
+    """Zufällige (auch illegale) Aktionen für den aktuellen Schritt aller Partien."""
+    K, C = batch.num_games, batch.num_cards
+    actions = BatchedActions()
+    if step in MAIN_PHASES:
+        actions.play_land = np.full(K, -1)
+        actions.cast = np.zeros((K, C), bool)
+        actions.pump_card = np.full(K, -1)
+        actions.pump_target = np.full(K, -1)
+        for k in range(K):
+            hand = slots((batch.zone[k] == ZONE_HAND) & (batch.owner[k] == batch.active[k]))
+            lands = [c for c in hand if batch.is_land[k, c]]
+            if lands and rng.random() < 0.9:
+                actions.play_land[k] = rng.choice(lands)
+            for c in hand:
+                actions.cast[k, c] = batch.is_creature[k, c] and rng.random() < 0.6
+            pumps = [c for c in hand if batch.is_pump[k, c]]
+            creatures = slots((batch.zone[k] == ZONE_BATTLEFIELD) & batch.is_creature[k])
+            if pumps and rng.random() < 0.5:
+                actions.pump_card[k] = pumps[0]
+                actions.pump_target[k] = rng.choice(creatures) if creatures else -1
+    elif step == TurnStep.DECLARE_ATTACKERS:
+        actions.attackers = rng.random((K, C)) < 0.5
+    elif step == TurnStep.DECLARE_BLOCKERS:
+        actions.blocks = np.full((K, C), -1)
+        actions.pump_card = np.full(K, -1)
+        actions.pump_target = np.full(K, -1)
+        for k in range(K):
+            attackers = slots(batch.attacking[k] & (batch.zone[k] == ZONE_BATTLEFIELD))
+            if not attackers:
+                continue
+            for c in range(C):
+                if rng.random() < 0.5:
+                    actions.blocks[k, c] = rng.choice(attackers)
+            pumps = slots((batch.zone[k] == ZONE_HAND) & (batch.owner[k] == batch.active[k]) & batch.is_pump[k])
+            if pumps and rng.random() < 0.5:
+                actions.pump_card[k] = pumps[0]
+                actions.pump_target[k] = rng.choice(attackers)
+    return actions
+
+
+def is_creature(card) -> bool:
+    return 'Creature' in card.static_data['type_line']
+
+
+def cast_pump(game: GameState, card, target):
+    card.target = target
+    if game.active_player.cast_spell(card):
+        game.stack_manager.resolve_top_item()
+
+
+def apply_to_game(game: GameState, cards, step, actions: BatchedActions, k: int):
+    """Dieselben Aktionen mit den Objekten der Engine ausführen (illegale werden ignoriert)."""
+    pm = game.phase_manager
+    active = game.active_player
+    defender = game.get_player(1 - active.player_id)
+    if isinstance(step, TurnStep):
+        pm.current_step = step
+    if step in RULE_STEPS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pm.execute_current_step_actions()
+    elif step in MAIN_PHASES:
+        if actions.play_land[k] >= 0 and active.lands_played_this_turn == 0:
+            active.play_land(cards[actions.play_land[k]])
+        for c in np.flatnonzero(actions.cast[k]):
+            if cards[c] in active.hand and active.cast_spell(cards[c]):
+                game.stack_manager.resolve_top_item()
+        if actions.pump_card[k] >= 0:
+            target = cards[actions.pump_target[k]] if actions.pump_target[k] >= 0 else None
+            cast_pump(game, cards[actions.pump_card[k]], target)
+    elif step == TurnStep.DECLARE_ATTACKERS:
+        for c in np.flatnonzero(actions.attackers[k]):
+            card = cards[c]
+            if (card in active.battlefield and is_creature(card) and not card.is_tapped
+                    and (not card.summoning_sick or card.has_keyword('Haste'))):
+                card.is_attacking = True
+                if not card.has_keyword('Vigilance'):
+                    card.is_tapped = True
+    elif step == TurnStep.DECLARE_BLOCKERS:
+        for c, a in enumerate(actions.blocks[k]):
+            if a < 0:
+                continue
+            blocker, attacker = cards[c], cards[a]
+            if (blocker in defender.battlefield and is_creature(blocker) and not blocker.is_tapped
+                    and blocker.blocking is None and attacker.is_attacking and attacker.can_be_blocked_by(blocker)):
+                attacker.blockers.append(blocker)
+                blocker.blocking = attacker
+        if actions.pump_card[k] >= 0:
+            cast_pump(game, cards[actions.pump_card[k]], cards[actions.pump_target[k]])
+    elif step in (TurnStep.FIRST_STRIKE_DAMAGE, TurnStep.COMBAT_DAMAGE):
+        game.assign_combat_damage(step == TurnStep.FIRST_STRIKE_DAMAGE)
+    game.check_state_based_actions()
+    if step == TurnStep.CLEANUP:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pm.end_turn()
+
+
+def assert_same_state(batch: BatchedGameState, games, where):
+    for k, game in enumerate(games):
+        if batch.finished[k]:
+            continue
+        for c, card in enumerate(batch.slot_cards[k]):
+            p = card.owner
+            zone = (ZONE_LIBRARY if card in p.library else ZONE_HAND if card in p.hand
+                    else ZONE_BATTLEFIELD if card in p.battlefield else ZONE_GRAVEYARD)
+            assert batch.zone[k, c] == zone, (where, k, card.name)
+            if zone != ZONE_BATTLEFIELD:
+                continue
+            assert batch.tapped[k, c] == card.is_tapped, (where, k, card.name)
+            assert batch.attacking[k, c] == card.is_attacking, (where, k, card.name)
+            if batch.is_creature[k, c]:
+                assert batch.sick[k, c] == card.summoning_sick, (where, k, card.name)
+                assert (batch.power[k, c], batch.toughness[k, c]) == (card.power, card.toughness), (where, k, card.name)
+                assert batch.damage[k, c] == card.damage_marked, (where, k, card.name)
+        assert list(batch.life[k]) == [p.life for p in game.players], (where, k)
+        assert batch.active[k] == game.active_player_index, (where, k)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batched_engine_matches_object_engine_on_random_games(seed):
+    games = started_games(24, seed)
+    batch = BatchedGameState.from_game_states(games)
+    rng = np.random.default_rng(seed)
+    for turn in range(12):
+        for step in BATCH_STEP_ORDER:
+            actions = random_actions(batch, step, rng)
+            for k, game in enumerate(games):
+                if not batch.finished[k]:
+                    apply_to_game(game, batch.slot_cards[k], step, actions, k)
+            batch.step(actions)
+            assert_same_state(batch, games, (turn, step))
+
+
+def test_pump_without_target_array_fizzles():
+    batch = BatchedGameState.start_games([deck(DECK_NAMES), deck(DECK_NAMES)], 8, np.random.default_rng(0))
+    rows = np.arange(batch.num_games)
+    pump = np.argmax(batch.is_pump & (batch.owner == batch.active[:, None]), axis=1)
+    forests = batch.is_land & (batch.owner == batch.active[:, None])
+    batch.zone[:] = np.where(forests, ZONE_BATTLEFIELD, ZONE_LIBRARY)
+    batch.zone[rows, pump] = ZONE_HAND
+
+    batch._cast_pump(pump, None)
+
+    assert (batch.zone[rows, pump] == ZONE_GRAVEYARD).all()
+    assert (batch.temp_power == 0).all() and (batch.temp_toughness == 0).all()
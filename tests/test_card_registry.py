@@ -0,0 +1,80 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from core.data.card_registry import CardRegistry, get_active_registry, init_worker, set_active_registry
+from core.game_engine.card import Card
+from core.game_engine.game_state import GameState
+
+from conftest import CARDS_BY_NAME, TEST_CARD_DB
+
+
+@pytest.fixture
+def registry():
+    registry = set_active_registry(CardRegistry.publish(TEST_CARD_DB))
+    yield registry
+    set_active_registry(None)
+    registry.close()
+
+
+def _card_name(oracle_id: str) -> str:
+    return get_active_registry()[oracle_id]['name']
+
+
+def test_registry_behaves_like_the_card_dict(registry):
+    assert len(registry) == len(TEST_CARD_DB)
+    assert set(registry) == set(TEST_CARD_DB)
+    for oracle_id, data in TEST_CARD_DB.items():
+        record = registry[oracle_id]
+        assert {key: record[key] for key in data} == data
+        assert record['oracle_id'] == oracle_id
+        assert registry.card(record['card_id']) is record
+    assert registry.get('unbekannt') is None
+    with pytest.raises(KeyError):
+        registry['unbekannt']
+
+
+def test_attached_registry_reads_the_published_block(registry):
+    attached = CardRegistry.attach(registry.name)
+    try:
+        assert list(attached) == list(registry)
+        for oracle_id in registry:
+            assert attached[oracle_id] == registry[oracle_id]
+    finally:
+        attached.close()
+    # Schließen eines angehängten Registers gibt den Block nicht frei
+    assert registry[next(iter(registry))]['name']
+
+
+def test_worker_processes_attach_by_name(registry):
+    oracle_id = next(oid for oid in registry if registry[oid]['name'] == 'Hill Giant')
+    with ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(registry.name,)) as executor:
+        assert executor.submit(_card_name, oracle_id).result() == 'Hill Giant'
+
+
+def test_cards_pickle_only_their_card_id(registry):
+    game = GameState(registry)
+    player = game.players[0]
+    oracle_id = next(oid for oid in registry if registry[oid]['name'] == 'Grizzly Bears')
+    card = Card(registry[oracle_id], player)
+    player.hand.append(card)
+    assert 'static_data' not in card.__getstate__()
+
+    restored = pickle.loads(pickle.dumps(game)).players[0].hand[0]
+    assert restored.card_id == card.card_id
+    assert restored.static_data is registry.card(card.card_id)
+    assert restored.name == 'Grizzly Bears'
+
+
+def test_cards_without_registry_keep_their_data():
+    card = Card(CARDS_BY_NAME['Forest'], None)
+    assert pickle.loads(pickle.dumps(card)).static_data == CARDS_BY_NAME['Forest']
+
+
+def test_close_releases_the_shared_memory_block():
+    registry = CardRegistry.publish(TEST_CARD_DB)
+    name = registry.name
+    registry.close()
+    with pytest.raises(FileNotFoundError):
+        CardRegistry.attach(name)
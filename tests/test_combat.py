@@ -0,0 +1,197 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.game_engine.block_planner import plan_blocks, min_cost_assignment, block_legality_matrix
+
+from conftest import creature, empty_game, put
+
+
+def attack(attacker, *blockers):
+    """Deklariert `attacker` als Angreifer mit den Blockern in Schadenszuweisungsreihenfolge."""
+    attacker.is_attacking = True
+    for blocker in blockers:
+        attacker.blockers.append(blocker)
+        blocker.blocking = attacker
+
+
+def resolve(game):
+    """Beide Schadensschritte mit zustandsbasierten Aktionen, wie im Spielablauf."""
+    game.assign_combat_damage(first_strike=True)
+    game.check_state_based_actions()
+    game.assign_combat_damage(first_strike=False)
+    game.check_state_based_actions()
+
+
+def alive(game, card):
+    return card in card.owner.battlefield
+
+
+# --- GameState.assign_combat_damage ----------------------------------------------------
+
+def test_multi_block_assigns_lethal_damage_in_order():
+    game = empty_game()
+    attacker = creature(game, 0, 3, 5)
+    first, second = creature(game, 1, 1, 2), creature(game, 1, 1, 2)
+    attack(attacker, first, second)
+    resolve(game)
+    # 2 Schaden (tödlich) an den ersten Blocker, der Rest (1) an den zweiten
+    assert not alive(game, first)
+    assert alive(game, second) and second.damage_marked == 1
+    assert attacker.damage_marked == 2
+    assert game.get_player(1).life == 20
+
+
+def test_multi_block_kills_both_with_enough_power():
+    game = empty_game()
+    attacker = creature(game, 0, 4, 4)
+    first, second = creature(game, 1, 2, 2), creature(game, 1, 2, 2)
+    attack(attacker, first, second)
+    resolve(game)
+    assert not alive(game, first) and not alive(game, second)
+    assert not alive(game, attacker)
+
+
+def test_first_strike_kills_before_regular_damage():
+    game = empty_game()
+    knight = put(game, 0, 'Youthful Knight')
+    bear = put(game, 1, 'Grizzly Bears')
+    attack(knight, bear)
+    resolve(game)
+    assert not alive(game, bear)
+    assert alive(game, knight) and knight.damage_marked == 0
+
+
+def test_first_strike_blocker_kills_attacker_first():
+    game = empty_game()
+    attacker = creature(game, 0, 3, 1)
+    blocker = creature(game, 1, 1, 4, ['First strike'])
+    attack(attacker, blocker)
+    resolve(game)
+    assert not alive(game, attacker)
+    assert blocker.damage_marked == 0
+
+
+def test_double_strike_deals_damage_twice():
+    game = empty_game()
+    ace = put(game, 0, 'Fencing Ace')
+    attack(ace)
+    resolve(game)
+    assert game.get_player(1).life == 18
+
+
+def test_double_strike_finishes_surviving_blocker():
+    game = empty_game()
+    attacker = creature(game, 0, 2, 2, ['Double strike'])
+    blocker = creature(game, 1, 1, 4)
+    attack(attacker, blocker)
+    resolve(game)
+    assert not alive(game, blocker)
+    assert attacker.damage_marked == 1
+
+
+def test_deathtouch_blocker_kills_bigger_attacker():
+    game = empty_game()
+    giant = put(game, 0, 'Hill Giant')
+    rats = put(game, 1, 'Typhoid Rats')
+    attack(giant, rats)
+    resolve(game)
+    assert not alive(game, giant) and not alive(game, rats)
+
+
+def test_deathtouch_attacker_needs_one_damage_per_blocker():
+    game = empty_game()
+    attacker = creature(game, 0, 2, 10, ['Deathtouch'])
+    first, second = creature(game, 1, 0, 5), creature(game, 1, 0, 5)
+    attack(attacker, first, second)
+    resolve(game)
+    assert not alive(game, first) and not alive(game, second)
+
+
+def test_lifelink_gains_life_for_damage_dealt():
+    game = empty_game()
+    nighthawk = put(game, 0, 'Vampire Nighthawk')
+    attack(nighthawk)
+    resolve(game)
+    assert game.get_player(0).life == 22
+    assert game.get_player(1).life == 18
+
+
+def test_removed_blocker_keeps_attacker_blocked():
+    game = empty_game()
+    attacker = creature(game, 0, 5, 5)
+    blocker = creature(game, 1, 1, 1)
+    attack(attacker, blocker)
+    game.get_player(1).remove_from_battlefield(blocker, game.get_player(1).graveyard)
+    resolve(game)
+    assert game.get_player(1).life == 20
+
+
+# --- block_planner ----------------------------------------------------------------------
+
+def test_flying_attacker_only_blockable_by_flying_or_reach():
+    game = empty_game()
+    angel = put(game, 0, 'Serra Angel')
+    bear, spider = put(game, 1, 'Grizzly Bears'), put(game, 1, 'Giant Spider')
+    legal = block_legality_matrix([angel], [bear, spider])
+    assert legal.tolist() == [[False, True]]
+    # Der Spider (2/4) überlebt den Engel (4/4) nicht; bei vollem Leben wird nicht geblockt
+    assert plan_blocks([angel], [bear], 20) == [[]]
+
+
+def test_good_trade_is_blocked_and_bad_trade_is_not():
+    game = empty_game()
+    bear = creature(game, 0, 2, 2)
+    wall = creature(game, 1, 0, 4)
+    assert plan_blocks([bear], [wall], 20) == [[wall]]
+    # Verlorener Blocker (Wert 7) wiegt mehr als der verhinderte Schaden (5)
+    giant = creature(game, 0, 5, 5)
+    blocker = creature(game, 1, 3, 4)
+    assert plan_blocks([giant], [blocker], 20) == [[]]
+
+
+def test_menace_attacker_is_never_blocked_alone():
+    game = empty_game()
+    menace = creature(game, 0, 3, 3, ['Menace'])
+    blocker = creature(game, 1, 3, 3)
+    assert plan_blocks([menace], [blocker], 20) == [[]]
+
+
+def test_menace_attacker_is_blocked_by_a_pair():
+    game = empty_game()
+    menace = creature(game, 0, 3, 3, ['Menace'])
+    first, second = creature(game, 1, 2, 4), creature(game, 1, 2, 4)
+    groups = plan_blocks([menace], [first, second], 20)
+    assert sorted(map(id, groups[0])) == sorted([id(first), id(second)])
+
+
+def test_lethal_attack_triggers_chump_blocks():
+    game = empty_game()
+    attackers = [creature(game, 0, 3, 3), creature(game, 0, 3, 3)]
+    chumps = [creature(game, 1, 2, 2)]
+    # Bei vollem Leben lohnt der Chump-Block nicht (Blocker Wert 4 > 3 verhinderter Schaden)
+    assert plan_blocks(attackers, chumps, 20) == [[], []]
+    # 6 Schaden bei 5 Leben: mit einem Chump-Block überlebt der Verteidiger
+    groups = plan_blocks(attackers, chumps, 5)
+    assert sum(len(g) for g in groups) == 1
+
+
+def test_blocks_respect_legality():
+    game = empty_game()
+    angel = put(game, 0, 'Serra Angel')
+    bears = [creature(game, 1, 3, 3) for _ in range(3)]
+    # Tödlich, aber keiner der Blocker darf den Flieger blocken
+    assert plan_blocks([angel], bears, 2) == [[]]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_min_cost_assignment_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 6))
+    m = int(rng.integers(n, 8))
+    cost = rng.integers(-20, 20, size=(n, m)).astype(float)
+    assignment = min_cost_assignment(cost)
+    assert len(set(assignment.tolist())) == n
+    best = min(sum(cost[i, j] for i, j in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+    assert sum(cost[i, j] for i, j in enumerate(assignment)) == pytest.approx(best)
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from core.game_engine.combat_evaluator import creature_arrays, resolve_combat
+
+from conftest import creature, empty_game
+
+COMBAT_KEYWORDS = ['First strike', 'Double strike', 'Deathtouch', 'Lifelink']
+
+
+def random_creature(game, player_id, rng: random.Random):
+    keywords = [k for k in COMBAT_KEYWORDS if rng.random() < 0.2]
+    return creature(game, player_id, rng.randint(0, 5), rng.randint(1, 5), keywords)
+
+
+def random_combat(seed: int):
+    """Zufälliger Kampf: Angreifer, Blocker, Angriffsmaske, Blockzuweisung und Reihenfolge."""
+    rng = random.Random(seed)
+    game = empty_game(seed)
+    attackers = [random_creature(game, 0, rng) for _ in range(rng.randint(1, 5))]
+    blockers = [random_creature(game, 1, rng) for _ in range(rng.randint(0, 6))]
+    attack_mask = np.array([rng.random() < 0.8 for _ in attackers])
+    attacking = np.flatnonzero(attack_mask).tolist()
+    blocks = np.array([rng.choice(attacking) if attacking and rng.random() < 0.7 else -1 for _ in blockers],
+                      dtype=np.int64)
+    rank = np.array([rng.random() for _ in blockers])
+    return game, attackers, blockers, attack_mask, blocks, rank
+
+
+def resolve_with_engine(game, attackers, blockers, attack_mask, blocks, rank):
+    """Derselbe Kampf mit den Objekten der Engine (beide Schadensschritte samt SBAs)."""
+    for a, attacker in enumerate(attackers):
+        attacker.is_attacking = bool(attack_mask[a])
+    for b in sorted(range(len(blockers)), key=lambda b: rank[b]):
+        if blocks[b] >= 0:
+            attackers[blocks[b]].blockers.append(blockers[b])
+            blockers[b].blocking = attackers[blocks[b]]
+    for first_strike in (True, False):
+        game.assign_combat_damage(first_strike=first_strike)
+        game.check_state_based_actions()
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_resolve_combat_matches_object_engine(seed):
+    game, attackers, blockers, attack_mask, blocks, rank = random_combat(seed)
+    outcome = resolve_combat(creature_arrays(attackers), creature_arrays(blockers),
+                             attack_mask[None, :], blocks[None, :], rank[None, :])
+    life = [p.life for p in game.players]
+
+    resolve_with_engine(game, attackers, blockers, attack_mask, blocks, rank)
+
+    attackers_dead = [a not in game.get_player(0).battlefield for a in attackers]
+    blockers_dead = [b not in game.get_player(1).battlefield for b in blockers]
+    assert outcome.attacker_dead[0].tolist() == attackers_dead
+    # Nicht blockende Kreaturen nehmen nicht am Kampf teil
+    assert outcome.blocker_dead[0].tolist() == blockers_dead
+    assert outcome.attacker_life_delta[0] == game.get_player(0).life - life[0]
+    assert outcome.defender_life_delta[0] == game.get_player(1).life - life[1]
+    for a, attacker in enumerate(attackers):
+        if not attackers_dead[a]:
+            assert outcome.attacker_damage[0, a] == attacker.damage_marked
+    for b, blocker in enumerate(blockers):
+        if not blockers_dead[b]:
+            assert outcome.blocker_damage[0, b] == blocker.damage_marked
+
+
+def test_resolve_combat_scores_many_configurations_at_once():
+    """Mehrere Konfigurationen in einem Aufruf ergeben dasselbe wie jede einzeln."""
+    game, attackers, blockers, _, _, _ = random_combat(7)
+    rng = np.random.default_rng(0)
+    K = 64
+    masks = rng.random((K, len(attackers))) < 0.7
+    blocks = np.where(rng.random((K, len(blockers))) < 0.6,
+                      rng.integers(0, len(attackers), (K, len(blockers))), -1)
+    att, blk = creature_arrays(attackers), creature_arrays(blockers)
+    batched = resolve_combat(att, blk, masks, blocks)
+    for k in range(K):
+        single = resolve_combat(att, blk, masks[k:k + 1], blocks[k:k + 1])
+        assert batched.attacker_dead[k].tolist() == single.attacker_dead[0].tolist()
+        assert batched.blocker_dead[k].tolist() == single.blocker_dead[0].tolist()
+        assert batched.defender_life_delta[k] == single.defender_life_delta[0]
+        assert batched.attacker_life_delta[k] == single.attacker_life_delta[0]
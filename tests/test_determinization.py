@@ -0,0 +1,109 @@
+import numpy as np
+
+from core.game_engine.card import Card
+from core.game_engine.determinization import DeterminizationSampler, InformationSet, public_prior
+from core.game_engine.evaluation import HeuristicEvaluator
+from core.game_engine.lethal_solver import CombatPosition, LethalSolver, find_lethal_attack
+from core.game_engine.phase_manager import TurnStep
+
+from conftest import CARDS_BY_NAME, deck, empty_game, enter_main_phase, put
+
+
+def give(game, player_id, zone, names):
+    player = game.get_player(player_id)
+    setattr(player, zone, [Card(CARDS_BY_NAME[name], player) for name in names])
+
+
+def hidden_opponent_game():
+    """Der Gegner hält ausschließlich Serra Angel verdeckt, die nirgends sichtbar ist."""
+    game = empty_game(library=['Forest'] * 10 + ['Giant Growth'] * 5)
+    give(game, 1, 'library', ['Serra Angel'] * 12)
+    give(game, 1, 'hand', ['Serra Angel'] * 3)
+    return game
+
+
+def opponent_names(world):
+    opponent = world.get_player(1)
+    return {c.name for c in opponent.hand + opponent.library}
+
+
+def test_fallback_prior_uses_only_public_cards():
+    game = hidden_opponent_game()
+    put(game, 1, 'Forest')
+    give(game, 1, 'graveyard', ['Grizzly Bears'])
+
+    worlds = DeterminizationSampler(rng=np.random.default_rng(0)).worlds(game, 0, 20)
+
+    for world in worlds:
+        assert opponent_names(world) <= {'Forest', 'Grizzly Bears'}
+        assert (len(world.get_player(1).hand), len(world.get_player(1).library)) == (3, 12)
+    prior = public_prior(InformationSet(game, 0))
+    assert prior.deck_size == 17
+    assert dict(zip(prior.names, prior.integer_counts().tolist())) == {'Forest': 7, 'Grizzly Bears': 10}
+
+
+def test_fallback_without_observations_mirrors_own_deck():
+    worlds = DeterminizationSampler(rng=np.random.default_rng(0)).worlds(hidden_opponent_game(), 0, 20)
+    for world in worlds:
+        assert opponent_names(world) <= {'Forest', 'Giant Growth'}
+
+
+def counterattack_position(opponent_hand):
+    # Wir stehen auf 3 Leben; greifen die Bären an, kann der Gegner mit Elf + Pump töten
+    game = empty_game()
+    game.get_player(0).life = 3
+    bears = put(game, 0, 'Grizzly Bears')
+    put(game, 1, 'Llanowar Elves')
+    put(game, 1, 'Forest')
+    give(game, 1, 'hand', opponent_hand)
+    game.phase_manager.current_step = TurnStep.BEGIN_COMBAT
+    return game, bears
+
+
+def test_lethal_solver_does_not_read_opponent_hand():
+    results = []
+    for hand in (['Forest'], ['Giant Growth']):
+        game, bears = counterattack_position(hand)
+        solved = find_lethal_attack(game, 0, exact=True)
+        results.append((solved.attack_value([bears]), solved.attack_value([])))
+    # Die verdeckte Karte könnte ein Pump-Zauber sein: Angreifen verliert in beiden Fällen
+    assert results == [(-1, 0), (-1, 0)]
+
+    game, bears = counterattack_position(['Forest'])
+    full_information = LethalSolver(CombatPosition.from_game(game)).solve_attack(exact=True)
+    assert full_information.attack_value([bears]) == 0
+
+
+def test_hidden_pumps_are_limited_by_lands():
+    game, _ = counterattack_position(['Giant Growth', 'Giant Growth', 'Forest'])
+    give(game, 0, 'hand', ['Giant Growth', 'Forest'])
+    position = CombatPosition.from_game(game, 0)
+    assert [p.name for p in position.pumps[0]] == ['Giant Growth']
+    assert [p.card for p in position.pumps[1]] == [None]
+
+
+class RecordingEvaluator(HeuristicEvaluator):
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def evaluate(self, game, player_id):
+        self.seen.append(game)
+        return super().evaluate(game, player_id)
+
+    def evaluate_batch(self, games, player_id):
+        self.seen.extend(games)
+        return super().evaluate_batch(games, player_id)
+
+
+def test_search_never_evaluates_the_real_state():
+    game = hidden_opponent_game()
+    enter_main_phase(game)
+    player = game.get_player(0)
+    give(game, 0, 'hand', ['Forest', 'Grizzly Bears'])
+    player.evaluator = RecordingEvaluator()
+
+    player.choose_action()
+
+    assert player.evaluator.seen
+    assert all(seen is not game for seen in player.evaluator.seen)
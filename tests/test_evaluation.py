@@ -0,0 +1,78 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from ai_model.networks import LinearEvaluator, MLPEvaluator
+from core.game_engine.card import Card
+from core.game_engine.evaluation import NUM_FEATURES, BoardFeatures, HeuristicEvaluator, card_count, feature_vector
+from core.game_engine.game_loop import run_game
+from core.game_engine.game_state import GameState
+
+from conftest import CARDS_BY_NAME, TEST_CARD_DB, deck, empty_game, enter_main_phase, random_board
+
+
+def test_playing_a_land_does_not_count_as_card_disadvantage():
+    game = empty_game()
+    enter_main_phase(game)
+    player = game.players[0]
+    player.hand = [Card(CARDS_BY_NAME[name], player) for name in ('Forest', 'Grizzly Bears')]
+    evaluator = HeuristicEvaluator()
+    holding = evaluator.evaluate(game, 0)
+
+    player.play_land(player.hand[0])
+
+    assert card_count(game, 0) == 2
+    assert evaluator.evaluate(game, 0) > holding
+    assert float(evaluator.evaluate_features(feature_vector(game, 0)[None, :])[0]) == evaluator.evaluate(game, 0)
+
+
+def test_incremental_board_features_match_rebuild_after_games():
+    cards = deck(['Forest'] * 17 + ['Grizzly Bears', 'Giant Growth', 'Giant Spider', 'Llanowar Elves',
+                                   'Youthful Knight'] * 5)
+    for seed in range(3):
+        random.seed(seed)
+        game = GameState(TEST_CARD_DB)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.start_game([cards, cards])
+            for player in game.players:
+                player.decision_time_limit = 0.02
+            run_game(game, max_turns=8)
+
+        rebuilt = BoardFeatures()
+        rebuilt.rebuild(game)
+        assert sum(rebuilt.creature_count) > 0
+        assert game.board_features.board_value == pytest.approx(rebuilt.board_value)
+        assert game.board_features.creature_count == rebuilt.creature_count
+        assert game.board_features.land_count == rebuilt.land_count
+
+
+def random_states(count: int = 20):
+    rng = random.Random(0)
+    states = []
+    for seed in range(count):
+        game = empty_game(seed)
+        random_board(game, rng)
+        for player in game.players:
+            player.life = rng.randint(1, 20)
+            player.hand = [Card(CARDS_BY_NAME[rng.choice(list(CARDS_BY_NAME))], player)
+                           for _ in range(rng.randint(0, 7))]
+        states.append(game)
+    return states
+
+
+@pytest.mark.parametrize('make_evaluator', [
+    lambda rng: LinearEvaluator(rng.normal(size=NUM_FEATURES), 0.3),
+    lambda rng: MLPEvaluator([rng.normal(size=(NUM_FEATURES, 16)), rng.normal(size=(16, 1))],
+                             [rng.normal(size=16), rng.normal(size=1)],
+                             rng.normal(size=NUM_FEATURES), rng.uniform(1.0, 5.0, size=NUM_FEATURES)),
+], ids=['linear', 'mlp'])
+def test_batch_evaluation_matches_single_states(make_evaluator):
+    evaluator = make_evaluator(np.random.default_rng(0))
+    states = random_states()
+    for player_id in (0, 1):
+        batch = evaluator.evaluate_batch(states, player_id)
+        single = [evaluator.evaluate(game, player_id) for game in states]
+        assert batch == pytest.approx(single)
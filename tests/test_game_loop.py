@@ -0,0 +1,84 @@
+import contextlib
+import io
+import random
+
+from core.game_engine.card import Card
+from core.game_engine.game_loop import run_game
+from core.game_engine.game_state import GameState
+from core.game_engine.phase_manager import TURN_ORDER, TurnPhase, TurnStep
+
+from conftest import CARDS_BY_NAME, TEST_CARDS, TEST_CARD_DB, deck, empty_game, enter_main_phase, put
+
+
+def test_turn_order_contains_both_main_phases():
+    assert TURN_ORDER.index(TurnStep.DRAW) + 1 == TURN_ORDER.index(TurnPhase.PRECOMBAT_MAIN)
+    assert TURN_ORDER.index(TurnStep.END_OF_COMBAT) + 1 == TURN_ORDER.index(TurnPhase.POSTCOMBAT_MAIN)
+
+
+def test_step_actions_run_once_per_step():
+    game = empty_game()
+    phase_manager = game.phase_manager
+    phase_manager.step_index = phase_manager.step_order.index(TurnStep.DRAW)
+    phase_manager.current_step = TurnStep.DRAW
+    player = game.active_player
+    with contextlib.redirect_stdout(io.StringIO()):
+        phase_manager.execute_current_step_actions()
+        phase_manager.advance_to_next_step()
+    # Der Draw-Step zieht genau eine Karte, das Weiterschalten führt keine Aktionen erneut aus
+    assert len(player.hand) == 1
+    assert phase_manager.current_phase == TurnPhase.PRECOMBAT_MAIN
+
+
+def test_spell_without_matching_colors_is_not_offered():
+    game = empty_game()
+    enter_main_phase(game)
+    player = game.players[0]
+    for _ in range(4):
+        put(game, 0, 'Forest')
+    player.hand = [Card(CARDS_BY_NAME[name], player) for name in ('Hill Giant', 'Giant Spider')]
+
+    actions = player.get_available_actions()
+    # Hill Giant braucht {R}: eine gescheiterte Bezahlung ließe die KI endlos dieselbe Aktion wählen
+    assert 'cast_Hill Giant' not in actions
+    assert 'cast_Giant Spider' in actions
+    assert player.has_priority_action()
+
+
+def test_has_priority_action_agrees_with_available_actions():
+    rng = random.Random(0)
+    names = [data['name'] for data in TEST_CARDS]
+    for trial in range(2000):
+        game = empty_game()
+        game.active_player_index = rng.randint(0, 1)
+        # Zufälliger Schritt, in der Hälfte der Fälle eine Hauptphase; das Weiterschalten setzt die Phase
+        step = rng.choice(TURN_ORDER if rng.random() < 0.5 else [TurnPhase.PRECOMBAT_MAIN, TurnPhase.POSTCOMBAT_MAIN])
+        phase_manager = game.phase_manager
+        phase_manager.step_index = TURN_ORDER.index(step) - 1
+        phase_manager.advance_to_next_step()
+        for player in game.players:
+            player.hand = [Card(CARDS_BY_NAME[rng.choice(names)], player) for _ in range(rng.randint(0, 4))]
+            player.lands_played_this_turn = rng.randint(0, 1)
+            for _ in range(rng.randint(0, 5)):
+                put(game, player.player_id, rng.choice(('Forest', 'Island', 'Plains')), tapped=rng.random() < 0.3)
+        if rng.random() < 0.2:
+            game.stack_manager.stack.append(Card(CARDS_BY_NAME['Giant Growth'], game.players[0]))
+
+        for player in game.players:
+            expected = player.get_available_actions() != ['pass_priority']
+            assert player.has_priority_action() == expected, f"Zustand {trial}, Spieler {player.player_id}"
+
+
+def test_ai_game_reaches_main_phases_and_plays_lands():
+    random.seed(0)
+    cards = deck(['Forest'] * 17 + ['Grizzly Bears', 'Hill Giant', 'Giant Spider', 'Llanowar Elves'] * 6)
+    game = GameState(TEST_CARD_DB)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.start_game([cards, cards])
+        for player in game.players:
+            player.decision_time_limit = 0.02
+        result = run_game(game, max_turns=6)
+
+    assert result.turns > 1
+    for player in game.players:
+        assert any(card.name == 'Forest' for card in player.battlefield)
+        assert any('Creature' in card.static_data['type_line'] for card in player.battlefield)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from core.data.goldfish_analyzer import analyze_deck
+
+from conftest import card_data, deck
+
+AZORIUS_GUILDGATE = card_data('Azorius Guildgate', '', 0, 'Land — Gate', color_identity=['W', 'U'])
+AZORIUS_CHARM = card_data('Azorius Charm', '{W}{U}', 2, 'Instant', colors=['W', 'U'])
+
+
+def test_dual_land_pays_only_one_pip():
+    # Ein W/U-Dual-Land und sonst nur Wälder: {W}{U} ist nie bezahlbar
+    cards = [AZORIUS_GUILDGATE] + deck(['Forest'] * 29) + [AZORIUS_CHARM] * 10
+    report = analyze_deck(cards, num_shuffles=20_000, rng=np.random.default_rng(0))
+    assert (report.castable_prob == 0).all()
+    assert (report.on_curve_prob == 0).all()
+
+
+def test_dual_land_and_basic_cover_two_colors():
+    cards = [AZORIUS_GUILDGATE] + deck(['Plains'] + ['Forest'] * 28) + [AZORIUS_CHARM] * 10
+    report = analyze_deck(cards, num_shuffles=20_000, rng=np.random.default_rng(0))
+    assert report.castable_prob[-1] > 0
+
+
+def test_on_curve_probability_of_mono_color_deck():
+    # Mit 17 Wäldern und nur Grizzly Bears ist der Bär in Zug 2 meist wirkbar, in Zug 1 nie
+    cards = deck(['Forest'] * 17 + ['Grizzly Bears'] * 23)
+    report = analyze_deck(cards, num_shuffles=20_000, rng=np.random.default_rng(0))
+    assert report.on_curve_prob[0] == 0
+    assert 0.8 < report.on_curve_prob[1] < 1
+    assert report.color_screw_rate.max() == 0
@@ -0,0 +1,230 @@
+import itertools
+import random
+
+import pytest
+
+from core.game_engine.effect_system import EffectDuration, ModifyPowerToughness
+from core.game_engine.lethal_solver import (WIN, LOSS, UNDECIDED, CombatCreature, CombatPosition, LethalSolver, Pump,
+                                            _Turn, benchmark_solver, random_position)
+from core.game_engine.search_budget import SearchBudget
+
+from conftest import CREATURE_NAMES, empty_game, put
+
+FOREST = frozenset('G')
+
+
+def unlimited(position: CombatPosition) -> LethalSolver:
+    return LethalSolver(position, SearchBudget(time_limit=None, max_nodes=None, pause_gc=False))
+
+
+# --- Bekannte Stellungen -----------------------------------------------------------------
+
+def test_unblockable_damage_is_a_win():
+    position = CombatPosition([20, 3], [[CombatCreature(3, 3)], []])
+    result = unlimited(position).solve_attack()
+    assert result.value == WIN
+    assert result.proven
+
+
+def test_flying_and_menace_attackers_win_past_a_single_blocker():
+    position = CombatPosition([20, 4], [[CombatCreature(2, 2, ['Flying']), CombatCreature(2, 2, ['Menace'])],
+                                        [CombatCreature(1, 1)]])
+    assert unlimited(position).solve_attack().value == WIN
+
+
+def test_pump_spell_makes_the_attack_lethal():
+    position = CombatPosition([20, 5], [[CombatCreature(2, 2)], []], pumps=[[Pump('Giant Growth', '{G}')], []],
+                              untapped_lands=[[FOREST], []])
+    assert unlimited(position).solve_attack().value == WIN
+    # Ohne Land kann der Zauber nicht bezahlt werden
+    position.untapped_lands = [(), ()]
+    assert unlimited(position).solve_attack().value == UNDECIDED
+
+
+def test_blocked_attacker_is_undecided_not_unproven():
+    # 3/3 gegen einen 1/1-Blocker bei 3 Leben: kein Sieg, aber die Suche ist vollständig
+    position = CombatPosition([20, 3], [[CombatCreature(3, 3)], [CombatCreature(1, 1)]])
+    for exact in (False, True):
+        result = unlimited(position).solve_attack(exact)
+        assert result.value == UNDECIDED
+        assert result.proven
+
+
+def test_counterattack_is_a_forced_loss():
+    # Wir stehen auf 2 Leben; zwei 2/2 greifen im Gegenzug an, unser 1/1 hält nur einen auf
+    position = CombatPosition([2, 20], [[CombatCreature(1, 1)], [CombatCreature(2, 2), CombatCreature(2, 2)]])
+    result = unlimited(position).solve_attack(exact=True)
+    assert result.value == LOSS
+    assert set(result.attack_values.values()) == {LOSS}
+
+
+def test_exhausted_budget_leaves_the_result_unproven():
+    rng = random.Random(3)
+    position = CombatPosition([20, 20], [[CombatCreature(rng.randint(1, 4), rng.randint(1, 4)) for _ in range(5)],
+                                         [CombatCreature(rng.randint(1, 4), rng.randint(1, 4)) for _ in range(5)]])
+    result = LethalSolver(position, SearchBudget(time_limit=None, max_nodes=10, pause_gc=False)).solve_attack(exact=True)
+    assert result.value is None
+    assert not result.proven
+
+
+# --- Schadensverrechnung gegen die Engine ------------------------------------------------
+
+def test_fight_matches_assign_combat_damage():
+    rng = random.Random(1)
+    for trial in range(3000):
+        game = empty_game()
+        players = game.players
+        for player in players:
+            player.life = rng.randint(1, 20)
+            for _ in range(rng.randint(1, 4)):
+                card = put(game, player.player_id, rng.choice(CREATURE_NAMES))
+                if rng.random() < 0.2:
+                    card.add_effect(ModifyPowerToughness(3, 3, EffectDuration.END_OF_TURN))
+        attackers = [c for c in players[0].battlefield if rng.random() < 0.8]
+        for attacker in attackers:
+            attacker.is_attacking = True
+        for blocker in players[1].battlefield:
+            options = [a for a in attackers if a.can_be_blocked_by(blocker)]
+            if options and rng.random() < 0.7:
+                attacker = rng.choice(options)
+                attacker.blockers.append(blocker)
+                blocker.blocking = attacker
+
+        position = CombatPosition.from_game(game)
+        solver = LethalSolver(position)
+        groups = {i: tuple(position.blocks.get(i, ())) for i in position.attacking or ()}
+        life, dead = solver._fight(solver._root_turn(), position.attacking or (), groups, ())
+
+        before = [list(p.battlefield) for p in players]
+        game.assign_combat_damage(first_strike=True)
+        game.check_state_based_actions()
+        game.assign_combat_damage(first_strike=False)
+        game.check_state_based_actions()
+        engine_dead = {(s, i) for s, side in enumerate(before) for i, c in enumerate(side)
+                       if c not in players[s].battlefield}
+        assert ([p.life for p in players], engine_dead) == (life, dead), f"Kampf {trial}"
+
+
+# --- Vergleich mit vollständigem Minimax -------------------------------------------------
+
+def _pump_plans(position: CombatPosition, side: int, pumps, lands, targets):
+    """Alle bezahlbaren Zuweisungen der Pump-Zauber an Ziele, ohne Symmetriereduktion."""
+    plans = []
+
+    def assign(k, plan, remaining, unused):
+        if k == len(pumps):
+            plans.append((plan, unused, remaining))
+            return
+        assign(k + 1, plan, remaining, unused + (pumps[k],))
+        for target in targets:
+            paid = position.pumps[side][pumps[k]].pay(remaining)
+            if paid is not None:
+                assign(k + 1, plan + ((pumps[k], side, target),), paid, unused)
+
+    assign(0, (), lands, ())
+    return plans
+
+
+def _replace(pair, side, value):
+    return (value, pair[1]) if side == 0 else (pair[0], value)
+
+
+def _brute_combat(solver: LethalSolver, st: _Turn, attacking) -> int:
+    """Wert eines Angriffs durch vollständige Aufzählung von Blocks, Pumps und Gegenangriff."""
+    position = solver.position
+    a, d = st.attacker, 1 - st.attacker
+    attackers, defenders = position.creatures[a], position.creatures[d]
+    blockers = sorted(st.alive[d] & st.untapped[d])
+    options = [[i for i in attacking if attackers[i].can_be_blocked_by(defenders[j])] + [None] for j in blockers]
+    block_values = []
+    for choice in itertools.product(*options):
+        groups = {i: tuple(j for j, c in zip(blockers, choice) if c == i) for i in attacking}
+        if any(len(g) == 1 and attackers[i].menace for i, g in groups.items()):
+            continue
+        blocking = [j for g in groups.values() for j in g]
+        attacker_values = []
+        for plan, pumps, lands in _pump_plans(position, a, st.pumps[a], st.lands[a], attacking):
+            pumps, lands = _replace(st.pumps, a, pumps), _replace(st.lands, a, lands)
+            defender_values = []
+            for answer, rest, _ in _pump_plans(position, d, pumps[d], lands[d], blocking):
+                life, dead = solver._fight(st, attacking, groups, plan + answer)
+                if life[d] <= 0:
+                    value = WIN if a == 0 else LOSS
+                elif st.turns_left <= 1:
+                    value = UNDECIDED
+                else:
+                    alive = tuple(side - {i for s, i in dead if s == n} for n, side in enumerate(st.alive))
+                    untapped = _replace((None, None), a, frozenset(
+                        i for i in st.untapped[a] & alive[a] if i not in attacking or attackers[i].vigilance))
+                    untapped = _replace(untapped, d, alive[d])
+                    # Der Verteidiger enttappt zu Beginn seines Zuges alle Länder
+                    next_lands = _replace(lands, d, position.all_lands[d])
+                    value = _brute_turn(solver, _Turn(d, tuple(life), alive, untapped, next_lands,
+                                                      _replace(pumps, d, rest), 1, st.turns_left - 1))
+                defender_values.append(value)
+            attacker_values.append(min(defender_values) if a == 0 else max(defender_values))
+        block_values.append(max(attacker_values) if a == 0 else min(attacker_values))
+    return min(block_values) if a == 0 else max(block_values)
+
+
+def _brute_turn(solver: LethalSolver, st: _Turn) -> int:
+    attackers = sorted(st.alive[st.attacker] & st.untapped[st.attacker])
+    values = [_brute_combat(solver, st, subset)
+              for n in range(len(attackers) + 1) for subset in itertools.combinations(attackers, n)]
+    return max(values) if st.attacker == 0 else min(values)
+
+
+def _check_against_minimax(seed: int, trials: int, max_creatures: int, max_lands: int):
+    rng = random.Random(seed)
+    for trial in range(trials):
+        position = random_position(rng, max_creatures=max_creatures, max_pumps=2, max_lands=max_lands)
+        solver = unlimited(position)
+        exact = solver.solve_attack(exact=True)
+        quick = unlimited(position).solve_attack(exact=False)
+
+        root = solver._root_turn()
+        attackers = sorted(i for i in root.alive[0] if position.creatures[0][i].can_attack)
+        values = {}
+        for n in range(len(attackers) + 1):
+            for subset in itertools.combinations(attackers, n):
+                values.setdefault(solver._key(subset), set()).add(_brute_combat(solver, root, subset))
+        # Gleichwertige Angriffe (gleicher Schlüssel) haben denselben Wert
+        assert all(len(v) == 1 for v in values.values()), f"Position {trial}"
+        values = {key: v.pop() for key, v in values.items()}
+        best = max(values.values())
+
+        assert (quick.value == WIN) == (best == WIN), f"Position {trial}"
+        assert quick.value in (WIN, UNDECIDED)
+        if best == WIN:
+            assert exact.value == WIN, f"Position {trial}"
+        else:
+            assert exact.value == best, f"Position {trial}"
+            # Der Nullfenster-Test unterscheidet nur erzwungene Niederlagen von allem anderen
+            assert {k: v == LOSS for k, v in exact.attack_values.items()} == \
+                   {k: v == LOSS for k, v in values.items()}, f"Position {trial}"
+
+
+def test_solver_matches_minimax_on_small_positions():
+    _check_against_minimax(seed=5, trials=400, max_creatures=3, max_lands=2)
+
+
+@pytest.mark.slow
+def test_solver_matches_minimax_with_four_creatures():
+    _check_against_minimax(seed=5, trials=150, max_creatures=4, max_lands=3)
+
+
+# --- Benchmark ----------------------------------------------------------------------------
+
+def test_benchmark_solver_smoke():
+    summary = benchmark_solver(num_positions=50, seed=0)
+    assert summary['win'] + summary['loss'] + summary['undecided'] + summary['unproven'] == 50
+    assert summary['unproven'] == 0
+    assert 1 <= summary['nodes_p50'] <= summary['nodes_p95'] <= summary['nodes_max'] <= 50_000
+    # Der Korpus ist deterministisch, die Knotenzahlen also reproduzierbar
+    again = benchmark_solver(num_positions=50, seed=0)
+    assert {k: v for k, v in again.items() if not k.startswith('ms_')} == \
+           {k: v for k, v in summary.items() if not k.startswith('ms_')}
+
+    capped = benchmark_solver(num_positions=50, seed=0, max_nodes=20)
+    assert capped['unproven'] > 0
+    assert capped['nodes_max'] <= 20
@@ -0,0 +1,164 @@
+import asyncio
+import copy
+import threading
+from pathlib import Path
+
+from arena_connector.game_mirror import GameMirror
+from arena_connector.gui_controller import InputAction, LivePlayPipeline, RecordingBackend, replay_log
+from arena_connector.log_parser import (ACTIONS_AVAILABLE_REQ, DECLARE_ATTACKERS_REQ, GAME_STATE_MESSAGE,
+                                        MULLIGAN_REQ, iter_log_events)
+from core.game_engine.evaluation import HeuristicEvaluator
+
+from conftest import TEST_CARD_DB
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'arena_replay.log'
+# grpIds, unter denen die Karten im aufgezeichneten Log erscheinen
+ARENA_IDS = {'Forest': 90001, 'Grizzly Bears': 90002, 'Hill Giant': 90003}
+
+
+def arena_card_db():
+    return {oracle_id: dict(data, arena_id=ARENA_IDS.get(data['name'])) for oracle_id, data in TEST_CARD_DB.items()}
+
+
+def replay(lines):
+    backend = RecordingBackend()
+    pipeline = asyncio.run(replay_log(lines, GameMirror(arena_card_db()), backend))
+    return pipeline, backend
+
+
+def test_fixture_parses_into_gre_messages():
+    events = list(iter_log_events(FIXTURE.read_text(encoding='utf-8').splitlines()))
+    assert [e.message_type for e in events].count(GAME_STATE_MESSAGE) == 4
+    assert sum(e.is_decision_request for e in events) == 5
+
+
+def test_replay_emits_decisions_for_local_seat():
+    pipeline, backend = replay(FIXTURE.read_text(encoding='utf-8').splitlines())
+
+    # Die Anfrage an Sitz 2 wird ignoriert; Forest vor Grizzly Bears, dann greift Hill Giant an
+    assert backend.actions == [InputAction('keep'), InputAction('play', [101]), InputAction('cast', [102]),
+                               InputAction('attack', [104])]
+    assert [a.request_type for a in backend.actions] == [MULLIGAN_REQ, ACTIONS_AVAILABLE_REQ, ACTIONS_AVAILABLE_REQ,
+                                                         DECLARE_ATTACKERS_REQ]
+    assert [a.game_state_id for a in backend.actions] == [1, 2, 3, 4]
+    assert backend.emitted_at == sorted(backend.emitted_at)
+    assert pipeline.dropped_decisions == 0
+    assert pipeline.mirror.desyncs == 0
+    assert pipeline.mirror.game.get_player(1).life == 17
+
+
+def test_replay_records_latency_per_stage():
+    pipeline, backend = replay(FIXTURE.read_text(encoding='utf-8').splitlines())
+    summary = pipeline.latency.summary()
+
+    assert summary['mirror']['count'] == 4
+    for stage in ('snapshot', 'decision', 'end_to_end'):
+        assert summary[stage]['count'] == len(backend.actions)
+    for stage, stats in summary.items():
+        assert 0 <= stats['p50'] <= stats['p95'] <= stats['max'], stage
+    # Ende-zu-Ende enthält die Entscheidung selbst
+    assert summary['end_to_end']['max'] >= summary['decision']['max']
+    assert 'end_to_end' in pipeline.latency.format()
+
+
+
+class BlockingEvaluator(HeuristicEvaluator):
+    """Hält die Suche in ihrer ersten Bewertung an, bis der Test sie freigibt, und zählt die Bewertungen."""
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(timeout=30)
+
+    def evaluate(self, game, player_id):
+        self._wait()
+        return super().evaluate(game, player_id)
+
+    def evaluate_features(self, features):
+        self._wait()
+        return super().evaluate_features(features)
+
+
+def test_superseded_decision_is_cancelled():
+    events = list(iter_log_events(FIXTURE.read_text(encoding='utf-8').splitlines()))
+    first_request = next(i for i, e in enumerate(events) if e.message_type == ACTIONS_AVAILABLE_REQ)
+    evaluator = BlockingEvaluator()
+
+    async def scenario():
+        backend = RecordingBackend()
+        pipeline = LivePlayPipeline(GameMirror(arena_card_db()), backend, decision_time_limit=60.0)
+        for event in events[:first_request]:
+            task = await pipeline.handle_event(event)
+            if task is not None:
+                await task
+        local = pipeline.mirror.game.get_player(pipeline.mirror.local_player_id)
+        local.evaluator = evaluator
+        stale = await pipeline.handle_event(events[first_request])
+        while not evaluator.entered.is_set():
+            await asyncio.sleep(0.01)
+        local.evaluator = HeuristicEvaluator()
+        # Dieselbe Anfrage erneut (z.B. nach einem neuen Spielzustand): die erste Suche ist überholt
+        fresh = await pipeline.handle_event(copy.copy(events[first_request]))
+        evaluator.release.set()
+        await asyncio.gather(stale, fresh)
+        return pipeline, backend
+
+    pipeline, backend = asyncio.run(scenario())
+    assert pipeline.dropped_decisions == 1
+    assert backend.actions[-1] == InputAction('play', [101])
+    # Nach dem Abbruch bewertet die überholte Suche keinen weiteren Zustand
+    assert evaluator.calls == 1
+
+
+def state_messages():
+    events = iter_log_events(FIXTURE.read_text(encoding='utf-8').splitlines())
+    return [e.payload for e in events if e.message_type == GAME_STATE_MESSAGE]
+
+
+def equivalent_full(messages, game_state_id: int):
+    """Vollständiger Zustand, den Arena nach den gegebenen Nachrichten senden würde (Diffs eingerechnet)."""
+    turn_info, players, objects, zones = {}, {}, {}, {}
+    for message in messages:
+        state = message['gameStateMessage']
+        turn_info.update(state.get('turnInfo', {}))
+        for info in state.get('players', []):
+            players.setdefault(info['systemSeatNumber'], {}).update(info)
+        objects.update({obj['instanceId']: obj for obj in state.get('gameObjects', [])})
+        zones.update({zone['zoneId']: zone for zone in state.get('zones', [])})
+    full = {'type': 'GameStateType_Full', 'gameStateId': game_state_id, 'turnInfo': turn_info,
+            'players': list(players.values()), 'gameObjects': list(objects.values()), 'zones': list(zones.values())}
+    return {'type': GAME_STATE_MESSAGE, 'systemSeatIds': [1, 2], 'gameStateId': game_state_id,
+            'gameStateMessage': full}
+
+
+def test_full_state_after_diffs_matches_the_mirror():
+    messages = state_messages()
+    mirror = GameMirror(arena_card_db())
+    for message in messages:
+        mirror.apply(message)
+    checksum = mirror.checksum()
+
+    mirror.apply(equivalent_full(messages, 6))
+    assert mirror.desyncs == 0
+    assert mirror.checksum() == checksum
+
+
+def test_tampered_full_state_is_detected_and_adopted():
+    messages = state_messages()
+    mirror = GameMirror(arena_card_db())
+    for message in messages:
+        mirror.apply(message)
+
+    full = equivalent_full(messages, 6)
+    for info in full['gameStateMessage']['players']:
+        if info['systemSeatNumber'] == 2:
+            info['lifeTotal'] = 5
+    mirror.apply(full)
+    assert mirror.desyncs == 1
+    assert mirror.game.get_player(1).life == 5
+    assert mirror.game_state_id == 6
@@ -0,0 +1,137 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from ai_model import match_runner
+from ai_model.match_runner import SPRT, AgentConfig, expected_score, run_match, score_to_elo
+from core.game_engine.evaluation import HeuristicEvaluator
+
+from conftest import TEST_CARD_DB, deck
+
+
+def with_counts(counts, **kwargs) -> SPRT:
+    sprt = SPRT(**kwargs)
+    sprt.pentanomial = np.array(counts, dtype=np.int64)
+    return sprt
+
+
+def reference_llr(counts, elo0: float, elo1: float) -> float:
+    """GSPRT-LLR nach Fishtest, ausgeschrieben: Normalapproximation mit der Varianz pro Paar."""
+    counts = [n + match_runner.PRIOR_PAIRS_PER_OUTCOME for n in counts]
+    total = sum(counts)
+    scores = [k / 4 for k in range(5)]
+    mean = sum(n * x for n, x in zip(counts, scores)) / total
+    variance = sum(n * (x - mean) ** 2 for n, x in zip(counts, scores)) / total
+    s0, s1 = expected_score(elo0), expected_score(elo1)
+    pairs = total - 5 * match_runner.PRIOR_PAIRS_PER_OUTCOME
+    return pairs * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+
+# --- SPRT ---------------------------------------------------------------------------------
+
+def test_sprt_bounds_and_pair_points():
+    sprt = SPRT(0.0, 20.0, alpha=0.05, beta=0.05)
+    assert sprt.lower_bound == pytest.approx(math.log(0.05 / 0.95))
+    assert sprt.upper_bound == pytest.approx(-sprt.lower_bound)
+    for points in (0.0, 0.5, 1.0, 1.5, 2.0, 2.0):
+        sprt.add(points)
+    assert sprt.pentanomial.tolist() == [1, 1, 1, 1, 2]
+    assert sprt.pairs == 6
+
+    with pytest.raises(ValueError):
+        SPRT(elo0=10.0, elo1=10.0)
+
+
+@pytest.mark.parametrize('counts, llr, status', [
+    ([0, 0, 0, 0, 0], 0.0, None),
+    ([1, 2, 4, 2, 1], -0.0486, None),
+    ([0, 1, 4, 20, 25], 10.7435, 'H1'),
+    ([25, 20, 4, 1, 0], -11.7266, 'H0'),
+    ([10, 60, 180, 200, 50], 26.8884, 'H1'),
+    # Ausgeglichen, aber viele Paare: der Kandidat ist nicht um 20 Elo besser
+    ([40, 160, 400, 160, 40], -6.5820, 'H0'),
+])
+def test_sprt_llr_and_status_on_fixed_counts(counts, llr, status):
+    sprt = with_counts(counts)
+    assert sprt.llr() == pytest.approx(llr, abs=1e-4)
+    if sum(counts):
+        assert sprt.llr() == pytest.approx(reference_llr(counts, 0.0, 20.0))
+    assert sprt.status() == status
+
+
+def test_sprt_elo_estimate_is_symmetric():
+    elo, margin = with_counts([0, 1, 4, 20, 25]).elo()
+    mirrored, mirrored_margin = with_counts([25, 20, 4, 1, 0]).elo()
+    assert elo > 0
+    assert mirrored == pytest.approx(-elo)
+    assert margin == pytest.approx(mirrored_margin)
+    assert score_to_elo(expected_score(elo)) == pytest.approx(elo)
+
+
+# --- run_match ----------------------------------------------------------------------------
+
+SMALL_DECK = deck(['Forest'] * 8 + ['Grizzly Bears'] * 6 + ['Giant Growth'] * 2)
+
+
+def agents():
+    # Ohne Zeitlimit ist die Suche unabhängig von der Rechnerlast und damit reproduzierbar
+    baseline = AgentConfig('base', decision_time_limit=None, num_worlds=1)
+    careless = AgentConfig('careless', HeuristicEvaluator(life_weight=0.0, board_weight=0.1, hand_weight=0.0),
+                           decision_time_limit=None, num_worlds=1)
+    return baseline, careless
+
+
+def test_run_match_in_process_is_deterministic():
+    baseline, careless = agents()
+    reports = [run_match(TEST_CARD_DB, [SMALL_DECK, SMALL_DECK], baseline, careless, max_pairs=3, workers=0,
+                         max_turns=8) for _ in range(2)]
+    for report in reports:
+        # Der Kandidat ignoriert das Leben und verliert jede Partie
+        assert report.sprt.pentanomial.tolist() == [3, 0, 0, 0, 0]
+        assert (report.wins, report.draws, report.losses) == (0, 0, 6)
+        assert report.status is None
+        assert 'nicht entschieden' in report.format()
+
+
+class RecordingSPRT(SPRT):
+    """Merkt sich die Reihenfolge, in der Paare verbucht werden."""
+    def __init__(self):
+        # Enge Fehlerraten: der Test entscheidet innerhalb weniger Paare nicht
+        super().__init__(alpha=1e-9, beta=1e-9)
+        self.recorded = []
+
+    def add(self, pair_points: float):
+        self.recorded.append(pair_points)
+        super().add(pair_points)
+
+
+def _slow_first_pair(seed: int):
+    # Das erste Paar endet zuletzt und verliert, alle anderen gewinnen sofort
+    if seed == 0:
+        time.sleep(0.5)
+        return 0.0, 0, 0.0
+    return 2.0, 0, 0.0
+
+
+def test_pool_records_pairs_in_seed_order(monkeypatch):
+    monkeypatch.setattr(match_runner, '_play_pair', _slow_first_pair)
+    sprt = RecordingSPRT()
+    baseline, careless = agents()
+    report = run_match(TEST_CARD_DB, [SMALL_DECK, SMALL_DECK], baseline, careless, sprt, max_pairs=6, workers=2)
+    assert sprt.recorded == [0.0, 2.0, 2.0, 2.0, 2.0, 2.0]
+    assert (report.wins, report.losses) == (10, 2)
+
+
+@pytest.mark.slow
+def test_pool_and_in_process_runs_agree():
+    baseline = AgentConfig('base', decision_time_limit=None, num_worlds=1)
+    candidate = AgentConfig('life', HeuristicEvaluator(life_weight=3.0, board_weight=0.5, hand_weight=0.5),
+                            decision_time_limit=None, num_worlds=1)
+    cards = deck(['Forest'] * 8 + ['Grizzly Bears'] * 4 + ['Giant Spider'] * 2 + ['Llanowar Elves'] * 2
+                 + ['Giant Growth'] * 2)
+    reports = [run_match(TEST_CARD_DB, [cards, cards], baseline, candidate, SPRT(0.0, 200.0), max_pairs=12,
+                         workers=workers, max_turns=8) for workers in (0, 2)]
+    assert reports[0].status is not None
+    assert [r.sprt.pentanomial.tolist() for r in reports] == [reports[0].sprt.pentanomial.tolist()] * 2
@@ -0,0 +1,116 @@
+import json
+import os
+import uuid
+
+import pytest
+
+from core.data import card_store, scryfall_importer as importer
+from core.data.card_store import CardStore
+
+
+def bulk_card(i: int, **changes):
+    card = {'oracle_id': str(uuid.UUID(int=i)), 'name': f"Card {i}", 'mana_cost': '{1}{G}', 'cmc': 2.0,
+            'type_line': 'Creature — Bear', 'power': '2', 'toughness': '2', 'colors': ['G'], 'prices': {'usd': '0.10'}}
+    card.update(changes)
+    return card
+
+
+def read_db(path):
+    return CardStore(str(path)).records()
+
+
+def shard_files(tmp_path):
+    return set(os.listdir(tmp_path / 'card_db.shards'))
+
+
+def refresh(cards, tmp_path, keep=5):
+    return importer.refresh_card_db(cards, str(tmp_path / 'card_db.json'), str(tmp_path / 'snapshots'), keep)
+
+
+def test_refresh_applies_only_the_delta(tmp_path):
+    cards = [bulk_card(i) for i in range(10)]
+    assert refresh(cards, tmp_path) == {'added': 10, 'updated': 0, 'removed': 0, 'total': 10}
+    assert refresh(cards, tmp_path) == {'added': 0, 'updated': 0, 'removed': 0, 'total': 10}
+    assert len(os.listdir(tmp_path / 'snapshots')) == 1
+
+    cards[3]['cmc'] = 5.0
+    del cards[7]
+    cards.append(bulk_card(42))
+    assert refresh(cards, tmp_path) == {'added': 1, 'updated': 1, 'removed': 1, 'total': 10}
+    db = read_db(tmp_path / 'card_db.json')
+    assert db == {card['oracle_id']: importer.card_record(card) for card in cards}
+
+
+def test_delta_rewrites_only_the_affected_shards(tmp_path):
+    # Oracle-IDs 0..9 liegen alle im Shard '00'; Karte 2**124 im Shard '10'
+    cards = [bulk_card(i) for i in range(10)] + [bulk_card(1 << 124)]
+    refresh(cards, tmp_path)
+    before = shard_files(tmp_path)
+    assert len(before) == 4
+
+    cards[-1]['cmc'] = 7.0
+    assert refresh(cards, tmp_path, keep=1)['updated'] == 1
+    after = shard_files(tmp_path)
+    # Der unveränderte Shard bleibt dieselbe Datei; die alte Fassung des geänderten ist nach dem
+    # Ausdünnen der Versionen nicht mehr referenziert und wird entfernt
+    assert {name for name in after if name.startswith('00.')} == {name for name in before if name.startswith('00.')}
+    assert len(after) == 4 and after != before
+    assert read_db(tmp_path / 'card_db.json') == {card['oracle_id']: importer.card_record(card) for card in cards}
+
+
+def test_interrupted_refresh_keeps_the_previous_version(tmp_path, monkeypatch):
+    old_cards = [bulk_card(i) for i in range(5)]
+    refresh(old_cards, tmp_path)
+    new_cards = [bulk_card(i, cmc=3.0) for i in range(5)]
+
+    # Abbruch nach dem Schreiben der Shards, vor dem Eintauschen des Manifests
+    write = card_store.write_json_atomic
+    def fail_on_manifest(data, path, sort_keys=False):
+        if path.endswith('card_db.json'):
+            raise IOError("Abbruch")
+        write(data, path, sort_keys)
+    monkeypatch.setattr(card_store, 'write_json_atomic', fail_on_manifest)
+    with pytest.raises(IOError):
+        refresh(new_cards, tmp_path)
+    monkeypatch.undo()
+
+    assert read_db(tmp_path / 'card_db.json') == {card['oracle_id']: importer.card_record(card) for card in old_cards}
+    assert refresh(new_cards, tmp_path, keep=1)['updated'] == 5
+    assert read_db(tmp_path / 'card_db.json') == {card['oracle_id']: importer.card_record(card) for card in new_cards}
+    # Die verwaisten Shards des Abbruchs werden mit den alten Versionen aufgeräumt
+    assert len(shard_files(tmp_path)) == 2
+
+
+def test_legacy_database_is_migrated_with_a_proper_delta(tmp_path):
+    cards = [bulk_card(i) for i in range(5)]
+    legacy = {card['oracle_id']: importer.card_record(card) for card in cards}
+    (tmp_path / 'card_db.json').write_text(json.dumps(legacy), encoding='utf-8')
+    assert read_db(tmp_path / 'card_db.json') == legacy
+
+    cards[0]['cmc'] = 9.0
+    assert refresh(cards, tmp_path) == {'added': 0, 'updated': 1, 'removed': 0, 'total': 5}
+    assert not CardStore(str(tmp_path / 'card_db.json')).is_legacy()
+    assert read_db(tmp_path / 'card_db.json') == {card['oracle_id']: importer.card_record(card) for card in cards}
+
+
+def test_content_hash_of_raw_card_and_record_agree():
+    card = bulk_card(1, legalities={'standard': 'legal', 'modern': 'legal'})
+    assert importer.content_hash(card) == importer.content_hash(importer.card_record(card))
+    assert importer.content_hash(card) != importer.content_hash(bulk_card(1, power='3'))
+    # Felder außerhalb des Datensatzes (z.B. Preise) ändern den Hash nicht
+    assert importer.content_hash(card) == importer.content_hash(dict(card, prices={'usd': '9.99'}))
+
+
+def test_snapshot_pruning_keeps_newest_versions(tmp_path):
+    snapshot_dir = tmp_path / 'snapshots'
+    snapshot_dir.mkdir()
+    old = ['card_db.20000101-000000.json'] + [f'card_db.20000101-000000-{n}.json' for n in range(1, 12)]
+    for name in old:
+        (snapshot_dir / name).write_text('{}')
+    (tmp_path / 'card_db.json').write_text('{}')
+
+    newest = importer._store_snapshot(str(tmp_path / 'card_db.json'), str(snapshot_dir), keep=4)
+
+    remaining = set(os.listdir(snapshot_dir))
+    assert remaining == {os.path.basename(newest), 'card_db.20000101-000000-9.json',
+                         'card_db.20000101-000000-10.json', 'card_db.20000101-000000-11.json'}
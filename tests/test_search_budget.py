@@ -0,0 +1,117 @@
+import gc
+import logging
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+
+from core.game_engine.card import Card
+from core.game_engine.evaluation import HeuristicEvaluator
+from core.game_engine.search_budget import SearchBudget
+
+from conftest import CARDS_BY_NAME, empty_game, enter_main_phase, put
+
+# Zeitlimit pro Entscheidung im Lasttest und erlaubte Überschreitung (ein Knoten plus Scheduling)
+DECISION_TIME_LIMIT = 0.05
+DEADLINE_TOLERANCE = 0.03
+LOAD_DECISIONS = 60
+LOAD_PROCESSES = (os.cpu_count() or 1) + 1
+
+
+def wide_position(seed: int = 0):
+    """Hauptphase mit vielen wirkbaren Zaubern: ohne Budget dauert die Suche viel länger als das Limit."""
+    game = empty_game(seed)
+    enter_main_phase(game)
+    player = game.get_player(0)
+    for _ in range(6):
+        put(game, 0, 'Forest')
+    hand = ['Forest', 'Grizzly Bears', 'Llanowar Elves', 'Serra Angel', 'Giant Spider', 'Typhoid Rats',
+            'Youthful Knight', 'Vampire Nighthawk', 'Fencing Ace', 'Hill Giant']
+    player.hand = [Card(CARDS_BY_NAME[name], player) for name in hand]
+    return game, player
+
+
+def _burn_cpu(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_truncated_depth_is_not_reported_complete():
+    game, player = wide_position()
+    player.num_worlds = 1
+    player.choose_action(SearchBudget.unlimited())
+    assert player.last_search_stats.completed
+    assert player.last_search_stats.depth_reached == 2
+
+    # Ein Knoten weniger: die Blattschleife der letzten Aktion wird abgeschnitten
+    nodes = player.last_search_stats.nodes_searched
+    player.choose_action(SearchBudget(time_limit=None, max_nodes=nodes - 1))
+    assert not player.last_search_stats.completed
+
+
+def test_search_respects_node_budget():
+    game, player = wide_position()
+    player.choose_action(SearchBudget(time_limit=None, max_nodes=5))
+    stats = player.last_search_stats
+    assert not stats.completed
+    # Nach Erschöpfung wird höchstens der laufende Knoten abgeschlossen
+    assert stats.nodes_searched <= 5 + 1
+
+
+class FailingEvaluator(HeuristicEvaluator):
+    def evaluate_batch(self, games, player_id):
+        raise RuntimeError("Bewertung fehlgeschlagen")
+
+
+def test_gc_resumes_when_search_raises():
+    game, player = wide_position()
+    player.evaluator = FailingEvaluator()
+    with pytest.raises(RuntimeError):
+        player.choose_action(SearchBudget(1.0))
+    assert gc.isenabled()
+
+
+def test_budget_context_manager_resumes_gc():
+    with pytest.raises(RuntimeError):
+        with SearchBudget(1.0):
+            assert not gc.isenabled()
+            raise RuntimeError
+    assert gc.isenabled()
+
+
+@pytest.mark.slow
+def test_deadline_adherence_under_load():
+    # Last durch andere Prozesse auf denselben Kernen (wie ein ausgelasteter Rechner neben Arena)
+    stop = multiprocessing.Event()
+    load = [multiprocessing.Process(target=_burn_cpu, args=(stop,), daemon=True) for _ in range(LOAD_PROCESSES)]
+    for process in load:
+        process.start()
+    # Aufwärmen: die erste Suche kennt die Aufräumkosten der GC noch nicht (siehe SearchBudget)
+    wide_position()[1].choose_action(SearchBudget(DECISION_TIME_LIMIT))
+    latencies = []
+    try:
+        for seed in range(LOAD_DECISIONS):
+            game, player = wide_position(seed)
+            player.decision_time_limit = DECISION_TIME_LIMIT
+            start = time.perf_counter()
+            player.choose_action()
+            latencies.append(time.perf_counter() - start)
+
+            for name in ('Grizzly Bears', 'Hill Giant', 'Serra Angel', 'Typhoid Rats', 'Fencing Ace'):
+                put(game, 0, name)
+                put(game, 1, name)
+            start = time.perf_counter()
+            player.declare_attackers()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        for process in load:
+            process.join()
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    summary = (f"Entscheidungen: {len(latencies)}, Limit {DECISION_TIME_LIMIT * 1000:.0f}ms, "
+               f"p50 {p50 * 1000:.1f}ms, p99 {p99 * 1000:.1f}ms, max {max(latencies) * 1000:.1f}ms")
+    logging.info(summary)
+    assert p99 <= DECISION_TIME_LIMIT + DEADLINE_TOLERANCE, summary